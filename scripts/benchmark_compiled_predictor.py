@@ -0,0 +1,65 @@
+"""
+Compiled tree predictor vs LGBMClassifier.predict_proba.
+
+Checks that probabilities agree to within 1e-6 and reports median latency per
+call at batch sizes 1, 64 and 4096.
+
+    python scripts/benchmark_compiled_predictor.py
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+
+from Credit_Risk_Modelling.components.compiled_tree_predictor import CompiledTreePredictor
+
+BATCH_SIZES = [1, 64, 4096]
+
+
+def latency_ms(fn, X, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.normal(size=(20000, 20)), columns=[f"f{i}" for i in range(20)])
+    X.iloc[rng.random(X.shape) < 0.02] = np.nan
+    y = (X["f0"].fillna(0) + X["f1"].fillna(0) * X["f2"].fillna(0) + rng.normal(size=len(X)) > 0).astype(int)
+
+    model = LGBMClassifier(n_estimators=args.n_estimators, max_depth=6, verbose=-1).fit(X, y)
+    predictor = CompiledTreePredictor.from_model(model)
+
+    X_eval = X.sample(4096, random_state=0)
+    max_abs_diff = float(np.abs(
+        model.predict_proba(X_eval)[:, 1] - predictor.predict_proba(X_eval)[:, 1]
+    ).max())
+
+    results = []
+    for batch in BATCH_SIZES:
+        X_batch = X_eval.iloc[:batch]
+        X_array = X_batch.to_numpy()
+        results.append({
+            "batch_size": batch,
+            "predict_proba_ms": latency_ms(model.predict_proba, X_batch, args.repeats),
+            "compiled_ms": latency_ms(predictor.predict_proba, X_array, args.repeats),
+        })
+
+    print(json.dumps({"max_abs_diff": max_abs_diff, "latency": results}, indent=2))
+    assert max_abs_diff < 1e-6
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Per-request cost of updating the drift sketches, and of building the report.
+
+Builds a reference from synthetic normalized inputs, then feeds /predict-
+shaped payloads (five tabular features and a short transaction series)
+through DriftMonitor.observe, in memory and backed by a memory-mapped
+sketch file. Half the traffic is shifted so the report has drift to find.
+
+    python scripts/benchmark_drift_monitor.py --requests 100000
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from Credit_Risk_Modelling.components.drift_monitor import DriftMonitor, TIMESERIES_FEATURE, build_reference
+
+FEATURES = ["f0", "f1", "f2", "f3", "f4"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--series-length", type=int, default=12)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = {name: rng.beta(2, 5, 100_000) for name in FEATURES}
+    samples[TIMESERIES_FEATURE] = rng.beta(2, 3, 100_000)
+
+    payloads = []
+    for i in range(args.requests):
+        shift = 0.2 if i % 2 else 0.0
+        features = {name: float(min(rng.beta(2, 5) + shift, 1.0)) for name in FEATURES}
+        values = [np.minimum(rng.beta(2, 3, args.series_length), 1.0).tolist()]
+        payloads.append((features, values))
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = build_reference(samples, Path(tmp) / "reference.json")
+
+        for mode, sketch_dir in (("in_memory", None), ("mmap_file", Path(tmp) / "sketches")):
+            monitor = DriftMonitor(reference, sketch_dir)
+            for features, values in payloads[:1000]:  # warm-up
+                monitor.observe(features, values)
+            monitor.reset()
+
+            start = time.perf_counter()
+            for features, values in payloads:
+                monitor.observe(features, values)
+            report[f"{mode}_observe_us"] = (time.perf_counter() - start) / args.requests * 1e6
+
+        start = time.perf_counter()
+        drift = monitor.report()
+        report["report_ms"] = (time.perf_counter() - start) * 1000
+
+    report["psi"] = {name: round(entry["psi"], 4) for name, entry in drift["features"].items()}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
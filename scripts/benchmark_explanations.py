@@ -0,0 +1,96 @@
+"""
+p50/p99 latency of inference with and without tabular explanations.
+
+Trains a small LightGBM model on the f0-f4 API features, then times
+run_inference against run_explained_inference in exact SHAP, approximate
+(path attribution) and cached modes, sequentially and with concurrent
+callers so the ExplanationBatcher can coalesce requests.
+
+    python scripts/benchmark_explanations.py --requests 2000
+"""
+import argparse
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+
+from Credit_Risk_Modelling.components.explainability_tabular import TabularExplainer, ExplanationBatcher
+from Credit_Risk_Modelling.pipeline.inference_pipeline import run_inference, run_explained_inference
+
+FEATURES = ["f0", "f1", "f2", "f3", "f4"]
+
+
+def percentiles(timings):
+    timings = np.asarray(timings) * 1000
+    return {
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+    }
+
+
+def run(fn, payloads, concurrency):
+    def timed(payload):
+        start = time.perf_counter()
+        fn(*payload)
+        return time.perf_counter() - start
+
+    if concurrency == 1:
+        return percentiles([timed(p) for p in payloads])
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return percentiles(list(pool.map(timed, payloads)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.random((20000, len(FEATURES))), columns=FEATURES)
+    y = (0.4 * X["f2"] / (X["f1"] + 0.1) + 0.3 * X["f4"] + rng.normal(0, 0.1, len(X)) > 0.6).astype(int)
+    model = LGBMClassifier(n_estimators=200, max_depth=6, verbose=-1).fit(X, y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = Path(tmp) / "lightgbm.pkl"
+        joblib.dump(model, model_path)
+        explainer = TabularExplainer(model_path)
+
+    batcher = ExplanationBatcher(explainer)
+    X_ts = pd.DataFrame([[0.4, 0.5, 0.3]])
+    unique = [
+        (pd.DataFrame([row]), X_ts)
+        for row in rng.random((args.requests, len(FEATURES))).round(6).tolist()
+    ]
+    for X_tab, _ in unique:
+        X_tab.columns = FEATURES
+    repeated = unique[:10] * (args.requests // 10)
+
+    scenarios = {
+        "no_explanations": lambda X_tab, X_ts: run_inference(X_tab, X_ts),
+        "exact": lambda X_tab, X_ts: run_explained_inference(X_tab, X_ts, tabular_explainer=batcher),
+        "approximate": lambda X_tab, X_ts: run_explained_inference(
+            X_tab, X_ts, approximate=True, tabular_explainer=batcher
+        ),
+    }
+
+    results = {}
+    for concurrency in (1, args.concurrency):
+        for name, fn in scenarios.items():
+            explainer._cache.clear()
+            results[f"{name}@{concurrency}"] = run(fn, unique, concurrency)
+
+        results[f"exact_cached@{concurrency}"] = run(scenarios["exact"], repeated, concurrency)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Bulk-load, refresh and lookup latency of the online feature store.
+
+Generates a synthetic panel, runs time-series feature engineering on it and
+loads the output into a fresh store. Then reloads the same output (nothing
+changed, so no rows are rewritten), refreshes with one new month for every
+customer, and times random single-customer lookups.
+
+    python scripts/benchmark_feature_store.py --customers 200000
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from Credit_Risk_Modelling.components.feature_engineering_timeseries import add_rolling_features
+from Credit_Risk_Modelling.components.feature_store import OnlineFeatureStore
+from Credit_Risk_Modelling.utils.generate_transactions import generate_transactions
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--customers", type=int, default=200_000)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--window-size", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    panel = generate_transactions(args.customers, args.months + 1)
+    features = add_rolling_features(panel, args.window_size)
+    current = features[features["month"] <= args.months]
+    next_month = features[features["month"] == args.months + 1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "timeseries_features.csv"
+        current.to_csv(csv_path, index=False)
+        store = OnlineFeatureStore(Path(tmp) / "feature_store.db")
+
+        loaded, load_s = timed(lambda: store.load_csv(csv_path, "timeseries"))
+        _, reload_s = timed(lambda: store.load_csv(csv_path, "timeseries"))
+        refreshed, refresh_s = timed(lambda: store.upsert("timeseries", next_month))
+
+        rng = np.random.default_rng(0)
+        customer_ids = rng.integers(0, args.customers, args.lookups)
+        store.get(int(customer_ids[0]), "timeseries")  # open this thread's connection
+
+        latencies = []
+        for customer_id in customer_ids:
+            start = time.perf_counter()
+            record = store.get(int(customer_id), "timeseries")
+            latencies.append(time.perf_counter() - start)
+            assert record["as_of"] == args.months + 1
+
+        us = np.array(latencies) * 1e6
+        report = {
+            "customers": args.customers,
+            "feature_rows": len(current),
+            "features_per_customer": len(store.columns("timeseries")),
+            "bulk_load_s": load_s,
+            "bulk_load_rows_per_s": len(current) / load_s,
+            "unchanged_reload_s": reload_s,
+            "refresh_rows": refreshed,
+            "refresh_s": refresh_s,
+            "lookup_p50_us": float(np.percentile(us, 50)),
+            "lookup_p99_us": float(np.percentile(us, 99)),
+            "db_mb": (Path(tmp) / "feature_store.db").stat().st_size / 1e6,
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
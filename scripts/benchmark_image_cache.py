@@ -0,0 +1,87 @@
+"""
+Decode cost of document images against the memory-mapped tensor cache.
+
+Generates a synthetic scan corpus and times, per image: a full JPEG/PNG
+decode and resize (what every embedding run did before the cache), the
+cold cache build, a no-op re-sync, a re-sync after modifying a few files,
+and warm batched reads of the resized uint8 pixels. Needs no torch.
+
+    python scripts/benchmark_image_cache.py --images 2000 --width 1240 --height 1754
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from Credit_Risk_Modelling.components.image_tensor_cache import ImageTensorCache, decode_resized
+from Credit_Risk_Modelling.utils.document_manifest import DocumentManifest
+from Credit_Risk_Modelling.utils.generate_documents import generate_dataset
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=1240)
+    parser.add_argument("--height", type=int, default=1754)
+    parser.add_argument("--format", default="jpg", choices=["jpg", "png"])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--modified", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        image_dir = tmp / "images"
+        generate_dataset(image_dir, num_images=args.images, width=args.width, height=args.height,
+                         fmt=args.format, workers=args.workers)
+        manifest = DocumentManifest(image_dir, tmp / "manifest.json").refresh()
+        rel_paths = sorted(manifest.entries)
+
+        _, decode_s = timed(lambda: [decode_resized(image_dir / path) for path in rel_paths])
+
+        cache = ImageTensorCache(tmp / "cache")
+        _, build_s = timed(lambda: cache.sync(manifest, workers=args.workers))
+        _, noop_s = timed(lambda: ImageTensorCache(tmp / "cache").sync(
+            DocumentManifest(image_dir, tmp / "manifest.json").refresh(), workers=args.workers
+        ))
+
+        for path in rel_paths[:args.modified]:
+            Image.open(image_dir / path).transpose(Image.FLIP_LEFT_RIGHT).save(image_dir / path)
+        resynced, resync_s = timed(lambda: ImageTensorCache(tmp / "cache").sync(
+            DocumentManifest(image_dir, tmp / "manifest.json").refresh(), workers=args.workers
+        ))
+
+        warm = ImageTensorCache(tmp / "cache")
+        _, read_s = timed(lambda: sum(len(b) for b in warm.iter_batches(rel_paths, args.batch_size)))
+        assert (warm.get(rel_paths[:1])[0] == decode_resized(image_dir / rel_paths[0])).all()
+
+        n = len(rel_paths)
+        report = {
+            "images": n,
+            "source": f"{args.width}x{args.height} {args.format}",
+            "decode_resize_ms_per_image": decode_s / n * 1000,
+            "cold_build_ms_per_image": build_s / n * 1000,
+            "noop_resync_s": noop_s,
+            "modified": args.modified,
+            "redecoded": resynced,
+            "resync_s": resync_s,
+            "warm_read_ms_per_image": read_s / n * 1000,
+            "speedup": decode_s / read_s,
+            "cache_mb": sum(p.stat().st_size for p in (tmp / "cache").iterdir()) / 1e6,
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
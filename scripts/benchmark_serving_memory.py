@@ -0,0 +1,171 @@
+"""
+Memory of N serving workers: pre-forked (models loaded once in the parent)
+versus `uvicorn --workers N` (every worker loads its own copy).
+
+Synthetic artifacts are trained in a scratch directory unless --artifacts
+points at a real one. After warm-up requests, RSS and PSS are summed over the
+whole process tree. RSS counts shared pages once per process; PSS splits
+them between the processes sharing them, so PSS is the real footprint.
+
+    python scripts/benchmark_serving_memory.py --workers 1,2,4
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import joblib
+import numpy as np
+import pandas as pd
+
+from Credit_Risk_Modelling.components.document_index import DocumentIndex
+
+FEATURES = [f"f{i}" for i in range(20)]
+
+
+def build_artifacts(root: Path, embedding_rows: int):
+    import lightgbm as lgb
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((50_000, len(FEATURES))), columns=FEATURES)
+    y = (X["f0"] + rng.normal(0, 0.3, len(X)) > 0.5).astype(int)
+
+    tabular = root / "artifacts/training/tabular/lightgbm.pkl"
+    tabular.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(lgb.LGBMClassifier(n_estimators=500, num_leaves=63, verbose=-1).fit(X, y), tabular)
+
+    timeseries = root / "artifacts/training/timeseries/lightgbm.txt"
+    timeseries.parent.mkdir(parents=True, exist_ok=True)
+    lgb.train(
+        {"objective": "binary", "num_leaves": 63, "verbose": -1}, lgb.Dataset(X.to_numpy(), y), 500
+    ).save_model(str(timeseries))
+
+    # The duplicate-detection index, as the document pipeline builds it
+    doc = rng.random((embedding_rows, 512), dtype=np.float32)
+    labels = rng.integers(0, 2, embedding_rows)
+    index = DocumentIndex.train(doc)
+    index.add(doc)
+    index.save(root / "artifacts/feature_engineering/documents/document_index")
+
+    document_model = root / "artifacts/training/documents/document_risk_model.pkl"
+    document_model.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(LogisticRegression(max_iter=200).fit(doc[:5000], labels[:5000]), document_model)
+
+
+def process_tree(pid):
+    children = []
+    try:
+        out = subprocess.check_output(["pgrep", "-P", str(pid)], text=True)
+        for child in out.split():
+            children.extend(process_tree(int(child)))
+    except subprocess.CalledProcessError:
+        pass
+    return [pid] + children
+
+
+def memory_kb(pid):
+    """(rss, pss) in kB from /proc/<pid>/smaps_rollup."""
+    values = {"Rss:": 0, "Pss:": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if parts[0] in values:
+                    values[parts[0]] = int(parts[1])
+    except (FileNotFoundError, ProcessLookupError):
+        pass  # exited between listing and reading
+    return values["Rss:"], values["Pss:"]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure(command, cwd, env, warmup_requests):
+    port = _free_port()
+    proc = subprocess.Popen(
+        [arg.format(port=port) for arg in command],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 300
+        while True:
+            try:
+                if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.time() > deadline or proc.poll() is not None:
+                raise RuntimeError(f"server did not start: {' '.join(command)}")
+            time.sleep(0.5)
+
+        rng = np.random.default_rng(0)
+        errors = 0
+        body = {"tabular": {"features": {}}, "timeseries": {"values": [[0.5]]}}
+        with httpx.Client(base_url=url, timeout=60) as client:
+            for _ in range(warmup_requests):
+                body["tabular"]["features"] = dict(zip(FEATURES, rng.random(len(FEATURES)).tolist()))
+                errors += client.post("/explain", json=body).status_code != 200
+        time.sleep(1)
+
+        pids = process_tree(proc.pid)
+        rss, pss = map(sum, zip(*(memory_kb(pid) for pid in pids)))
+        return {"processes": len(pids), "rss_mb": rss / 1024, "pss_mb": pss / 1024, "errors": errors}
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--artifacts", type=Path, help="directory containing a real artifacts/ tree")
+    parser.add_argument("--embedding-rows", type=int, default=100_000)
+    parser.add_argument("--warmup-requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.artifacts or Path(tmp)
+        if not args.artifacts:
+            build_artifacts(root, args.embedding_rows)
+
+        env = {**os.environ, "PYTHONUNBUFFERED": "1"}
+        results = []
+        for workers in (int(w) for w in args.workers.split(",")):
+            threads = str(max(1, (os.cpu_count() or 1) // workers))
+            independent = measure(
+                [
+                    sys.executable, "-m", "uvicorn", "Credit_Risk_Modelling.api.main:app",
+                    "--host", "127.0.0.1", "--port", "{port}", "--workers", str(workers),
+                ],
+                root, {**env, "OMP_NUM_THREADS": threads}, args.warmup_requests,
+            )
+            preforked = measure(
+                [
+                    sys.executable, "-m", "Credit_Risk_Modelling.api.serve",
+                    "--host", "127.0.0.1", "--port", "{port}", "--workers", str(workers),
+                    "--threads-per-worker", threads,
+                ],
+                root, env, args.warmup_requests,
+            )
+            results.append({"workers": workers, "independent": independent, "preforked": preforked})
+            print(json.dumps(results[-1]), file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Benchmark suite for inference, fusion and feature engineering.
+
+Every case builds its synthetic inputs on the fly (setup is not timed) and
+is parametrized by size tier. Results are written as JSON; `compare` flags
+cases whose median time regressed beyond a threshold against a baseline.
+
+    python scripts/benchmark_suite.py run --tier small --output bench.json
+    python scripts/benchmark_suite.py run --tier all --case timeseries_fe
+    python scripts/benchmark_suite.py compare baseline.json bench.json --threshold 0.10
+
+Cases needing torch/transformers (text and document embeddings) are recorded
+as skipped when those packages or model weights are unavailable.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TIERS = ["small", "medium", "large"]
+CASES = {}
+
+
+def case(name, sizes):
+    """Register a benchmark. `sizes` maps tier -> size; the function returns (fn, items)."""
+    def register(setup):
+        CASES[name] = (setup, sizes)
+        return setup
+    return register
+
+
+# =========================
+# CASES
+# =========================
+FEATURES = ["f0", "f1", "f2", "f3", "f4"]
+
+
+@case("run_inference", {"small": 1, "medium": 100, "large": 10_000})
+def bench_run_inference(n, tmp):
+    from Credit_Risk_Modelling.pipeline.inference_pipeline import run_inference
+
+    rng = np.random.default_rng(0)
+    payloads = [
+        (pd.DataFrame([dict(zip(FEATURES, row))]), pd.DataFrame([rng.random(12)]))
+        for row in rng.random((n, len(FEATURES)))
+    ]
+
+    def run():
+        for X_tab, X_ts in payloads:
+            run_inference(X_tab, X_ts)
+
+    return run, n
+
+
+@case("heuristic_batch_scoring", {"small": 1, "medium": 10_000, "large": 1_000_000})
+def bench_heuristic_batch(n, tmp):
+    from Credit_Risk_Modelling.pipeline.inference_pipeline import (
+        attribute_tabular_heuristic,
+        attribute_timeseries_heuristic,
+    )
+
+    rng = np.random.default_rng(0)
+    X_tab = pd.DataFrame(rng.random((n, len(FEATURES))), columns=FEATURES)
+    X_ts = rng.random((n, 12))
+
+    def run():
+        attribute_tabular_heuristic(X_tab)
+        attribute_timeseries_heuristic(X_ts)
+
+    return run, n
+
+
+@case("aggregate_signals", {"small": 1, "medium": 1_000, "large": 100_000})
+def bench_aggregate_signals(n, tmp):
+    from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
+    from Credit_Risk_Modelling.pipeline.inference_pipeline import aggregate_signals
+
+    rng = np.random.default_rng(0)
+    names = ["tabular", "timeseries", "vision", "text"]
+    signal_sets = [
+        [RiskSignal(name, float(s), float(c)) for name, s, c in zip(names, rng.random(4), rng.random(4))]
+        for _ in range(n)
+    ]
+
+    def run():
+        for signals in signal_sets:
+            aggregate_signals(signals)
+
+    return run, n
+
+
+@case("timeseries_fe", {"small": 1_000, "medium": 10_000, "large": 100_000})
+def bench_timeseries_fe(n, tmp):
+    from Credit_Risk_Modelling.components.feature_engineering_timeseries import TimeSeriesFeatureEngineering
+    from Credit_Risk_Modelling.entity.feature_engineering_entity import TimeSeriesFeatureConfig
+    from Credit_Risk_Modelling.utils.generate_transactions import write_transactions, N_MONTHS
+
+    panel = tmp / "transactions.csv"
+    write_transactions(str(panel), n_customers=n)
+    fe = TimeSeriesFeatureEngineering(
+        TimeSeriesFeatureConfig(data_path=panel, output_path=tmp, window_size=5)
+    )
+    return fe.transform, n * N_MONTHS
+
+
+@case("text_fe", {"small": 32, "medium": 256, "large": 2_048})
+def bench_text_fe(n, tmp):
+    from Credit_Risk_Modelling.components.feature_engineering_text import TextFeatureEngineering
+
+    rng = np.random.default_rng(0)
+    words = np.array("late fee charged account closed without notice payment credit report dispute error".split())
+    texts = [" ".join(rng.choice(words, rng.integers(20, 120))) for _ in range(n)]
+    data_path = tmp / "complaints.csv"
+    pd.DataFrame({"Consumer complaint narrative": texts}).to_csv(data_path, index=False)
+
+    fe = TextFeatureEngineering(data_path, "Consumer complaint narrative", tmp / "text")
+    return fe.transform, n
+
+
+@case("document_fe", {"small": 16, "medium": 128, "large": 1_024})
+def bench_document_fe(n, tmp):
+    from Credit_Risk_Modelling.components.feature_engineering_documents import DocumentFeatureEngineering
+    from Credit_Risk_Modelling.utils.generate_documents import generate_dataset
+
+    image_dir = tmp / "images"
+    generate_dataset(image_dir, num_images=n, width=400, height=500, fmt="jpg")
+
+    fe = DocumentFeatureEngineering(image_dir, tmp / "documents", tmp / "manifest.json")
+    return fe.extract_embeddings, n
+
+
+# =========================
+# RUN / COMPARE
+# =========================
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def run_case(name, tier, repeats):
+    setup, sizes = CASES[name]
+    size = sizes[tier]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            fn, items = setup(size, Path(tmp))
+        except (ImportError, OSError) as e:
+            return {"size": size, "skipped": f"{type(e).__name__}: {e}"}
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+    median = float(np.median(timings))
+    return {
+        "size": size,
+        "items": items,
+        "repeats": repeats,
+        "median_s": median,
+        "min_s": float(min(timings)),
+        "items_per_s": items / median if median > 0 else None,
+    }
+
+
+def cmd_run(args):
+    tiers = TIERS if args.tier == "all" else [args.tier]
+    names = args.case or list(CASES)
+
+    results = {}
+    for name in names:
+        for tier in tiers:
+            key = f"{name}[{tier}]"
+            print(f"running {key}", file=sys.stderr)
+            results[key] = run_case(name, tier, args.repeats)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+def cmd_compare(args):
+    baseline = json.loads(Path(args.baseline).read_text())["results"]
+    current = json.loads(Path(args.current).read_text())["results"]
+
+    regressions = []
+    print(f"{'case':<40} {'baseline_s':>12} {'current_s':>12} {'change':>9}")
+    for key in sorted(set(baseline) & set(current)):
+        base, cur = baseline[key], current[key]
+        if "median_s" not in base or "median_s" not in cur:
+            continue
+
+        change = cur["median_s"] / base["median_s"] - 1
+        flag = ""
+        if change > args.threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:<40} {base['median_s']:>12.6f} {cur['median_s']:>12.6f} {change:>+8.1%}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run")
+    run.add_argument("--tier", choices=TIERS + ["all"], default="small")
+    run.add_argument("--case", action="append", choices=list(CASES))
+    run.add_argument("--repeats", type=int, default=3)
+    run.add_argument("--output")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10)
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Throughput and fidelity of the int8-quantized MiniLM encoder against fp32.
+
+Encodes a fixed corpus (seeded synthetic complaints, or the first --limit
+rows of a CSV) with each mode on CPU and reports sentences/sec, plus
+per-sentence cosine similarity to the fp32 embeddings and nearest-neighbour
+agreement (does each sentence keep its fp32 top-1 neighbour).
+
+--tokenization times the tokenizer stage alone instead: one call per text,
+batched on the thread pool, and batched from a warm token cache.
+
+    python scripts/benchmark_text_encoder.py
+    python scripts/benchmark_text_encoder.py --csv artifacts/data_ingestion/text/complaints.csv --limit 2000
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import torch
+
+from Credit_Risk_Modelling.components.text_encoder import TextEncoder
+
+WORDS = (
+    "late fee charged account closed without notice payment credit report dispute error "
+    "bank refused refund loan interest rate increased collection agency called debt "
+    "mortgage escrow balance statement incorrect identity theft fraud card"
+).split()
+
+
+def synthetic_corpus(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, rng.integers(10, 150))) for _ in range(n)]
+
+
+def _normalize(x):
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def bench_tokenization(texts, batch_size):
+    with tempfile.TemporaryDirectory() as tmp:
+        encoder = TextEncoder(batch_size=batch_size, token_cache_path=Path(tmp) / "tokens.db")
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+        def timed(fn):
+            start = time.perf_counter()
+            fn()
+            return len(texts) / (time.perf_counter() - start)
+
+        per_text = timed(lambda: [encoder.tokenizer(t, truncation=True, max_length=encoder.max_length) for t in texts])
+        pooled_cold = timed(lambda: list(encoder._tokenizer_pool.map(encoder._prepare, batches)))
+        pooled_warm = timed(lambda: list(encoder._tokenizer_pool.map(encoder._prepare, batches)))
+
+    return {
+        "per_text_sentences_per_s": per_text,
+        "pooled_cold_cache_sentences_per_s": pooled_cold,
+        "pooled_warm_cache_sentences_per_s": pooled_warm,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv")
+    parser.add_argument("--column", default="Consumer complaint narrative")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--tokenization", action="store_true")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    if args.csv:
+        texts = pd.read_csv(args.csv)[args.column].dropna().astype(str).tolist()[: args.limit]
+    else:
+        texts = synthetic_corpus(args.limit)
+
+    if args.tokenization:
+        print(json.dumps(bench_tokenization(texts, args.batch_size), indent=2))
+        return
+
+    embeddings, results = {}, []
+    for quantization in (None, "int8"):
+        encoder = TextEncoder(quantization=quantization, device=torch.device("cpu"), batch_size=args.batch_size)
+        encoder.encode(texts[: args.batch_size])  # warm-up
+
+        start = time.perf_counter()
+        embeddings[quantization] = encoder.encode(texts)
+        elapsed = time.perf_counter() - start
+
+        results.append({
+            "mode": quantization or "fp32",
+            "sentences": len(texts),
+            "sentences_per_s": len(texts) / elapsed,
+        })
+
+    reference = _normalize(embeddings[None])
+    for result, quantization in zip(results, (None, "int8")):
+        emb = _normalize(embeddings[quantization])
+        cosine = np.sum(reference * emb, axis=1)
+
+        # Top-1 neighbour of each sentence, excluding itself
+        ref_sim, sim = reference @ reference.T, emb @ emb.T
+        np.fill_diagonal(ref_sim, -np.inf)
+        np.fill_diagonal(sim, -np.inf)
+        agreement = np.mean(ref_sim.argmax(axis=1) == sim.argmax(axis=1))
+
+        result.update({
+            "cosine_to_fp32_mean": float(cosine.mean()),
+            "cosine_to_fp32_min": float(cosine.min()),
+            "top1_neighbour_agreement": float(agreement),
+        })
+
+    results[1]["speedup"] = results[1]["sentences_per_s"] / results[0]["sentences_per_s"]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Wall time and peak RSS of the time-series trainers.
+
+Each configuration runs in a fresh process so ru_maxrss reflects that trainer
+alone. The booster path is measured twice: a cold run that parses the CSV and
+builds the binary dataset cache, and a warm run that loads the cache.
+
+    python scripts/benchmark_timeseries_training.py --customers 20000
+"""
+import argparse
+import json
+import resource
+import tempfile
+import time
+from multiprocessing import get_context
+from pathlib import Path
+
+from Credit_Risk_Modelling.components.feature_engineering_timeseries import TimeSeriesFeatureEngineering
+from Credit_Risk_Modelling.components.model_trainer_timeseries import TimeSeriesModelTrainer
+from Credit_Risk_Modelling.entity.feature_engineering_entity import TimeSeriesFeatureConfig
+from Credit_Risk_Modelling.utils import generate_transactions
+
+
+def _run(mode, features_path, model_dir, num_threads, queue):
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+
+    if mode == "sklearn":
+        TimeSeriesModelTrainer(
+            features_path, model_dir / "lightgbm.pkl", "default_flag"
+        ).train()
+    else:
+        TimeSeriesModelTrainer(
+            features_path, model_dir / "lightgbm.txt", "default_flag", num_threads=num_threads
+        ).train_booster()
+
+    queue.put({
+        "mode": mode,
+        "wall_s": time.perf_counter() - start,
+        "cpu_s": time.process_time() - start_cpu,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+
+
+def measure(mode, features_path, model_dir, num_threads):
+    ctx = get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(mode, features_path, model_dir, num_threads, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--num-threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        panel_path = tmp / "transactions.csv"
+        generate_transactions.write_transactions(str(panel_path), n_customers=args.customers)
+
+        TimeSeriesFeatureEngineering(
+            TimeSeriesFeatureConfig(data_path=panel_path, output_path=tmp, window_size=5)
+        ).transform()
+        features_path = tmp / "timeseries_features.csv"
+
+        results = [
+            measure("sklearn", features_path, tmp, args.num_threads),
+            measure("booster", features_path, tmp, args.num_threads),
+            measure("booster", features_path, tmp, args.num_threads),
+        ]
+        results[1]["mode"] = "booster (cold cache)"
+        results[2]["mode"] = "booster (warm cache)"
+
+    print(json.dumps({"customers": args.customers, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Load-test harness for the prediction API.
+
+Drives `Credit_Risk_Modelling.api.main:app` in-process through an ASGI
+transport, against an already running server, or against local uvicorn
+instances started per worker count. Payloads are replayed from a JSONL file
+(one /predict body per line, or {"path": ..., "body": ...}) or synthesized.
+
+Closed loop (--concurrency N): N clients send back to back.
+Open loop (--rate R): requests are scheduled at R per second and latency is
+measured from the scheduled send time, so queueing delay is not hidden.
+
+    python scripts/load_test.py --mode asgi --requests 2000 --concurrency 16
+    python scripts/load_test.py --mode uvicorn --workers 1,4 --rate 200 --duration 20
+    python scripts/load_test.py --mode url --url http://localhost:8001 --replay payloads.jsonl
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+
+def synthetic_payloads(n, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n):
+        yield "/predict", {
+            "tabular": {"features": {f"f{i}": float(v) for i, v in enumerate(rng.random(5))}},
+            "timeseries": {"values": [rng.random(int(rng.integers(3, 13))).tolist()]},
+        }
+
+
+def replay_payloads(path):
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "body" in record:
+                yield record.get("path", "/predict"), record["body"]
+            else:
+                yield "/predict", record
+
+
+def _is_error(response):
+    return response.status_code >= 400
+
+
+async def _send(client, path, body):
+    try:
+        response = await client.post(path, json=body)
+        return _is_error(response)
+    except httpx.HTTPError:
+        return True
+
+
+async def run_closed_loop(client, payloads, concurrency):
+    payloads = iter(payloads)
+    latencies, errors = [], 0
+    lock = asyncio.Lock()
+
+    async def worker():
+        nonlocal errors
+        while True:
+            async with lock:
+                item = next(payloads, None)
+            if item is None:
+                return
+            start = time.perf_counter()
+            failed = await _send(client, *item)
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+async def run_open_loop(client, payloads, rate, duration):
+    latencies, errors = [], 0
+    tasks = []
+    start = time.perf_counter()
+
+    async def fire(scheduled, path, body):
+        nonlocal errors
+        errors += await _send(client, path, body)
+        latencies.append(time.perf_counter() - scheduled)
+
+    for i, (path, body) in enumerate(payloads):
+        scheduled = start + i / rate
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(scheduled, path, body)))
+
+    await asyncio.gather(*tasks)
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize(label, latencies, errors, elapsed):
+    ms = np.asarray(latencies) * 1000
+    return {
+        "config": label,
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "error_rate": errors / len(latencies) if latencies else 0.0,
+        "p50_ms": float(np.percentile(ms, 50)) if len(ms) else None,
+        "p95_ms": float(np.percentile(ms, 95)) if len(ms) else None,
+        "p99_ms": float(np.percentile(ms, 99)) if len(ms) else None,
+    }
+
+
+async def drive(client, args):
+    if args.replay:
+        payloads = itertools.cycle(list(replay_payloads(args.replay)))
+    else:
+        payloads = synthetic_payloads(10**9)
+
+    if args.rate:
+        return await run_open_loop(client, payloads, args.rate, args.duration)
+    return await run_closed_loop(client, itertools.islice(payloads, args.requests), args.concurrency)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_uvicorn(workers, extra_env=None):
+    port = _free_port()
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "Credit_Risk_Modelling.api.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        env={**os.environ, **(extra_env or {})},
+    )
+
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return proc, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+
+    proc.terminate()
+    raise RuntimeError(f"uvicorn with {workers} workers did not become healthy")
+
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=max(args.concurrency, 100))
+    results = []
+
+    if args.mode == "asgi":
+        from Credit_Risk_Modelling.api.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://asgi", timeout=args.timeout) as client:
+            results.append(summarize("asgi in-process", *await drive(client, args)))
+
+    elif args.mode == "url":
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+            results.append(summarize(args.url, *await drive(client, args)))
+
+    else:
+        for workers in (int(w) for w in args.workers.split(",")):
+            proc, url = start_uvicorn(workers)
+            try:
+                async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+                    results.append(summarize(f"uvicorn --workers {workers}", *await drive(client, args)))
+            finally:
+                proc.terminate()
+                proc.wait()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["asgi", "url", "uvicorn"], default="asgi")
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--workers", default="1,4", help="uvicorn mode: comma-separated worker counts to compare")
+    parser.add_argument("--replay", help="JSONL file of request bodies")
+    parser.add_argument("--requests", type=int, default=1000, help="closed loop: total requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="closed loop: concurrent clients")
+    parser.add_argument("--rate", type=float, help="open loop: requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="open loop: seconds")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
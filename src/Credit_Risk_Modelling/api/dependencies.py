@@ -1,6 +1,91 @@
 # src/Credit_Risk_Modelling/api/dependencies.py
 
-from Credit_Risk_Modelling.pipeline.inference_pipeline import run_inference
+import os
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+from Credit_Risk_Modelling.pipeline.inference_pipeline import run_inference, run_explained_inference
+
+TABULAR_MODEL_PATH = Path(
+    os.getenv("TABULAR_MODEL_PATH", "artifacts/training/tabular/lightgbm.pkl")
+)
+TIMESERIES_MODEL_PATH = Path(
+    os.getenv("TIMESERIES_MODEL_PATH", "artifacts/training/timeseries/lightgbm.txt")
+)
+DOCUMENT_MODEL_PATH = Path(
+    os.getenv("DOCUMENT_MODEL_PATH", "artifacts/training/documents/document_risk_model.pkl")
+)
+# IVF index of known document embeddings for the duplicate-document signal
+DOCUMENT_INDEX_PATH = Path(
+    os.getenv("DOCUMENT_INDEX_PATH", "artifacts/feature_engineering/documents/document_index")
+)
+DOCUMENT_DUPLICATE_THRESHOLD = float(os.getenv("DOCUMENT_DUPLICATE_THRESHOLD", "0.97"))
+# Embeddings of scored scans, shared by the workers so a resubmitted scan
+# is matched against earlier requests too; empty keeps the index read-only
+DOCUMENT_SEEN_DB = os.getenv("DOCUMENT_SEEN_DB", "artifacts/serving/seen_documents.db")
+# Per-customer features for scoring by customer_id
+FEATURE_STORE_DB = Path(
+    os.getenv("FEATURE_STORE_DB", "artifacts/serving/feature_store.db")
+)
+DOCUMENT_BATCH_SIZE = int(os.getenv("DOCUMENT_BATCH_SIZE", "16"))
+DOCUMENT_DECODE_WORKERS = int(os.getenv("DOCUMENT_DECODE_WORKERS", "4"))
+DOCUMENT_MAX_FILES = int(os.getenv("DOCUMENT_MAX_FILES", "10"))
+DOCUMENT_MAX_BYTES = int(os.getenv("DOCUMENT_MAX_BYTES", str(10 * 1024 * 1024)))
+# Score a request's complaint `text` with MiniLM and the trained topic
+# model. Off by default; without it the text signal is a placeholder
+ONLINE_TEXT_SCORING = os.getenv("ONLINE_TEXT_SCORING", "0") == "1"
+TEXT_TOPICS_PATH = Path(
+    os.getenv("TEXT_TOPICS_PATH", "artifacts/feature_engineering/text/text_topics.pkl")
+)
+TEXT_TOPIC_RISK_MAP_PATH = Path(
+    os.getenv("TEXT_TOPIC_RISK_MAP_PATH", "artifacts/feature_engineering/text/text_topic_risk_map.pkl")
+)
+# MiniLM precision for online text embedding: int8 (dynamic quantization) or fp32
+TEXT_ENCODER_QUANTIZATION = os.getenv("TEXT_ENCODER_QUANTIZATION", "int8")
+# Load the ResNet backbone, and MiniLM with ONLINE_TEXT_SCORING, at worker
+# startup (needs torch and the weights)
+PRELOAD_NEURAL_MODELS = os.getenv("PRELOAD_NEURAL_MODELS", "1") == "1"
+# Build them in the pre-forking parent instead, so workers share their
+# pages. Off by default: building and quantizing them runs torch ops,
+# which can start an OpenMP pool that the forked workers then hang on
+SHARE_NEURAL_MODELS = os.getenv("SHARE_NEURAL_MODELS", "0") == "1"
+# Tabular model features a request may omit (explained as missing values)
+TABULAR_OPTIONAL_FEATURES = [f for f in os.getenv("TABULAR_OPTIONAL_FEATURES", "").split(",") if f]
+EXPLANATION_JOBS_DB = Path(
+    os.getenv("EXPLANATION_JOBS_DB", "artifacts/serving/explanation_jobs.db")
+)
+EXPLANATION_JOB_WORKERS = int(os.getenv("EXPLANATION_JOB_WORKERS", "2"))
+EXPLANATION_JOB_QUEUE_SIZE = int(os.getenv("EXPLANATION_JOB_QUEUE_SIZE", "100"))
+EXPLANATION_JOB_TTL_SECONDS = float(os.getenv("EXPLANATION_JOB_TTL_SECONDS", "3600"))
+# Per-request budget for the modality branches; 0 waits for all of them
+INFERENCE_DEADLINE_MS = float(os.getenv("INFERENCE_DEADLINE_MS", "0"))
+# Shadow mode: re-score /predict traffic with the trained adapters in the
+# background and log paired scores, without touching the live response
+SHADOW_SCORING = os.getenv("SHADOW_SCORING", "0") == "1"
+SHADOW_SCORES_DB = Path(
+    os.getenv("SHADOW_SCORES_DB", "artifacts/serving/shadow_scores.db")
+)
+SHADOW_WORKERS = int(os.getenv("SHADOW_WORKERS", "1"))
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "1000"))
+# Streaming drift sketches of /predict inputs against the training data
+DRIFT_REFERENCE_PATH = Path(
+    os.getenv("DRIFT_REFERENCE_PATH", "artifacts/monitoring/drift_reference.json")
+)
+DRIFT_SKETCH_DIR = Path(os.getenv("DRIFT_SKETCH_DIR", "artifacts/monitoring/drift_sketches"))
+# Admission control for the scoring endpoints: concurrent requests per
+# worker (0 disables it), waiting requests, and how long they may wait
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "16"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "1000"))
+# Tune the concurrency limit from observed latency
+ADMISSION_ADAPTIVE = os.getenv("ADMISSION_ADAPTIVE", "0") == "1"
+ADMISSION_PATHS = {"/predict", "/explain", "/predict/documents"}
+# Threads available to sync endpoints in each worker (anyio's default is 40)
+SERVING_THREADPOOL_SIZE = int(os.getenv("SERVING_THREADPOOL_SIZE", "40"))
 
 
 def get_inference_engine():
@@ -9,3 +94,352 @@ def get_inference_engine():
     Can be overridden in tests.
     """
     return run_inference
+
+
+@lru_cache(maxsize=1)
+def get_tabular_model_explainer():
+    """
+    Tabular model with its SHAP explainer. Pure data, so it is safe to load
+    before forking workers. Returns None when no tabular model is deployed.
+    """
+    if not TABULAR_MODEL_PATH.exists():
+        logging.warning(f"No tabular model at {TABULAR_MODEL_PATH}; SHAP explanations disabled")
+        return None
+
+    from Credit_Risk_Modelling.components.explainability_tabular import TabularExplainer
+
+    return TabularExplainer(TABULAR_MODEL_PATH, optional_features=TABULAR_OPTIONAL_FEATURES)
+
+
+@lru_cache(maxsize=1)
+def get_tabular_explainer():
+    """
+    Process-wide batched SHAP explainer. The batcher owns a thread, so it
+    is created per worker, around the preloaded explainer.
+    """
+    explainer = get_tabular_model_explainer()
+    if explainer is None:
+        return None
+
+    from Credit_Risk_Modelling.components.explainability_tabular import ExplanationBatcher
+
+    return ExplanationBatcher(explainer)
+
+
+@lru_cache(maxsize=1)
+def get_tabular_adapter():
+    if not TABULAR_MODEL_PATH.exists():
+        return None
+
+    from Credit_Risk_Modelling.components.risk_adapter_tabular import TabularRiskAdapter
+
+    return TabularRiskAdapter(TABULAR_MODEL_PATH)
+
+
+@lru_cache(maxsize=1)
+def get_timeseries_adapter():
+    if not TIMESERIES_MODEL_PATH.exists():
+        logging.warning(f"No time-series model at {TIMESERIES_MODEL_PATH}")
+        return None
+
+    from Credit_Risk_Modelling.components.risk_adapter_timeseries import TimeSeriesRiskAdapter
+
+    return TimeSeriesRiskAdapter(TIMESERIES_MODEL_PATH)
+
+
+@lru_cache(maxsize=1)
+def get_feature_store():
+    """Online feature store, or None until one has been built."""
+    if not FEATURE_STORE_DB.exists():
+        logging.warning(f"No feature store at {FEATURE_STORE_DB}; scoring by customer_id disabled")
+        return None
+
+    from Credit_Risk_Modelling.components.feature_store import OnlineFeatureStore
+
+    return OnlineFeatureStore(FEATURE_STORE_DB)
+
+
+@lru_cache(maxsize=1)
+def get_document_risk_model():
+    if not DOCUMENT_MODEL_PATH.exists():
+        logging.warning(f"No document risk model at {DOCUMENT_MODEL_PATH}")
+        return None
+    return joblib.load(DOCUMENT_MODEL_PATH)
+
+
+@lru_cache(maxsize=1)
+def get_document_backbone():
+    """ResNet-18 feature extractor on CPU, or None without torch/weights."""
+    try:
+        import torch
+        from Credit_Risk_Modelling.components.feature_engineering_documents import load_document_backbone
+
+        model = load_document_backbone(torch.device("cpu"))
+    except (ImportError, OSError, RuntimeError) as e:
+        logging.warning(f"Document backbone unavailable: {e}")
+        return None
+
+    for param in model.parameters():
+        param.requires_grad_(False)
+    return model
+
+
+@lru_cache(maxsize=1)
+def get_document_index():
+    """Duplicate-detection index, memory-mapped so workers share its pages."""
+    if not DOCUMENT_INDEX_PATH.exists():
+        logging.warning(f"No document index at {DOCUMENT_INDEX_PATH}; duplicate detection disabled")
+        return None
+
+    from Credit_Risk_Modelling.components.document_index import DocumentIndex
+
+    return DocumentIndex.load(DOCUMENT_INDEX_PATH, mmap=True)
+
+
+@lru_cache(maxsize=1)
+def get_duplicate_detector():
+    """
+    This worker's duplicate detector around the shared index. Created after
+    the fork: it copies the index buckets that receive scans it learns.
+    """
+    index = get_document_index()
+    if index is None:
+        return None
+
+    from Credit_Risk_Modelling.components.document_index import DuplicateDetector, SeenDocumentLog
+
+    return DuplicateDetector(
+        index,
+        SeenDocumentLog(Path(DOCUMENT_SEEN_DB)) if DOCUMENT_SEEN_DB else None,
+        threshold=DOCUMENT_DUPLICATE_THRESHOLD,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_document_scorer():
+    """
+    Per-worker document image scorer around the preloaded backbone (it owns
+    a decode thread pool). None when the backbone is unavailable.
+    """
+    backbone = get_document_backbone()
+    if backbone is None:
+        return None
+
+    from Credit_Risk_Modelling.components.document_scorer import DocumentScorer
+
+    return DocumentScorer(
+        backbone,
+        get_document_risk_model(),
+        batch_size=DOCUMENT_BATCH_SIZE,
+        decode_workers=DOCUMENT_DECODE_WORKERS,
+        duplicate_detector=get_duplicate_detector(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_text_encoder():
+    """MiniLM TextEncoder on CPU, or None without torch/weights."""
+    quantization = None if TEXT_ENCODER_QUANTIZATION in ("", "fp32", "none") else TEXT_ENCODER_QUANTIZATION
+    try:
+        import torch
+        from Credit_Risk_Modelling.components.text_encoder import TextEncoder
+
+        return TextEncoder(quantization=quantization, device=torch.device("cpu"))
+    except (ImportError, OSError, RuntimeError) as e:
+        logging.warning(f"Text encoder unavailable: {e}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_text_adapter():
+    """
+    Online complaint-text scorer around the MiniLM encoder, or None unless
+    ONLINE_TEXT_SCORING is on and the encoder and topic model are available.
+    """
+    if not ONLINE_TEXT_SCORING:
+        return None
+    if not (TEXT_TOPICS_PATH.exists() and TEXT_TOPIC_RISK_MAP_PATH.exists()):
+        logging.warning(f"No text topic model at {TEXT_TOPICS_PATH}; online text scoring disabled")
+        return None
+
+    encoder = get_text_encoder()
+    if encoder is None:
+        return None
+
+    from Credit_Risk_Modelling.components.risk_adapter_text import TextRiskAdapter
+
+    return TextRiskAdapter(TEXT_TOPICS_PATH, TEXT_TOPIC_RISK_MAP_PATH, encoder=encoder)
+
+
+def preload_models(neural: bool = PRELOAD_NEURAL_MODELS):
+    """
+    Load every model and index this process will serve with; the torch
+    backbones only with `neural`.
+
+    Under the pre-forking server this runs once in the parent, so workers
+    inherit the weights copy-on-write. Nothing here may run inference: a
+    parent that has started an OpenMP thread pool (LightGBM, torch) can
+    deadlock its forked children. That is why the parent leaves the torch
+    backbones to the workers unless SHARE_NEURAL_MODELS is set.
+    """
+    loaded = {
+        "tabular": get_tabular_model_explainer(),
+        "timeseries": get_timeseries_adapter(),
+        "feature_store": get_feature_store(),
+        "document_risk_model": get_document_risk_model(),
+        "document_index": get_document_index(),
+    }
+    if SHADOW_SCORING:
+        loaded["tabular_adapter"] = get_tabular_adapter()
+    if neural:
+        loaded["document_backbone"] = get_document_backbone()
+        if ONLINE_TEXT_SCORING:
+            loaded["text_adapter"] = get_text_adapter()
+
+    ready = [name for name, model in loaded.items() if model is not None]
+    logging.info(f"Preloaded models: {', '.join(ready) or 'none'}")
+    return ready
+
+
+def resolve_inputs(request: dict):
+    """
+    (X_tabular, X_timeseries, adapters) for a request body. Inputs sent in
+    the request win; with a `customer_id`, missing ones are read from the
+    online feature store. Stored time-series rows are engineered features,
+    so they are only ever scored by the deployed time-series model.
+
+    Complaint `text` is scored by the text adapter, passed on as
+    `text_adapter` and `X_text` among the adapters.
+
+    Raises ValueError when inputs are missing, RuntimeError when the
+    feature store, the time-series model or online text scoring is not
+    available, and UnknownCustomer when the customer has no stored row for
+    a modality the request did not send.
+    """
+    customer_id = request.get("customer_id")
+    tabular, timeseries = request.get("tabular"), request.get("timeseries")
+
+    adapters = {}
+    if customer_id is None:
+        if tabular is None or timeseries is None:
+            raise ValueError("Send customer_id, or both tabular and timeseries")
+        X_tabular, X_timeseries = pd.DataFrame([tabular["features"]]), pd.DataFrame(timeseries["values"])
+    else:
+        store = get_feature_store()
+        if store is None:
+            raise RuntimeError("Feature store is not available")
+
+        if timeseries is not None:
+            X_timeseries = pd.DataFrame(timeseries["values"])
+        else:
+            timeseries_adapter = get_timeseries_adapter()
+            if timeseries_adapter is None:
+                raise RuntimeError("No time-series model is deployed to score stored features")
+            X_timeseries = pd.DataFrame([store.lookup(customer_id, "timeseries")["features"]])
+            adapters["timeseries_adapter"] = timeseries_adapter
+
+        if tabular is not None:
+            tabular_features = tabular["features"]
+        else:
+            tabular_features = store.lookup(customer_id, "tabular")["features"]
+        X_tabular = pd.DataFrame([tabular_features])
+
+    if request.get("text") is not None:
+        text_adapter = get_text_adapter()
+        if text_adapter is None:
+            raise RuntimeError("Online text scoring is not enabled")
+        adapters["text_adapter"] = text_adapter
+        adapters["X_text"] = request["text"]["texts"]
+
+    return X_tabular, X_timeseries, adapters
+
+
+def _run_explanation_job(request: dict):
+    X_tabular, X_timeseries, adapters = resolve_inputs(request)
+    return run_explained_inference(
+        X_tabular,
+        X_timeseries,
+        top_k=request.get("top_k", 5),
+        approximate=request.get("approximate", False),
+        tabular_explainer=get_tabular_explainer(),
+        **adapters,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_explanation_jobs():
+    """
+    Process-wide explanation job queue with its SQLite result store.
+    """
+    from Credit_Risk_Modelling.components.explanation_jobs import (
+        ExplanationJobStore,
+        ExplanationJobQueue,
+    )
+
+    return ExplanationJobQueue(
+        ExplanationJobStore(EXPLANATION_JOBS_DB, ttl_seconds=EXPLANATION_JOB_TTL_SECONDS),
+        handler=_run_explanation_job,
+        num_workers=EXPLANATION_JOB_WORKERS,
+        max_queue=EXPLANATION_JOB_QUEUE_SIZE,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_shadow_scorer():
+    """
+    Per-worker shadow scorer (it owns threads), or None when shadow mode is
+    off or no trained adapter is deployed.
+    """
+    if not SHADOW_SCORING:
+        return None
+
+    adapters = {
+        name: adapter
+        for name, adapter in (("tabular", get_tabular_adapter()), ("timeseries", get_timeseries_adapter()))
+        if adapter is not None
+    }
+    if not adapters:
+        logging.warning("Shadow scoring enabled but no trained adapters are deployed")
+        return None
+
+    from Credit_Risk_Modelling.components.shadow_scoring import ShadowScoreStore, ShadowScorer
+
+    return ShadowScorer(
+        ShadowScoreStore(SHADOW_SCORES_DB),
+        adapters,
+        num_workers=SHADOW_WORKERS,
+        max_queue=SHADOW_QUEUE_SIZE,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_drift_monitor():
+    """
+    This worker's drift sketches. Not preloaded: the sketch file is named
+    after the process that writes it, so it must be opened after the fork.
+    """
+    if not DRIFT_REFERENCE_PATH.exists():
+        logging.warning(f"No drift reference at {DRIFT_REFERENCE_PATH}; drift monitoring disabled")
+        return None
+
+    from Credit_Risk_Modelling.components.drift_monitor import DriftMonitor
+
+    return DriftMonitor.from_file(DRIFT_REFERENCE_PATH, DRIFT_SKETCH_DIR)
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller():
+    """This worker's admission controller, or None when disabled."""
+    if ADMISSION_MAX_CONCURRENCY <= 0:
+        return None
+
+    from Credit_Risk_Modelling.components.admission_control import AdmissionController
+
+    return AdmissionController(
+        limit=ADMISSION_MAX_CONCURRENCY,
+        max_queue=ADMISSION_MAX_QUEUE,
+        queue_timeout_s=ADMISSION_QUEUE_TIMEOUT_MS / 1000,
+        adaptive=ADMISSION_ADAPTIVE,
+        # Never past what the threadpool can actually run
+        max_limit=SERVING_THREADPOOL_SIZE,
+    )
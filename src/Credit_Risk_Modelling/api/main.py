@@ -1,9 +1,35 @@
-from fastapi import FastAPI, Depends
+import asyncio
+import logging
+import queue
+import time
+import uuid
+
+from anyio import to_thread
+from fastapi import FastAPI, Depends, HTTPException, File, Form, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import pandas as pd
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field, ValidationError, field_validator
 
-from Credit_Risk_Modelling.pipeline.inference_pipeline import run_inference
+from Credit_Risk_Modelling.pipeline.inference_pipeline import run_inference, run_explained_inference
+from Credit_Risk_Modelling.components.admission_control import AdmissionRejected
+from Credit_Risk_Modelling.components.explainability_tabular import MissingFeatures
+from Credit_Risk_Modelling.components.feature_store import UnknownCustomer
+from Credit_Risk_Modelling.api.dependencies import (
+    get_tabular_explainer,
+    get_explanation_jobs,
+    get_document_scorer,
+    get_shadow_scorer,
+    get_drift_monitor,
+    get_admission_controller,
+    preload_models,
+    SERVING_THREADPOOL_SIZE,
+    DOCUMENT_MAX_FILES,
+    DOCUMENT_MAX_BYTES,
+    INFERENCE_DEADLINE_MS,
+    ADMISSION_PATHS,
+    resolve_inputs,
+)
 
 app = FastAPI(title="Multimodal Credit Risk API")
 
@@ -16,38 +42,285 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def admission_control(request, call_next):
+    """
+    Bounded concurrency and queueing for the scoring endpoints; over
+    capacity they answer 429/503 with Retry-After right away.
+    """
+    controller = get_admission_controller()
+    if controller is None or request.url.path not in ADMISSION_PATHS:
+        return await call_next(request)
+
+    try:
+        await controller.acquire()
+    except AdmissionRejected as e:
+        return JSONResponse(
+            status_code=e.status_code,
+            content={"detail": e.reason},
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    start = time.perf_counter()
+    try:
+        return await call_next(request)
+    finally:
+        controller.release(time.perf_counter() - start)
+
+class TabularInput(BaseModel):
+    features: dict[str, float | None]
+
+class TimeSeriesInput(BaseModel):
+    # One row per sequence of transaction values; null marks a missing step
+    values: list[list[float | None]]
+
+    @field_validator("values")
+    @classmethod
+    def rows_observed(cls, values):
+        empty = [i for i, row in enumerate(values) if all(v is None for v in row)]
+        if empty:
+            raise ValueError(f"Time-series rows {empty} have no observed values")
+        return values
+
+class TextInput(BaseModel):
+    # The applicant's complaint narratives; needs ONLINE_TEXT_SCORING
+    texts: list[str] = Field(min_length=1)
+
 class PredictRequest(BaseModel):
-    tabular: dict
-    timeseries: dict
+    # Either customer_id (inputs assembled from the feature store) or both
+    # tabular and timeseries
+    customer_id: int | None = None
+    tabular: TabularInput | None = None
+    timeseries: TimeSeriesInput | None = None
+    text: TextInput | None = None
+    # Overrides INFERENCE_DEADLINE_MS for this request
+    deadline_ms: float | None = None
+
+    def deadline_s(self):
+        deadline_ms = self.deadline_ms if self.deadline_ms is not None else INFERENCE_DEADLINE_MS
+        return deadline_ms / 1000 if deadline_ms > 0 else None
+
+class ExplainRequest(PredictRequest):
+    top_k: int = Field(5, ge=1)
+    approximate: bool = False
+
+def _inputs(payload: PredictRequest):
+    """Model inputs for a request, with lookup failures as HTTP errors."""
+    try:
+        return resolve_inputs(payload.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except UnknownCustomer as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.on_event("startup")
+async def preload():
+    to_thread.current_default_thread_limiter().total_tokens = SERVING_THREADPOOL_SIZE
+    # Under the pre-forking server the parent has already loaded (and
+    # cached) everything but the torch backbones, which load here
+    preload_models()
+    get_tabular_explainer()
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 @app.post("/predict")
-def predict(payload: PredictRequest):
+def predict(
+    payload: PredictRequest,
+    shadow=Depends(get_shadow_scorer),
+    drift=Depends(get_drift_monitor),
+):
     """
     Predict credit risk using multimodal heuristic scoring.
     No trained models required.
+
+    In shadow mode the same inputs are queued for the trained adapters
+    after the result is ready; that never delays or changes the response.
     """
+    X_tabular, X_timeseries, adapters = _inputs(payload)
+    if drift is not None:
+        # Only inputs the client sent; stored features are not live traffic
+        drift.observe(
+            payload.tabular.features if payload.tabular else None,
+            payload.timeseries.values if payload.timeseries else None,
+        )
     try:
-        # Convert to DataFrames
-        X_tabular = pd.DataFrame([payload.tabular["features"]])
-        X_timeseries = pd.DataFrame(payload.timeseries["values"])
-        
         # Run inference
-        result = run_inference(X_tabular, X_timeseries)
+        result = run_inference(X_tabular, X_timeseries, deadline_s=payload.deadline_s(), **adapters)
+
+        if shadow is not None:
+            shadow.submit(
+                uuid.uuid4().hex,
+                {"tabular": X_tabular, "timeseries": X_timeseries},
+                result,
+                skip=[name.removesuffix("_adapter") for name in adapters if name.endswith("_adapter")],
+            )
         
         return result
-        
+
     except Exception as e:
-        return {
-            "error": str(e),
-            "final_risk_score": 0.5,
-            "breakdown": {
-                "tabular": {"score": 0.5, "confidence": 0.5, "percent_contribution": 0.25},
-                "timeseries": {"score": 0.5, "confidence": 0.5, "percent_contribution": 0.25},
-                "vision": {"score": 0.5, "confidence": 0.5, "percent_contribution": 0.25},
-                "text": {"score": 0.5, "confidence": 0.5, "percent_contribution": 0.25}
-            }
-        }
\ No newline at end of file
+        # Never a made-up score: the client sees the failure
+        logging.exception("Inference failed")
+        raise HTTPException(status_code=500, detail=f"Inference failed: {e}")
+
+@app.post("/explain")
+def explain(payload: ExplainRequest, explainer=Depends(get_tabular_explainer)):
+    """
+    Predict credit risk and attribute it for this applicant.
+    Exact heuristic component contributions are always returned; with a
+    deployed tabular model, SHAP attributions are added (`approximate`
+    trades exact SHAP for bounded-cost path attributions).
+    """
+    X_tabular, X_timeseries, adapters = _inputs(payload)
+
+    try:
+        return run_explained_inference(
+            X_tabular,
+            X_timeseries,
+            top_k=payload.top_k,
+            approximate=payload.approximate,
+            tabular_explainer=explainer,
+            deadline_s=payload.deadline_s(),
+            **adapters,
+        )
+    except MissingFeatures as e:
+        raise HTTPException(status_code=422, detail={"message": str(e), "missing_features": e.missing})
+
+@app.post("/predict/documents")
+async def predict_documents(
+    files: list[UploadFile] = File(...),
+    payload: str | None = Form(None),
+    scorer=Depends(get_document_scorer),
+):
+    """
+    Score the applicant's uploaded document scans (multipart, spooled to
+    disk as it streams in) and, when `payload` carries the PredictRequest
+    JSON, fuse the vision signal with the other modalities. Scoring and
+    fusion share the request deadline; scoring past it is a 504.
+    """
+    if scorer is None:
+        raise HTTPException(status_code=503, detail="Document scoring model is not available")
+    if len(files) > DOCUMENT_MAX_FILES:
+        raise HTTPException(status_code=413, detail=f"At most {DOCUMENT_MAX_FILES} documents per request")
+
+    try:
+        request = PredictRequest.model_validate_json(payload) if payload else None
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+    # Resolved before scoring so an unknown customer fails fast
+    inputs = await run_in_threadpool(_inputs, request) if request is not None else None
+
+    images = []
+    for file in files:
+        if file.size is not None and file.size > DOCUMENT_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"{file.filename} exceeds {DOCUMENT_MAX_BYTES} bytes")
+        images.append(await file.read())
+
+    if request is not None:
+        deadline_s = request.deadline_s()
+    else:
+        deadline_s = INFERENCE_DEADLINE_MS / 1000 if INFERENCE_DEADLINE_MS > 0 else None
+    start = time.perf_counter()
+    try:
+        vision_signal, documents, duplicate_signal = await asyncio.wait_for(scorer.score(images), deadline_s)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except asyncio.TimeoutError:
+        # The vision signal is what this endpoint is for, so no partial answer
+        raise HTTPException(
+            status_code=504, detail=f"Document scoring did not finish within the {deadline_s * 1000:.0f} ms deadline"
+        )
+
+    for file, document in zip(files, documents):
+        document["filename"] = file.filename
+
+    response = {
+        "vision": {"score": vision_signal.score, "confidence": vision_signal.confidence},
+        "documents": documents,
+        "duplicate": (
+            {"score": duplicate_signal.score, "confidence": duplicate_signal.confidence}
+            if duplicate_signal is not None else None
+        ),
+        "scoring_ms": (time.perf_counter() - start) * 1000,
+    }
+
+    if request is not None:
+        X_tabular, X_timeseries, adapters = inputs
+        result = await run_in_threadpool(
+            run_inference,
+            X_tabular,
+            X_timeseries,
+            vision_signal=vision_signal,
+            extra_signals=[duplicate_signal] if duplicate_signal is not None else None,
+            # Document scoring already spent part of the budget
+            deadline_s=None if deadline_s is None else max(0.0, deadline_s - (time.perf_counter() - start)),
+            **adapters,
+        )
+        response = {**result, **response}
+
+    return response
+
+@app.get("/admission")
+def admission_metrics(controller=Depends(get_admission_controller)):
+    """Concurrency limit, queue depth and admitted/queued/rejected counts for this worker."""
+    if controller is None:
+        return {"enabled": False}
+    return {"enabled": True, **controller.metrics()}
+
+@app.get("/shadow")
+def shadow_status(since: float = 0.0, shadow=Depends(get_shadow_scorer)):
+    """Shadow queue counters and live-vs-model score agreement since `since` (unix time)."""
+    if shadow is None:
+        return {"enabled": False}
+
+    return {
+        "enabled": True,
+        "models": sorted(shadow.adapters),
+        "submitted": shadow.submitted,
+        "dropped": shadow.dropped,
+        "queue_depth": shadow.qsize(),
+        "summary": shadow.store.summary(since),
+    }
+
+@app.get("/drift")
+def drift_report(drift=Depends(get_drift_monitor)):
+    """Live /predict input distributions against the training reference, across workers."""
+    if drift is None:
+        raise HTTPException(status_code=503, detail="No drift reference has been built")
+    return drift.report()
+
+@app.post("/drift/reset")
+def reset_drift(drift=Depends(get_drift_monitor)):
+    if drift is None:
+        raise HTTPException(status_code=503, detail="No drift reference has been built")
+    drift.reset()
+    return {"status": "reset"}
+
+@app.post("/explain/jobs", status_code=202)
+def submit_explanation_job(payload: ExplainRequest, jobs=Depends(get_explanation_jobs)):
+    """
+    Queue a full explanation for background computation.
+    Poll GET /explain/jobs/{job_id} for the result.
+    """
+    # Reject unknown customers now rather than as a failed job
+    _inputs(payload)
+    try:
+        job_id = jobs.submit(payload.model_dump())
+    except queue.Full:
+        raise HTTPException(
+            status_code=429,
+            detail="Explanation queue is full",
+            headers={"Retry-After": "30"},
+        )
+
+    return {"job_id": job_id, "status": "queued", "queue_depth": jobs.qsize()}
+
+@app.get("/explain/jobs/{job_id}")
+def get_explanation_job(job_id: str, jobs=Depends(get_explanation_jobs)):
+    job = jobs.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job
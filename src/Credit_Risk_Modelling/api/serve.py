@@ -0,0 +1,198 @@
+"""
+Pre-forking server for the prediction API.
+
+The tree models, SHAP explainer and document index are loaded once in
+the parent process, which then forks the workers. Workers share the
+parent's weight pages copy-on-write (and the memory-mapped index files
+through the page cache) instead of each loading its own copy, and all
+accept on one listening socket. The torch backbones are built in each
+worker after the fork, unless SHARE_NEURAL_MODELS=1.
+
+A worker that exits is replaced. Workers that keep dying soon after they
+start are restarted with exponential backoff, and the server gives up and
+exits once too many fail in a row.
+
+    python -m Credit_Risk_Modelling.api.serve --workers 4 --threads-per-worker 2
+
+Worker count and thread sizing can also come from SERVING_WORKERS,
+SERVING_THREADS_PER_WORKER and SERVING_THREADPOOL_SIZE.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+# Native thread pools read these when first initialized
+THREAD_ENV_VARS = ["OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"]
+
+
+def configure_threads(threads_per_worker: int, threadpool_size: int | None):
+    """Must run before numpy, LightGBM or torch are imported."""
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads_per_worker)
+    if threadpool_size:
+        os.environ["SERVING_THREADPOOL_SIZE"] = str(threadpool_size)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    def __init__(
+        self,
+        sock: socket.socket,
+        num_workers: int,
+        log_level: str = "info",
+        min_uptime_s: float = 10.0,
+        max_fast_failures: int = 5,
+        max_backoff_s: float = 30.0,
+    ):
+        self.sock = sock
+        self.num_workers = num_workers
+        self.log_level = log_level
+        # A worker that exits within min_uptime_s of starting counts as a
+        # failed start; max_fast_failures of them in a row stop the server
+        self.min_uptime_s = min_uptime_s
+        self.max_fast_failures = max_fast_failures
+        self.max_backoff_s = max_backoff_s
+        self.workers = {}
+        self.fast_failures = 0
+        self.exit_code = 0
+        self.stopping = False
+
+    def _run_worker(self):
+        import uvicorn
+        from Credit_Risk_Modelling.api.main import app
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        config = uvicorn.Config(app, log_level=self.log_level)
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._run_worker()
+            except BaseException:
+                logging.exception("Worker crashed")
+                code = 1
+            finally:
+                os._exit(code)
+
+        self.workers[pid] = time.monotonic()
+        logging.info(f"Started worker {pid}")
+
+    def _stop(self, signum, frame):
+        self.stopping = True
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        for _ in range(self.num_workers):
+            self.spawn()
+
+        # Replacements wait out their backoff here, while exits are still
+        # reaped promptly, so each worker's uptime is measured accurately
+        restarts = []
+        while self.workers or (restarts and not self.stopping):
+            pid, status = os.waitpid(-1, os.WNOHANG) if self.workers else (0, 0)
+            now = time.monotonic()
+            if pid == 0:
+                if self.stopping:
+                    restarts.clear()
+                while restarts and restarts[0] <= now:
+                    restarts.pop(0)
+                    # A replacement still inherits the preloaded pages
+                    self.spawn()
+                time.sleep(0.1)
+                continue
+
+            started = self.workers.pop(pid, None)
+            if self.stopping or started is None:
+                continue
+
+            uptime = now - started
+            self.fast_failures = self.fast_failures + 1 if uptime < self.min_uptime_s else 0
+            if self.fast_failures >= self.max_fast_failures:
+                logging.error(
+                    f"{self.fast_failures} workers in a row exited within {self.min_uptime_s:.0f}s "
+                    f"of starting; shutting down"
+                )
+                self.exit_code = 1
+                self._stop(None, None)
+                continue
+
+            delay = min(self.max_backoff_s, 2 ** (self.fast_failures - 1)) if self.fast_failures else 0
+            logging.warning(
+                f"Worker {pid} exited with status {status} after {uptime:.1f}s; restarting in {delay}s"
+            )
+            restarts.append(now + delay)
+            restarts.sort()
+
+        return self.exit_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "7860")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SERVING_WORKERS", "1")))
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=int(os.getenv("SERVING_THREADS_PER_WORKER", "0")),
+        help="native (OpenMP/BLAS/torch) threads per worker; default cpu_count // workers",
+    )
+    parser.add_argument(
+        "--threadpool-size",
+        type=int,
+        default=None,
+        help="threads for sync endpoints in each worker",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format="[%(asctime)s] %(levelname)s %(process)d %(message)s")
+
+    threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // args.workers)
+    configure_threads(threads, args.threadpool_size)
+
+    # Import the app in the parent too, so workers share its code objects
+    from Credit_Risk_Modelling.api.main import app  # noqa: F401
+    from Credit_Risk_Modelling.api.dependencies import preload_models, SHARE_NEURAL_MODELS
+
+    preload_models(neural=SHARE_NEURAL_MODELS)
+
+    # Everything allocated so far is long-lived: keep the collector from
+    # touching (and so un-sharing) those pages in the workers.
+    gc.collect()
+    gc.freeze()
+
+    sock = bind_socket(args.host, args.port)
+    logging.info(
+        f"Serving on {args.host}:{args.port} with {args.workers} workers x {threads} threads"
+    )
+    sys.exit(PreforkServer(sock, args.workers, args.log_level).run())
+
+
+if __name__ == "__main__":
+    main()
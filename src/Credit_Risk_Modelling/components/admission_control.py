@@ -0,0 +1,160 @@
+import asyncio
+import math
+import statistics
+import time
+from collections import deque
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded wait queue, for one worker's event loop.
+
+    Up to `limit` requests run at once and up to `max_queue` more wait in
+    FIFO order. A request arriving to a full queue is rejected at once
+    (429). One that waits longer than `queue_timeout_s` is rejected with a
+    503. Both carry a Retry-After estimate, so overload fails fast instead
+    of piling up in the threadpool until clients time out.
+
+    With `adaptive`, the limit is tuned AIMD-style from the median latency
+    of each `window` completed requests. If the median stays within
+    `latency_tolerance` x the best recent median while the limit is
+    saturated, the limit grows by one. Otherwise it shrinks by 10%. It is
+    kept within [min_limit, max_limit]. The baseline median drifts up 1% a
+    window, so it follows a genuine change in service time.
+    """
+
+    def __init__(
+        self,
+        limit: int = 16,
+        max_queue: int = 64,
+        queue_timeout_s: float = 1.0,
+        adaptive: bool = False,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        latency_tolerance: float = 2.0,
+        window: int = 100,
+    ):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.adaptive = adaptive
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.window = window
+
+        self.in_flight = 0
+        self._waiters = deque()
+        self._latencies = []
+        self._peak_in_flight = 0
+        self._baseline = None
+
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = {"queue_full": 0, "queue_timeout": 0}
+        self._queue_wait_s = deque(maxlen=1000)
+        self._recent_latency_s = deque(maxlen=1000)
+
+    def _start(self):
+        self.in_flight += 1
+        self.admitted += 1
+        self._peak_in_flight = max(self._peak_in_flight, self.in_flight)
+
+    def retry_after(self) -> int:
+        """Seconds for the current queue to drain at the observed service time."""
+        service_s = statistics.median(self._recent_latency_s) if self._recent_latency_s else 1.0
+        return max(1, math.ceil((len(self._waiters) + 1) * service_s / max(self.limit, 1)))
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the time spent queued. Raises AdmissionRejected."""
+        if self.in_flight < self.limit and not self._waiters:
+            self._start()
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected["queue_full"] += 1
+            raise AdmissionRejected(429, "Server is at capacity", self.retry_after())
+
+        start = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout_s)
+        except asyncio.TimeoutError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self.rejected["queue_timeout"] += 1
+            raise AdmissionRejected(503, "Timed out waiting for capacity", self.retry_after())
+        except asyncio.CancelledError:
+            # Client went away; hand back a slot granted as it was cancelled
+            if waiter.done() and not waiter.cancelled():
+                self.in_flight -= 1
+                self._grant()
+            raise
+
+        wait_s = time.perf_counter() - start
+        self._queue_wait_s.append(wait_s)
+        return wait_s
+
+    def release(self, latency_s: float):
+        self.in_flight -= 1
+        self._recent_latency_s.append(latency_s)
+        if self.adaptive:
+            self._adapt(latency_s)
+        self._grant()
+
+    def _grant(self):
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._start()
+                waiter.set_result(None)
+
+    def _adapt(self, latency_s: float):
+        self._latencies.append(latency_s)
+        if len(self._latencies) < self.window:
+            return
+
+        sample = statistics.median(self._latencies)
+        saturated = self._peak_in_flight >= self.limit
+        self._latencies, self._peak_in_flight = [], self.in_flight
+
+        if self._baseline is None or sample < self._baseline:
+            self._baseline = sample
+        if sample <= self.latency_tolerance * self._baseline:
+            if saturated:
+                self.limit = min(self.max_limit, self.limit + 1)
+        else:
+            self.limit = max(self.min_limit, int(self.limit * 0.9))
+        self._baseline *= 1.01
+
+    def metrics(self) -> dict:
+        waits = sorted(self._queue_wait_s)
+        latencies = sorted(self._recent_latency_s)
+
+        def p(values, q):
+            return values[min(len(values) - 1, int(q * len(values)))] * 1000 if values else None
+
+        return {
+            "limit": self.limit,
+            "adaptive": self.adaptive,
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": dict(self.rejected),
+            "queue_wait_p50_ms": p(waits, 0.5),
+            "queue_wait_p99_ms": p(waits, 0.99),
+            "latency_p50_ms": p(latencies, 0.5),
+            "latency_p99_ms": p(latencies, 0.99),
+        }
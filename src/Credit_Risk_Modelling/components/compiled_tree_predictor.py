@@ -0,0 +1,169 @@
+import logging
+import numpy as np
+import pandas as pd
+
+# LightGBM treats |x| <= kZeroThreshold as zero for missing_type "Zero"
+ZERO_THRESHOLD = 1e-35
+MISSING_TYPES = {"None": 0, "Zero": 1, "NaN": 2}
+
+
+class CompiledTreePredictor:
+    """
+    LightGBM binary classifier flattened into contiguous NumPy node arrays.
+
+    All trees share one node table; leaves point to themselves, so a batch is
+    scored by stepping every (row, tree) cursor `max_depth` times with fancy
+    indexing and summing the leaf values. No sklearn wrapper, no DataFrame
+    validation: single-row latency is a handful of small array ops.
+    """
+
+    def __init__(self, booster, num_iteration: int | None = None):
+        if num_iteration is None:
+            num_iteration = booster.best_iteration or None
+
+        dump = booster.dump_model(num_iteration=num_iteration)
+        objective = dump.get("objective", "")
+        if not objective.startswith("binary") or dump.get("num_class", 1) != 1:
+            raise NotImplementedError(f"Unsupported objective for compiled inference: {objective}")
+
+        self.sigmoid = 1.0
+        for token in objective.split():
+            if token.startswith("sigmoid:"):
+                self.sigmoid = float(token.split(":", 1)[1])
+
+        self.feature_names = dump["feature_names"]
+
+        feature, threshold, missing_type, default_left = [], [], [], []
+        left, right, value, node_value = [], [], [], []
+        roots = []
+        max_depth = 0
+
+        def add(node, depth):
+            nonlocal max_depth
+            idx = len(feature)
+            feature.append(0)
+            threshold.append(0.0)
+            missing_type.append(0)
+            default_left.append(False)
+            left.append(idx)
+            right.append(idx)
+            value.append(0.0)
+            node_value.append(node.get("leaf_value", node.get("internal_value", 0.0)))
+
+            if "leaf_value" in node:
+                value[idx] = node["leaf_value"]
+                max_depth = max(max_depth, depth)
+                return idx
+
+            if node["decision_type"] != "<=":
+                raise NotImplementedError("Categorical splits are not supported by compiled inference")
+
+            feature[idx] = node["split_feature"]
+            threshold[idx] = node["threshold"]
+            missing_type[idx] = MISSING_TYPES[node["missing_type"]]
+            default_left[idx] = node["default_left"]
+            left[idx] = add(node["left_child"], depth + 1)
+            right[idx] = add(node["right_child"], depth + 1)
+            return idx
+
+        for tree in dump["tree_info"]:
+            roots.append(add(tree["tree_structure"], 0))
+
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.missing_type = np.asarray(missing_type, dtype=np.int8)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        # children[2 * i] is the left child of node i, children[2 * i + 1] the right
+        self.children = np.column_stack([left, right]).astype(np.int64).ravel()
+        self.has_zero_missing = bool((self.missing_type == 1).any())
+        self.value = np.asarray(value, dtype=np.float64)
+        # Expected raw score at every node, used for path attributions
+        self.node_value = np.asarray(node_value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_model(cls, model):
+        """Accepts an lgb.Booster or a fitted LGBMClassifier."""
+        if hasattr(model, "booster_"):
+            return cls(model.booster_, num_iteration=getattr(model, "best_iteration_", None) or None)
+        return cls(model)
+
+    @classmethod
+    def try_from_model(cls, model):
+        """from_model, or None when the model needs LightGBM's own predictor."""
+        try:
+            return cls.from_model(model)
+        except NotImplementedError as e:
+            logging.warning(f"Compiled inference unavailable, using LightGBM: {e}")
+            return None
+
+    def _as_array(self, X):
+        if isinstance(X, pd.DataFrame):
+            X = X[self.feature_names].to_numpy(dtype=np.float64)
+        X = np.asarray(X, dtype=np.float64)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+
+    def _walk(self, X):
+        """Yields the (rows, trees) node cursors before each step and after the last."""
+        n_rows, n_features = X.shape
+        X_flat = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        nodes = np.broadcast_to(self.roots, (n_rows, self.roots.size)).copy()
+
+        # Without NaNs or zero-as-missing splits, routing is a single compare
+        handle_missing = self.has_zero_missing or np.isnan(X_flat).any()
+
+        for _ in range(self.max_depth):
+            yield nodes
+            x = X_flat[row_offsets + self.feature[nodes]]
+
+            if handle_missing:
+                mt = self.missing_type[nodes]
+                is_nan = np.isnan(x)
+                x = np.where(is_nan & (mt != 2), 0.0, x)
+                is_missing = ((mt == 1) & (np.abs(x) <= ZERO_THRESHOLD)) | ((mt == 2) & is_nan)
+                go_right = np.where(is_missing, ~self.default_left[nodes], x > self.threshold[nodes])
+            else:
+                go_right = x > self.threshold[nodes]
+
+            nodes = self.children[2 * nodes + go_right]
+
+        yield nodes
+
+    def predict_raw(self, X):
+        X = self._as_array(X)
+        for nodes in self._walk(X):
+            pass
+        return self.value[nodes].sum(axis=1)
+
+    def path_contributions(self, X):
+        """
+        Saabas path attributions in raw-score space: every split credits its
+        feature with the change in expected value from parent to child.
+        Cost is O(trees x depth) per row regardless of the data.
+
+        Returns (contributions [n_rows, n_features], bias) where each row of
+        contributions plus bias equals predict_raw for that row.
+        """
+        X = self._as_array(X)
+        n_rows, n_features = X.shape
+        row_offsets = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        contributions = np.zeros(n_rows * n_features)
+
+        parent = None
+        for nodes in self._walk(X):
+            if parent is not None:
+                delta = self.node_value[nodes] - self.node_value[parent]
+                idx = row_offsets + self.feature[parent]
+                contributions += np.bincount(
+                    idx.ravel(), weights=delta.ravel(), minlength=n_rows * n_features
+                )
+            parent = nodes
+
+        bias = float(self.node_value[self.roots].sum())
+        return contributions.reshape(n_rows, n_features), bias
+
+    def predict_proba(self, X):
+        p = 1.0 / (1.0 + np.exp(-self.sigmoid * self.predict_raw(X)))
+        return np.column_stack([1.0 - p, p])
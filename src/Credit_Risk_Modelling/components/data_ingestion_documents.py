@@ -1,14 +1,16 @@
 import logging
 from pathlib import Path
+from Credit_Risk_Modelling.utils.document_manifest import DocumentManifest
 
 class DocumentDataIngestion:
-    def __init__(self, root_dir: Path):
+    def __init__(self, root_dir: Path, manifest_path: Path | None = None):
         self.root_dir = root_dir
+        self.manifest_path = manifest_path
 
     def ingest(self):
         logging.info("Validating document image dataset")
         if not self.root_dir.exists():
             raise FileNotFoundError("Document image directory missing")
-        total_images = len(list(self.root_dir.glob("**/*.jpg")))
-        logging.info(f"Total document images found: {total_images}")
+        manifest = DocumentManifest(self.root_dir, self.manifest_path).refresh()
+        logging.info(f"Total document images found: {len(manifest)}")
         return self.root_dir
@@ -8,7 +8,12 @@ class TabularDataIngestion:
 
     def ingest(self):
         logging.info("Starting tabular data ingestion")
-        download_file(self.config.source_url, self.config.local_path)
+        download_file(
+            self.config.source_url,
+            self.config.local_path,
+            expected_md5=self.config.md5,
+            num_connections=self.config.download_connections,
+        )
         checksum = calculate_md5(self.config.local_path)
         logging.info(f"Tabular data checksum: {checksum}")
         return self.config.local_path
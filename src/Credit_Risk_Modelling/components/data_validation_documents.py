@@ -1,9 +1,11 @@
 import logging
 from pathlib import Path
+from Credit_Risk_Modelling.utils.document_manifest import DocumentManifest
 
 class DocumentDataValidation:
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, manifest_path: Path | None = None):
         self.data_dir = data_dir
+        self.manifest_path = manifest_path
 
     def validate(self):
         logging.info("Validating document image data")
@@ -11,10 +13,10 @@ class DocumentDataValidation:
         if not self.data_dir.exists():
             raise FileNotFoundError("Document directory does not exist")
 
-        image_files = list(self.data_dir.glob("**/*.jpg")) + list(self.data_dir.glob("**/*.png"))
+        manifest = DocumentManifest.load_or_refresh(self.data_dir, self.manifest_path)
 
-        if len(image_files) < 100:
+        if len(manifest) < 100:
             raise ValueError("Too few document images found")
 
-        logging.info(f"Validated {len(image_files)} document images")
+        logging.info(f"Validated {len(manifest)} document images")
         return True
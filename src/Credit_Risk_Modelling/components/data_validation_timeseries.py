@@ -1,29 +1,29 @@
-import pandas as pd
 import logging
+import numpy as np
 from pathlib import Path
+from Credit_Risk_Modelling.utils.panel_schema import read_panel, iter_panel
 
 class TimeSeriesDataValidation:
-    def __init__(self, data_path: Path):
+    def __init__(
+        self,
+        data_path: Path,
+        memory_budget_mb: float | None = None,
+        budget_action: str = "warn",
+        chunk_rows: int | None = None,
+    ):
         self.data_path = data_path
+        self.memory_budget_mb = memory_budget_mb
+        self.budget_action = budget_action
+        # Set to stream the panel in chunks instead of loading it whole
+        self.chunk_rows = chunk_rows
         self.entity_col = None
         self.time_col = None
 
-    def validate(self):
-        logging.info("Validating time-series (panel) data")
-        df = pd.read_csv(self.data_path)
-
-        # Normalize column names
-        df.columns = (
-            df.columns
-            .astype(str)
-            .str.strip()
-            .str.lower()
-        )
-
+    def _detect_columns(self, columns):
         # Detect entity identifier
         possible_entity_cols = ["customer_id", "user_id", "account_id"]
         for col in possible_entity_cols:
-            if col in df.columns:
+            if col in columns:
                 self.entity_col = col
                 break
 
@@ -33,15 +33,50 @@ class TimeSeriesDataValidation:
         # Detect time index
         possible_time_cols = ["month", "time", "period"]
         for col in possible_time_cols:
-            if col in df.columns:
+            if col in columns:
                 self.time_col = col
                 break
 
         if self.time_col is None:
             raise ValueError("No time index column found")
 
+    def _is_ordered_streaming(self):
+        """
+        Ordering check in one pass over chunks, carrying the last key of
+        each chunk into the next.
+        """
+        prev = None
+        for chunk in iter_panel(self.data_path, self.chunk_rows):
+            if prev is None:
+                self._detect_columns(chunk.columns)
+
+            entity = chunk[self.entity_col].to_numpy()
+            time = chunk[self.time_col].to_numpy()
+            if prev is not None:
+                entity = np.concatenate([[prev[0]], entity])
+                time = np.concatenate([[prev[1]], time])
+
+            e0, e1, t0, t1 = entity[:-1], entity[1:], time[:-1], time[1:]
+            if not np.all((e1 > e0) | ((e1 == e0) & (t1 >= t0))):
+                return False
+            prev = entity[-1], time[-1]
+
+        if prev is None:
+            raise ValueError(f"No rows in {self.data_path}")
+        return True
+
+    def validate(self):
+        logging.info("Validating time-series (panel) data")
+
+        if self.chunk_rows:
+            ordered = self._is_ordered_streaming()
+        else:
+            df = read_panel(self.data_path, self.memory_budget_mb, self.budget_action)
+            self._detect_columns(df.columns)
+            ordered = df.sort_values([self.entity_col, self.time_col]).equals(df)
+
         # Check ordering per entity
-        if not df.sort_values([self.entity_col, self.time_col]).equals(df):
+        if not ordered:
             logging.warning(
                 "Time-series data is not ordered by entity and time index"
             )
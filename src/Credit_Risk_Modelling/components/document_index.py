@@ -0,0 +1,316 @@
+import json
+import logging
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
+
+# Rows per chunk when assigning vectors to centroids, to bound temporaries
+ASSIGN_CHUNK = 65_536
+# Index ids of scans recorded while serving start here, clear of the
+# consecutive ids the pipeline gives its training documents
+ONLINE_ID_BASE = 1 << 40
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def _assign(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(len(x), dtype=np.int64)
+    for i in range(0, len(x), ASSIGN_CHUNK):
+        labels[i:i + ASSIGN_CHUNK] = (x[i:i + ASSIGN_CHUNK] @ centroids.T).argmax(axis=1)
+    return labels
+
+
+def spherical_kmeans(x: np.ndarray, nlist: int, iterations: int = 10, seed: int = 42) -> np.ndarray:
+    """k-means on the unit sphere (cosine), with empty clusters re-seeded."""
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = _assign(x, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, x)
+        counts = np.bincount(labels, minlength=nlist)
+
+        empty = counts == 0
+        sums[empty] = x[rng.choice(len(x), empty.sum(), replace=False)]
+        centroids = _normalize(sums)
+
+    return centroids
+
+
+class DocumentIndex:
+    """
+    Inverted-file (IVF) nearest-neighbour index over L2-normalized document
+    embeddings, scored by cosine similarity.
+
+    Vectors are bucketed by their nearest of `nlist` k-means centroids, and a
+    query only scans the `nprobe` buckets whose centroids are closest. Each
+    bucket is a contiguous array with spare capacity, so inserts are
+    amortized appends. On disk the buckets are stored end to end (CSR), and
+    `load` memory-maps them; a bucket is copied into memory the first time
+    it receives an insert.
+    """
+
+    def __init__(self, centroids: np.ndarray):
+        self.centroids = _normalize(centroids)
+        nlist, self.dim = self.centroids.shape
+        self._vectors = [np.empty((0, self.dim), dtype=np.float32) for _ in range(nlist)]
+        self._ids = [np.empty(0, dtype=np.int64) for _ in range(nlist)]
+        self._sizes = np.zeros(nlist, dtype=np.int64)
+        self.next_id = 0
+
+    def __len__(self):
+        return int(self._sizes.sum())
+
+    @classmethod
+    def train(
+        cls,
+        embeddings: np.ndarray,
+        nlist: int | None = None,
+        iterations: int = 10,
+        sample_size: int | None = None,
+        seed: int = 42,
+    ):
+        """
+        Centroids from a sample of `embeddings`; does not add them. The
+        default of ~2*sqrt(n) buckets keeps an nprobe=8 scan under a
+        millisecond at 1M x 512 (scripts/benchmark_document_index.py).
+        """
+        x = _normalize(embeddings)
+        nlist = nlist or max(1, min(len(x), int(2 * np.sqrt(len(x)))))
+        sample_size = min(len(x), sample_size or 64 * nlist)
+
+        rng = np.random.default_rng(seed)
+        sample = x[np.sort(rng.choice(len(x), sample_size, replace=False))]
+        return cls(spherical_kmeans(sample, nlist, iterations, seed))
+
+    def _append(self, bucket: int, vectors: np.ndarray, ids: np.ndarray):
+        size, n = self._sizes[bucket], len(vectors)
+        capacity = len(self._vectors[bucket])
+        stored = self._vectors[bucket]
+
+        # Grow by doubling; memory-mapped buckets (not writeable) get copied here
+        if size + n > capacity or not stored.flags.writeable:
+            new_capacity = max(2 * capacity, size + n, 16)
+            grown = np.empty((new_capacity, self.dim), dtype=np.float32)
+            grown[:size] = stored[:size]
+            grown_ids = np.empty(new_capacity, dtype=np.int64)
+            grown_ids[:size] = self._ids[bucket][:size]
+            self._vectors[bucket], self._ids[bucket] = grown, grown_ids
+
+        self._vectors[bucket][size:size + n] = vectors
+        self._ids[bucket][size:size + n] = ids
+        self._sizes[bucket] = size + n
+
+    def add(self, embeddings: np.ndarray, ids=None) -> np.ndarray:
+        """Insert embeddings; ids default to consecutive integers."""
+        x = _normalize(np.atleast_2d(embeddings))
+        if ids is None:
+            ids = np.arange(self.next_id, self.next_id + len(x), dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        self.next_id = max(self.next_id, int(ids.max()) + 1) if len(ids) else self.next_id
+
+        labels = _assign(x, self.centroids)
+        order = np.argsort(labels, kind="stable")
+        buckets, starts = np.unique(labels[order], return_index=True)
+        for bucket, chunk in zip(buckets, np.split(order, starts[1:])):
+            self._append(int(bucket), x[chunk], ids[chunk])
+        return ids
+
+    def search(self, queries: np.ndarray, k: int = 5, nprobe: int = 8):
+        """
+        Top-k by cosine similarity for each query row.
+        Returns (similarities, ids), each (n_queries, k), padded with -inf / -1.
+        """
+        q = _normalize(np.atleast_2d(queries))
+        nprobe = min(nprobe, len(self.centroids))
+        similarities = np.full((len(q), k), -np.inf, dtype=np.float32)
+        ids = np.full((len(q), k), -1, dtype=np.int64)
+
+        probes = np.argpartition(-(q @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        for row, (query, buckets) in enumerate(zip(q, probes)):
+            sims = [self._vectors[b][:self._sizes[b]] @ query for b in buckets]
+            cand_ids = [self._ids[b][:self._sizes[b]] for b in buckets]
+            sims, cand_ids = np.concatenate(sims), np.concatenate(cand_ids)
+            if not len(sims):
+                continue
+
+            top = min(k, len(sims))
+            best = np.argpartition(-sims, top - 1)[:top]
+            best = best[np.argsort(-sims[best])]
+            similarities[row, :top] = sims[best]
+            ids[row, :top] = cand_ids[best]
+
+        return similarities, ids
+
+    def save(self, path: Path):
+        """Write the index as a directory of .npy files, replacing it atomically."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+
+        offsets = np.concatenate([[0], np.cumsum(self._sizes)])
+        np.save(tmp_path / "centroids.npy", self.centroids)
+        np.save(tmp_path / "offsets.npy", offsets)
+        # Written through a memmap so saving never holds a second full copy
+        vectors = np.lib.format.open_memmap(
+            tmp_path / "vectors.npy", mode="w+", dtype=np.float32, shape=(int(offsets[-1]), self.dim)
+        )
+        ids = np.empty(int(offsets[-1]), dtype=np.int64)
+        for bucket, size in enumerate(self._sizes):
+            start = offsets[bucket]
+            vectors[start:start + size] = self._vectors[bucket][:size]
+            ids[start:start + size] = self._ids[bucket][:size]
+        vectors.flush()
+        del vectors
+        np.save(tmp_path / "ids.npy", ids)
+        (tmp_path / "meta.json").write_text(json.dumps({"dim": self.dim, "next_id": self.next_id}))
+
+        old_path = path.with_name(path.name + ".old")
+        if path.exists():
+            path.rename(old_path)
+        tmp_path.rename(path)
+        shutil.rmtree(old_path, ignore_errors=True)
+        logging.info(f"Saved document index ({len(self)} vectors) to {path}")
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True):
+        path = Path(path)
+        mode = "r" if mmap else None
+        index = cls(np.load(path / "centroids.npy"))
+        offsets = np.load(path / "offsets.npy")
+        vectors = np.load(path / "vectors.npy", mmap_mode=mode)
+        ids = np.load(path / "ids.npy", mmap_mode=mode)
+
+        for bucket in range(len(index.centroids)):
+            start, end = offsets[bucket], offsets[bucket + 1]
+            index._vectors[bucket] = vectors[start:end]
+            index._ids[bucket] = ids[start:end]
+        index._sizes = np.diff(offsets)
+        index.next_id = json.loads((path / "meta.json").read_text())["next_id"]
+        return index
+
+
+def duplicate_signal(index: DocumentIndex, embeddings: np.ndarray, threshold: float = 0.97, nprobe: int = 4):
+    """
+    Nearest stored document for each embedding, and a `duplicate_document`
+    RiskSignal when any of them is at least `threshold` similar (a
+    resubmitted or lightly altered scan). No signal otherwise: the absence
+    of a match is not evidence of low risk.
+    """
+    similarities, ids = index.search(embeddings, k=1, nprobe=nprobe)
+    matches = [
+        {"nearest_id": int(i), "similarity": float(s)} if i >= 0 else None
+        for s, i in zip(similarities[:, 0], ids[:, 0])
+    ]
+
+    best = float(similarities[:, 0].max()) if len(similarities) else -np.inf
+    if best < threshold:
+        return None, matches
+    return RiskSignal(name="duplicate_document", score=min(best, 1.0), confidence=0.9), matches
+
+
+class SeenDocumentLog:
+    """
+    Append-only SQLite log of the document embeddings scored while serving,
+    shared by every worker on the host. Rows keep their insertion order, so
+    a reader catches up by asking for the rows after the last id it saw.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS seen_documents (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    embedding BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def append(self, embeddings: np.ndarray):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO seen_documents (embedding, created_at) VALUES (?, ?)",
+                [(np.asarray(row, dtype=np.float32).tobytes(), now) for row in np.atleast_2d(embeddings)],
+            )
+            conn.execute("COMMIT")
+
+    def since(self, last_id: int):
+        """(ids, embeddings) of the rows logged after `last_id`."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, embedding FROM seen_documents WHERE id > ? ORDER BY id", (last_id,)
+            ).fetchall()
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        embeddings = np.array([np.frombuffer(row[1], dtype=np.float32) for row in rows], dtype=np.float32)
+        return ids, embeddings
+
+
+class DuplicateDetector:
+    """
+    duplicate_signal over an index that learns the scans it scores.
+
+    Each call first adds the scans other workers logged since the last
+    call, then searches, then logs this request's embeddings. So a scan
+    resubmitted later, by the same applicant or another one, matches its
+    first copy whichever worker scored it. Logged scans take ids from
+    ONLINE_ID_BASE up. Without a `log` the index is read-only and learns
+    new documents only when the pipeline rebuilds it.
+    """
+
+    def __init__(self, index: DocumentIndex, log: SeenDocumentLog | None = None,
+                 threshold: float = 0.97, nprobe: int = 4):
+        self.index = index
+        self.log = log
+        self.threshold = threshold
+        self.nprobe = nprobe
+        self._synced = 0
+        self._lock = threading.Lock()
+        if log is not None:
+            self._catch_up()
+
+    def _catch_up(self):
+        ids, embeddings = self.log.since(self._synced)
+        if len(ids):
+            self.index.add(embeddings, ids=ONLINE_ID_BASE + ids)
+            self._synced = int(ids[-1])
+
+    def __call__(self, embeddings: np.ndarray):
+        """(duplicate RiskSignal or None, per-embedding nearest matches)."""
+        with self._lock:
+            if self.log is None:
+                return duplicate_signal(self.index, embeddings, self.threshold, self.nprobe)
+
+            self._catch_up()
+            signal, matches = duplicate_signal(self.index, embeddings, self.threshold, self.nprobe)
+            self.log.append(embeddings)
+            self._catch_up()
+            return signal, matches
@@ -0,0 +1,96 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+from PIL import Image
+
+from Credit_Risk_Modelling.components.feature_engineering_documents import normalize_uint8_batch
+from Credit_Risk_Modelling.components.image_tensor_cache import decode_resized
+from Credit_Risk_Modelling.components.risk_adapter_vision import score_embeddings
+from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
+
+
+def decode_image(data: bytes) -> torch.Tensor:
+    """
+    Decode an uploaded scan into a normalized 3x224x224 tensor, through the
+    same decode and resize as the training embeddings.
+    """
+    return normalize_uint8_batch(decode_resized(io.BytesIO(data))[None], torch.device("cpu"))[0]
+
+
+class DocumentScorer:
+    """
+    Scores one applicant's uploaded document images: threaded decode and
+    resize, batched ResNet embedding, then the document risk model.
+    With a `duplicate_detector` (DuplicateDetector), each image is also
+    matched against previously seen documents and then remembered.
+    """
+
+    def __init__(
+        self,
+        backbone,
+        risk_model=None,
+        batch_size: int = 16,
+        decode_workers: int = 4,
+        duplicate_detector=None,
+    ):
+        self.backbone = backbone
+        self.risk_model = risk_model
+        self.batch_size = batch_size
+        self.duplicate_detector = duplicate_detector
+        self._executor = ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="document-decode")
+
+    def _timed_decode(self, data: bytes):
+        start = time.perf_counter()
+        try:
+            tensor = decode_image(data)
+        except (OSError, Image.DecompressionBombError) as e:
+            raise ValueError(f"Could not decode document image: {e}") from e
+        return tensor, time.perf_counter() - start
+
+    def _embed(self, tensors):
+        """Embeds in batches; returns embeddings and per-image embedding time."""
+        embeddings, seconds = [], []
+        with torch.inference_mode():
+            for i in range(0, len(tensors), self.batch_size):
+                batch = torch.stack(tensors[i:i + self.batch_size])
+                start = time.perf_counter()
+                embeddings.append(self.backbone(batch).flatten(1).numpy())
+                # Batch cost is attributed evenly to its images
+                seconds.extend([(time.perf_counter() - start) / len(batch)] * len(batch))
+        return np.vstack(embeddings), seconds
+
+    async def score(self, images: list[bytes]):
+        """
+        Returns (vision RiskSignal, per-image results, duplicate RiskSignal
+        or None). Decoding fans out over the thread pool and embedding and
+        the duplicate lookup run in it too, so the event loop stays free.
+        """
+        loop = asyncio.get_running_loop()
+        decoded = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self._timed_decode, data) for data in images)
+        )
+        tensors = [tensor for tensor, _ in decoded]
+
+        embeddings, embed_seconds = await loop.run_in_executor(self._executor, self._embed, tensors)
+        scores, confidence = score_embeddings(embeddings, self.risk_model)
+
+        duplicate, matches = None, [None] * len(images)
+        if self.duplicate_detector is not None:
+            duplicate, matches = await loop.run_in_executor(self._executor, self.duplicate_detector, embeddings)
+
+        results = [
+            {
+                "score": float(score),
+                "decode_ms": decode_s * 1000,
+                "embed_ms": embed_s * 1000,
+                "latency_ms": (decode_s + embed_s) * 1000,
+                "nearest_document": match,
+            }
+            for score, (_, decode_s), embed_s, match in zip(scores, decoded, embed_seconds, matches)
+        ]
+        signal = RiskSignal(name="vision", score=float(np.mean(scores)), confidence=confidence)
+        return signal, results, duplicate
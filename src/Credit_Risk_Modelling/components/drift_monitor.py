@@ -0,0 +1,241 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from Credit_Risk_Modelling.utils.panel_schema import iter_panel
+
+# Equal-mass bins per feature, fixed by the reference quantiles
+N_BINS = 20
+# Per-feature counters kept next to the histogram
+N_OBS, SUM, SUM_SQ, BELOW, ABOVE = range(5)
+N_STATS = 5
+# Population stability index thresholds (the usual 0.1 / 0.25 rule of thumb)
+PSI_WARN, PSI_ALERT = 0.1, 0.25
+
+TIMESERIES_FEATURE = "timeseries_value"
+
+# How the training data maps onto the normalized /predict inputs; the
+# scales are the ones the frontend applies to raw user input
+TABULAR_REFERENCE = {
+    "f0": ("tabular", "limit_bal", 100_000),
+    "f1": ("panel", "income", 100_000),
+    "f2": ("tabular", "bill_amt1", 50_000),
+    "f3": ("tabular", "age", 100),
+    "f4": ("panel", "balance", 50_000),
+}
+TIMESERIES_REFERENCE = ("panel", "expense", 10_000)
+
+
+def _sample_column(values: np.ndarray, keep: tuple, max_sample: int, rng) -> tuple:
+    """Uniform reservoir via random keys: keep the max_sample smallest."""
+    keys = np.concatenate([keep[0], rng.random(len(values))])
+    values = np.concatenate([keep[1], values])
+    if len(keys) > max_sample:
+        smallest = np.argpartition(keys, max_sample)[:max_sample]
+        keys, values = keys[smallest], values[smallest]
+    return keys, values
+
+
+def reference_samples(tabular_path: Path, panel_path: Path, max_sample: int = 1_000_000, seed: int = 42) -> dict:
+    """
+    Training data for each monitored feature, normalized like live inputs.
+    The panel is streamed, with a bounded uniform sample per column.
+    """
+    tabular = pd.read_excel(tabular_path, header=1)
+    tabular.columns = tabular.columns.astype(str).str.strip().str.lower().str.replace(" ", "_")
+
+    rng = np.random.default_rng(seed)
+    empty = (np.empty(0), np.empty(0, dtype=np.float32))
+    panel_columns = {column for source, column, _ in [*TABULAR_REFERENCE.values(), TIMESERIES_REFERENCE]
+                     if source == "panel"}
+    reservoirs = dict.fromkeys(panel_columns, empty)
+    for chunk in iter_panel(panel_path, chunk_rows=1_000_000):
+        for column in panel_columns:
+            reservoirs[column] = _sample_column(
+                chunk[column].to_numpy(np.float32), reservoirs[column], max_sample, rng
+            )
+    panel = {column: values for column, (_, values) in reservoirs.items()}
+
+    def normalized(source, column, scale):
+        values = tabular[column].to_numpy(np.float64) if source == "tabular" else panel[column]
+        return np.minimum(values / scale, 1.0)
+
+    samples = {name: normalized(*spec) for name, spec in TABULAR_REFERENCE.items()}
+    samples[TIMESERIES_FEATURE] = normalized(*TIMESERIES_REFERENCE)
+    return samples
+
+
+def build_reference(samples: dict, path: Path, n_bins: int = N_BINS) -> dict:
+    """
+    Reference sketch per feature: equal-mass bin edges from the training
+    quantiles and the fraction of training data in each bin.
+    """
+    reference = {}
+    for name, values in samples.items():
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+        if len(edges) == 1:
+            edges = np.repeat(edges, 2)  # constant feature: a single bin
+        counts = np.bincount(np.searchsorted(edges[1:-1], values, side="right"), minlength=len(edges) - 1)
+        reference[name] = {
+            "edges": edges.tolist(),
+            "fractions": (counts / counts.sum()).tolist(),
+            "count": int(len(values)),
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+        }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(reference, indent=2))
+    logging.info(f"Wrote drift reference for {len(reference)} features to {path}")
+    return reference
+
+
+class DriftMonitor:
+    """
+    Fixed-size streaming sketches of the features arriving at /predict,
+    compared with reference sketches from the training data.
+
+    Each feature has a histogram over the reference's equal-mass bins plus
+    running count, sum, sum of squares and out-of-range counts, so memory
+    is constant however much traffic arrives. With `sketch_dir`, each
+    process writes only its own memory-mapped file (`sketch-<pid>.npy`)
+    and `report` merges every file in the directory, so workers never
+    coordinate. Updates take no lock: a request is folded in by two small
+    numpy adds, which do not release the GIL.
+    """
+
+    def __init__(self, reference: dict, sketch_dir: Path | None = None):
+        self.reference = reference
+        self.features = list(reference)
+        self._index = {name: i for i, name in enumerate(self.features)}
+        self.n_bins = max(len(reference[name]["fractions"]) for name in self.features)
+        self.sketch_dir = Path(sketch_dir) if sketch_dir else None
+
+        # Inner bin edges as one (features, bins - 1) matrix, padded with
+        # +inf, so a request's values are binned in a single comparison
+        self._inner_edges = np.full((len(self.features), max(self.n_bins - 1, 1)), np.inf)
+        for i, name in enumerate(self.features):
+            inner = reference[name]["edges"][1:-1]
+            self._inner_edges[i, :len(inner)] = inner
+        self._low = np.array([reference[name]["edges"][0] for name in self.features])
+        self._high = np.array([reference[name]["edges"][-1] for name in self.features])
+
+        shape = (len(self.features), self.n_bins + N_STATS)
+        if self.sketch_dir is None:
+            self._sketch = np.zeros(shape)
+        else:
+            self.sketch_dir.mkdir(parents=True, exist_ok=True)
+            # A plain ndarray over the mapping; the memmap subclass adds
+            # per-operation overhead
+            self._sketch = np.asarray(np.lib.format.open_memmap(
+                self.sketch_dir / f"sketch-{os.getpid()}.npy", mode="w+", dtype=np.float64, shape=shape
+            ))
+        self._stats = self._sketch[:, self.n_bins:]
+
+    @classmethod
+    def from_file(cls, reference_path: Path, sketch_dir: Path | None = None):
+        return cls(json.loads(Path(reference_path).read_text()), sketch_dir)
+
+    def observe(self, tabular_features: dict | None = None, timeseries_values=None):
+        """Fold one request's raw inputs into this process's sketches."""
+        rows, values = [], []
+        for name, value in (tabular_features or {}).items():
+            if name in self._index and isinstance(value, (int, float)):
+                rows.append(self._index[name])
+                values.append(value)
+
+        rows, values = np.array(rows, dtype=np.intp), np.array(values, dtype=np.float64)
+        if timeseries_values is not None and TIMESERIES_FEATURE in self._index:
+            series = np.asarray(timeseries_values, dtype=np.float64).ravel()
+            rows = np.concatenate([rows, np.full(len(series), self._index[TIMESERIES_FEATURE])])
+            values = np.concatenate([values, series])
+
+        finite = np.isfinite(values)
+        rows, values = rows[finite], values[finite]
+        if not len(values):
+            return
+
+        bins = (values[:, None] >= self._inner_edges[rows]).sum(axis=1)
+        stats = np.column_stack([
+            np.ones_like(values),
+            values,
+            values * values,
+            values < self._low[rows],
+            values > self._high[rows],
+        ])
+        np.add.at(self._sketch, (rows, bins), 1)
+        np.add.at(self._stats, rows, stats)
+
+    def merged(self) -> np.ndarray:
+        """Sum of every process's sketch (only this one's without a sketch_dir)."""
+        if self.sketch_dir is None:
+            return np.array(self._sketch)
+
+        total = np.zeros(self._sketch.shape)
+        for path in self.sketch_dir.glob("sketch-*.npy"):
+            try:
+                sketch = np.load(path, mmap_mode="r")
+            except (OSError, ValueError):
+                continue
+            if sketch.shape == total.shape:
+                total += sketch
+        return total
+
+    def reset(self):
+        """
+        Zero every process's sketch. Files are zeroed in place rather than
+        deleted, since live workers keep writing to their mapping.
+        """
+        self._sketch[:] = 0
+        if self.sketch_dir is not None:
+            for path in self.sketch_dir.glob("sketch-*.npy"):
+                try:
+                    np.load(path, mmap_mode="r+")[:] = 0
+                except (OSError, ValueError):
+                    continue
+
+    def _quantiles(self, counts: np.ndarray, edges: np.ndarray, qs=(0.05, 0.5, 0.95)) -> dict:
+        """Quantiles interpolated within the histogram's bins."""
+        cdf = np.concatenate([[0.0], np.cumsum(counts) / counts.sum()])
+        return {f"p{int(q * 100):02d}": float(np.interp(q, cdf, edges)) for q in qs}
+
+    def report(self) -> dict:
+        """Per-feature drift statistics against the reference, over all workers."""
+        sketch = self.merged()
+        features = {}
+        for i, name in enumerate(self.features):
+            ref = self.reference[name]
+            edges = np.asarray(ref["edges"])
+            n_bins = len(ref["fractions"])
+            counts = sketch[i, :n_bins]
+            stats = sketch[i, self.n_bins:]
+            n = stats[N_OBS]
+
+            entry = {"count": int(n), "reference_count": ref["count"]}
+            if n > 0:
+                expected = np.maximum(np.asarray(ref["fractions"]), 1e-6)
+                actual = np.maximum(counts / n, 1e-6)
+                mean = stats[SUM] / n
+                psi = float(np.sum((actual - expected) * np.log(actual / expected)))
+                entry.update({
+                    "psi": psi,
+                    "ks": float(np.max(np.abs(np.cumsum(counts / n) - np.cumsum(ref["fractions"])))),
+                    "mean": float(mean),
+                    "reference_mean": ref["mean"],
+                    "std": float(np.sqrt(max(stats[SUM_SQ] / n - mean ** 2, 0.0))),
+                    "reference_std": ref["std"],
+                    "out_of_range": float((stats[BELOW] + stats[ABOVE]) / n),
+                    "quantiles": self._quantiles(counts, edges),
+                    "reference_quantiles": self._quantiles(np.asarray(ref["fractions"]), edges),
+                    "status": "alert" if psi >= PSI_ALERT else "warn" if psi >= PSI_WARN else "ok",
+                })
+            features[name] = entry
+
+        return {"features": features}
@@ -1,10 +1,26 @@
+import hashlib
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
 import joblib
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+from Credit_Risk_Modelling.components.compiled_tree_predictor import CompiledTreePredictor
+
+
+class MissingFeatures(ValueError):
+    def __init__(self, missing: list[str]):
+        super().__init__(f"Missing features required by the tabular model: {', '.join(missing)}")
+        self.missing = missing
+
 
 class TabularExplainer:
-    def __init__(self, model_path: Path):
+    def __init__(self, model_path: Path, cache_size: int = 10000, optional_features=()):
         try:
             import shap
         except ImportError as e:
@@ -16,9 +32,46 @@ class TabularExplainer:
         self.shap = shap
         self.model = joblib.load(model_path)
         self.explainer = self.shap.TreeExplainer(self.model)
+        self.feature_names = list(getattr(self.model, "feature_name_", []))
+        # Only these may be left out of a request (they are explained as missing)
+        self.optional_features = set(optional_features)
+
+        # Saabas path attributions for the approximate mode; models the
+        # compiled predictor cannot handle are always explained with SHAP
+        self.predictor = CompiledTreePredictor.try_from_model(self.model)
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _shap_values(self, X: pd.DataFrame):
+        shap_values = self.explainer.shap_values(X)
+        # Older SHAP releases return [negative_class, positive_class]
+        if isinstance(shap_values, list):
+            shap_values = shap_values[1]
+        return np.asarray(shap_values)
+
+    def check_features(self, columns):
+        """Raise MissingFeatures unless every required model feature is present."""
+        present = set(columns)
+        missing = [
+            name for name in self.feature_names
+            if name not in present and name not in self.optional_features
+        ]
+        if missing or (self.feature_names and not present & set(self.feature_names)):
+            raise MissingFeatures(missing or self.feature_names)
+
+    def _align(self, X: pd.DataFrame) -> pd.DataFrame:
+        if not self.feature_names:
+            return X
+        self.check_features(X.columns)
+        # Optional features absent from the request become NaN, which
+        # LightGBM routes as missing
+        return X.reindex(columns=self.feature_names)
 
     def explain(self, X: pd.DataFrame, top_k: int = 5):
-        shap_values = self.explainer.shap_values(X)[1]
+        X = self._align(X)
+        shap_values = self._shap_values(X)
 
         mean_abs_shap = (
             pd.DataFrame(shap_values, columns=X.columns)
@@ -36,3 +89,123 @@ class TabularExplainer:
             }
             for feature, value in top_features.items()
         ]
+
+    def attributions(self, X: pd.DataFrame, approximate: bool = False) -> np.ndarray:
+        """
+        Per-row attributions in raw-score space, memoized by feature hash.
+
+        Exact mode uses TreeSHAP. Approximate mode uses path attributions on
+        the compiled trees, whose cost is fixed at trees x depth per row, and
+        falls back to TreeSHAP when the model could not be compiled.
+        """
+        X = self._align(X)
+        values = X.to_numpy(dtype=np.float64)
+        approximate = approximate and self.predictor is not None
+        mode = b"approx" if approximate else b"exact"
+        keys = [hashlib.sha1(mode + row.tobytes()).hexdigest() for row in values]
+
+        result = np.empty_like(values)
+        missing = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    result[i] = cached
+
+        if missing:
+            if approximate:
+                computed, _ = self.predictor.path_contributions(values[missing])
+            else:
+                computed = self._shap_values(X.iloc[missing])
+
+            result[missing] = computed
+            with self._cache_lock:
+                for i, row in zip(missing, computed):
+                    self._cache[keys[i]] = row
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return result
+
+    def explain_instances(self, X: pd.DataFrame, top_k: int = 5, approximate: bool = False):
+        X = self._align(X)
+        values = self.attributions(X, approximate=approximate)
+
+        explanations = []
+        for row in values:
+            order = np.argsort(-np.abs(row))[:top_k]
+            explanations.append([
+                {
+                    "feature": X.columns[j],
+                    "importance": float(row[j]),
+                }
+                for j in order
+            ])
+        return explanations
+
+
+class ExplanationBatcher:
+    """
+    Long-lived front for a TabularExplainer that coalesces concurrent
+    single-applicant requests into one batched attribution call.
+
+    With the default max_wait_ms=0 a batch is whatever queued up while the
+    previous one was computing, so an idle server adds no waiting latency.
+    """
+
+    def __init__(self, explainer: TabularExplainer, max_batch_size: int = 64, max_wait_ms: float = 0.0):
+        self.explainer = explainer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, features: dict, top_k: int = 5, approximate: bool = False) -> Future:
+        # Rejected here, so a bad request never reaches a shared batch
+        self.explainer.check_features(features)
+        future = Future()
+        self._queue.put((features, top_k, approximate, future))
+        return future
+
+    def explain(self, features: dict, top_k: int = 5, approximate: bool = False):
+        return self.submit(features, top_k, approximate).result()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.max_batch_size:
+                    if self.max_wait > 0:
+                        batch.append(self._queue.get(timeout=self.max_wait))
+                    else:
+                        batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            for approximate in (False, True):
+                items = [item for item in batch if item[2] == approximate]
+                if items:
+                    self._explain_batch(items, approximate)
+
+    def _explain_batch(self, items, approximate):
+        try:
+            X = pd.DataFrame([features for features, _, _, _ in items])
+            top_k = max(k for _, k, _, _ in items)
+            explanations = self.explainer.explain_instances(X, top_k=top_k, approximate=approximate)
+        except Exception as e:
+            if len(items) == 1:
+                logging.exception("Explanation failed")
+                items[0][3].set_exception(e)
+                return
+            # Retry one by one, so only the offending request fails
+            logging.warning(f"Batched explanation failed ({e}); retrying {len(items)} requests individually")
+            for item in items:
+                self._explain_batch([item], approximate)
+            return
+
+        for (_, k, _, future), explanation in zip(items, explanations):
+            future.set_result(explanation[:k])
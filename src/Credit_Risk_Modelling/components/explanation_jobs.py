@@ -0,0 +1,221 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+_PROCFS = Path("/proc/self/stat").exists()
+
+
+def process_owner(pid: int | None = None) -> str | None:
+    """
+    Identity of a running process: its pid plus its start time, so a pid
+    reused after a restart does not match. None when it is not running.
+    """
+    pid = os.getpid() if pid is None else pid
+    if not _PROCFS:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return None
+        except PermissionError:
+            pass
+        return str(pid)
+
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # starttime is field 22; count from after the parenthesised command name
+    return f"{pid}:{stat.rsplit(')', 1)[1].split()[19]}"
+
+
+class ExplanationJobStore:
+    """
+    SQLite-backed job table. Finished jobs expire `ttl_seconds` after their
+    last update and are evicted lazily on access and by the worker pool.
+
+    Every job records the process that queued it. Several workers share
+    the table, so only jobs whose owner is no longer running are failed
+    as interrupted, never those another live worker is still running.
+    """
+
+    def __init__(self, db_path: Path, ttl_seconds: float = 3600):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.owner = process_owner()
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    owner TEXT
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+
+        self.recover_orphaned()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def recover_orphaned(self) -> int:
+        """Fail unfinished jobs whose owning process has exited; they were queued in its memory."""
+        with self._lock, self._connect() as conn:
+            owners = [
+                owner for (owner,) in conn.execute(
+                    "SELECT DISTINCT owner FROM jobs WHERE status IN ('queued', 'running')"
+                )
+            ]
+            orphaned = [
+                (owner,) for owner in owners
+                if owner is None or process_owner(int(owner.split(":")[0])) != owner
+            ]
+            recovered = sum(
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'interrupted by restart' "
+                    "WHERE owner IS ? AND status IN ('queued', 'running')",
+                    owner,
+                ).rowcount
+                for owner in orphaned
+            )
+
+        if recovered:
+            logging.warning(f"Failed {recovered} explanation jobs left by exited workers")
+        return recovered
+
+    def create(self, request: dict) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, request, created_at, expires_at, owner) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, json.dumps(request), now, now + self.ttl_seconds, self.owner),
+            )
+        return job_id
+
+    def update(self, job_id: str, status: str, result=None, error: str | None = None):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, expires_at = ? WHERE id = ?",
+                (
+                    status,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    time.time() + self.ttl_seconds,
+                    job_id,
+                ),
+            )
+
+    def get(self, job_id: str) -> dict | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT status, result, error, created_at FROM jobs WHERE id = ? AND expires_at > ?",
+                (job_id, time.time()),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        status, result, error, created_at = row
+        return {
+            "job_id": job_id,
+            "status": status,
+            "created_at": created_at,
+            "result": json.loads(result) if result else None,
+            "error": error,
+        }
+
+    def evict_expired(self) -> int:
+        with self._lock, self._connect() as conn:
+            return conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+class ExplanationJobQueue:
+    """
+    Bounded in-memory queue drained by a fixed pool of worker threads.
+    `submit` raises queue.Full when `max_queue` jobs are already waiting,
+    which the API surfaces as backpressure.
+    """
+
+    def __init__(self, store: ExplanationJobStore, handler, num_workers: int = 2, max_queue: int = 100):
+        self.store = store
+        self.handler = handler
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._last_eviction = 0.0
+        self._workers = [
+            threading.Thread(target=self._run, name=f"explain-worker-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, request: dict) -> str:
+        if self._queue.full():
+            raise queue.Full
+
+        job_id = self.store.create(request)
+        try:
+            self._queue.put_nowait((job_id, request))
+        except queue.Full:
+            self.store.update(job_id, "failed", error="queue full")
+            raise
+
+        return job_id
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            try:
+                job_id, request = self._queue.get(timeout=60)
+            except queue.Empty:
+                self._maybe_evict()
+                continue
+
+            self.store.update(job_id, "running")
+            try:
+                result = self.handler(request)
+                self.store.update(job_id, "completed", result=result)
+            except Exception as e:
+                logging.exception(f"Explanation job {job_id} failed")
+                self.store.update(job_id, "failed", error=str(e))
+            finally:
+                self._queue.task_done()
+
+            self._maybe_evict()
+
+    def _maybe_evict(self):
+        now = time.time()
+        if now - self._last_eviction > 60:
+            self._last_eviction = now
+            evicted = self.store.evict_expired()
+            if evicted:
+                logging.info(f"Evicted {evicted} expired explanation jobs")
+            # Picks up jobs of a sibling worker that crashed
+            self.store.recover_orphaned()
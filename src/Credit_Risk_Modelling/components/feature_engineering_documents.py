@@ -1,56 +1,111 @@
+import logging
 import torch
-from torchvision import transforms, models
-from PIL import Image
+from torchvision import models
 from pathlib import Path
 import numpy as np
 import joblib
+from Credit_Risk_Modelling.components.image_tensor_cache import IMAGE_SIZE, ImageTensorCache, decode_resized
+from Credit_Risk_Modelling.utils.document_manifest import DocumentManifest
+
+IMAGE_MEAN = [0.485, 0.456, 0.406]
+IMAGE_STD = [0.229, 0.224, 0.225]
+
+
+def normalize_uint8_batch(batch: np.ndarray, device) -> torch.Tensor:
+    """
+    (n, height, width, 3) uint8 images from `decode_resized` (or
+    ImageTensorCache) as the normalized NCHW tensor the backbone takes.
+    Training and serving both go through this and `decode_resized`, so
+    the backbone sees identical pixels in both.
+    """
+    tensor = torch.from_numpy(batch).to(device).permute(0, 3, 1, 2).float().div_(255)
+    mean = torch.tensor(IMAGE_MEAN, device=device).view(1, 3, 1, 1)
+    std = torch.tensor(IMAGE_STD, device=device).view(1, 3, 1, 1)
+    return tensor.sub_(mean).div_(std)
+
+
+def load_document_backbone(device):
+    """ResNet-18 without its classification head: 512-d pooled embeddings."""
+    # Pretrained backbone (industry standard)
+    backbone = models.resnet18(pretrained=True)
+    model = torch.nn.Sequential(*list(backbone.children())[:-1])
+    model.to(device)
+    model.eval()
+    return model
 
 
 class DocumentFeatureEngineering:
-    def __init__(self, image_dir: Path, output_dir: Path):
+    def __init__(
+        self,
+        image_dir: Path,
+        output_dir: Path,
+        manifest_path: Path | None = None,
+        tensor_cache_dir: Path | None = None,
+        batch_size: int = 64,
+    ):
         self.image_dir = image_dir
         self.output_dir = output_dir
+        self.manifest_path = manifest_path
+        # With a cache, images are decoded and resized once and later runs
+        # read the resized pixels from memory-mapped shards
+        self.tensor_cache_dir = tensor_cache_dir
+        self.batch_size = batch_size
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-        # Pretrained backbone (industry standard)
-        backbone = models.resnet18(pretrained=True)
-        self.model = torch.nn.Sequential(*list(backbone.children())[:-1])
-        self.model.to(self.device)
-        self.model.eval()
-
-        self.transform = transforms.Compose([
-            transforms.Resize((224, 224)),
-            transforms.ToTensor(),
-            transforms.Normalize(
-                mean=[0.485, 0.456, 0.406],
-                std=[0.229, 0.224, 0.225],
-            )
-        ])
+        self.model = load_document_backbone(self.device)
 
     def extract_embeddings(self):
+        if self.tensor_cache_dir is not None:
+            return self._extract_cached_embeddings()
+
         embeddings = []
         labels = []
 
-        for label_dir in ["low_risk", "high_risk"]:
-            class_dir = self.image_dir / label_dir
-            if not class_dir.exists():
-                continue
+        manifest = DocumentManifest.load_or_refresh(self.image_dir, self.manifest_path)
 
-            for img_path in class_dir.glob("*.jpg"):
-                image = Image.open(img_path).convert("RGB")
-                tensor = self.transform(image).unsqueeze(0).to(self.device)
+        for img_path, label in manifest.labelled_images():
+            tensor = normalize_uint8_batch(decode_resized(img_path)[None], self.device)
 
-                with torch.no_grad():
-                    emb = self.model(tensor).squeeze().cpu().numpy()
+            with torch.no_grad():
+                emb = self.model(tensor).squeeze().cpu().numpy()
 
-                embeddings.append(emb)
-                labels.append(1 if label_dir == "high_risk" else 0)
+            embeddings.append(emb)
+            labels.append(label)
+
+        return self._save(np.array(embeddings), np.array(labels))
+
+    def _extract_cached_embeddings(self):
+        # Refresh re-hashes only files whose size or mtime changed, and the
+        # cache re-decodes exactly the images whose hash changed
+        manifest = DocumentManifest(self.image_dir, self.manifest_path).refresh()
+        cache = ImageTensorCache(self.tensor_cache_dir)
+        cache.sync(manifest)
+        # A spot check against fresh decodes, so the cached inputs never
+        # silently diverge from the uncached path
+        mismatched = cache.verify(manifest)
+        if mismatched:
+            logging.warning(
+                f"{len(mismatched)} sampled cached images differ from a fresh decode "
+                f"(e.g. {mismatched[0]}); rebuilding {self.tensor_cache_dir}"
+            )
+            cache.clear()
+            cache.sync(manifest)
+
+        images = manifest.labelled_images()
+        rel_paths = [path.relative_to(manifest.root_dir).as_posix() for path, _ in images]
+
+        embeddings = []
+        for batch in cache.iter_batches(rel_paths, self.batch_size):
+            with torch.no_grad():
+                emb = self.model(normalize_uint8_batch(batch, self.device)).flatten(1).cpu().numpy()
+            embeddings.append(emb)
 
-        embeddings = np.array(embeddings)
-        labels = np.array(labels)
+        embeddings = np.concatenate(embeddings) if embeddings else np.empty((0, 512), dtype=np.float32)
+        return self._save(embeddings, np.array([label for _, label in images]))
 
+    def _save(self, embeddings, labels):
         joblib.dump(
             {"embeddings": embeddings, "labels": labels},
             self.output_dir / "document_embeddings.pkl"
@@ -1,10 +1,8 @@
 import pandas as pd
-import torch
 import logging
-import numpy as np
-from transformers import AutoTokenizer, AutoModel
 from pathlib import Path
 import joblib
+from Credit_Risk_Modelling.components.text_encoder import TextEncoder
 
 
 class TextFeatureEngineering:
@@ -13,31 +11,28 @@ class TextFeatureEngineering:
         data_path: Path,
         text_column: str,
         output_dir: Path,
-        max_length: int = 256
+        max_length: int = 256,
+        quantization: str | None = None,
+        batch_size: int = 32,
+        tokenizer_workers: int = 4,
+        token_cache_path: Path | None = None,
     ):
         self.data_path = data_path
         self.text_column = text_column
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            "sentence-transformers/all-MiniLM-L6-v2"
+        # quantization="int8": dynamically quantized encoder, CPU only
+        self.encoder = TextEncoder(
+            quantization=quantization,
+            max_length=max_length,
+            batch_size=batch_size,
+            tokenizer_workers=tokenizer_workers,
+            token_cache_path=token_cache_path,
         )
-        self.model = AutoModel.from_pretrained(
-            "sentence-transformers/all-MiniLM-L6-v2"
-        ).to(self.device)
-
+        self.device = self.encoder.device
         self.max_length = max_length
 
-    def _mean_pooling(self, model_output, attention_mask):
-        token_embeddings = model_output.last_hidden_state
-        input_mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
-        return torch.sum(token_embeddings * input_mask_expanded, 1) / torch.clamp(
-            input_mask_expanded.sum(1), min=1e-9
-        )
-
     def transform(self):
         logging.info("Starting text feature engineering")
 
@@ -55,27 +50,7 @@ class TextFeatureEngineering:
 
         texts = df[self.text_column].astype(str).tolist()
 
-        embeddings = []
-
-        for text in texts[:5000]:  # cap for compute sanity
-            encoded = self.tokenizer(
-                text,
-                truncation=True,
-                padding="max_length",
-                max_length=self.max_length,
-                return_tensors="pt"
-            ).to(self.device)
-
-            with torch.no_grad():
-                model_output = self.model(**encoded)
-
-            sentence_embedding = self._mean_pooling(
-                model_output, encoded["attention_mask"]
-            )
-
-            embeddings.append(sentence_embedding.squeeze().cpu().numpy())
-
-        embeddings = np.vstack(embeddings)
+        embeddings = self.encoder.encode(texts[:5000])  # cap for compute sanity
 
         joblib.dump(
             embeddings,
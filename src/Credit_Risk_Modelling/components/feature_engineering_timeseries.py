@@ -1,58 +1,158 @@
+import heapq
+import logging
+import os
+import shutil
+from multiprocessing import Pool
+from pathlib import Path
+
 import pandas as pd
+
 from Credit_Risk_Modelling.entity.feature_engineering_entity import TimeSeriesFeatureConfig
+from Credit_Risk_Modelling.utils.panel_schema import read_panel, iter_panel, FEATURE_DTYPE
+
+MEASURES = ["income", "expense", "balance"]
+REQUIRED_COLS = {"customer_id", "month", "income", "expense", "balance"}
+
+
+def add_rolling_features(df: pd.DataFrame, window_size: int) -> pd.DataFrame:
+    missing = REQUIRED_COLS - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing required columns for time-series FE: {missing}")
+
+    # Sort by entity and time
+    df = df.sort_values(["customer_id", "month"])
+
+    # Rolling feature engineering PER CUSTOMER
+    for window in range(1, window_size + 1):
+        for measure in MEASURES:
+            df[f"{measure}_mean_{window}"] = (
+                df.groupby("customer_id")[measure]
+                  .rolling(window)
+                  .mean()
+                  .reset_index(level=0, drop=True)
+                  .astype(FEATURE_DTYPE)
+            )
+
+    # Drop rows with insufficient history
+    return df.dropna()
+
+
+def _featurize_partition(args):
+    shard_path, output_path, window_size, memory_budget_mb, budget_action = args
+    df = read_panel(shard_path, memory_budget_mb, budget_action, len(MEASURES) * window_size)
+    df = add_rolling_features(df, window_size)
+    df.to_csv(output_path, index=False)
+    return len(df)
 
 
 class TimeSeriesFeatureEngineering:
     def __init__(self, config: TimeSeriesFeatureConfig):
         self.config = config
+        self.n_rows = None
+
+    @property
+    def output_file(self) -> Path:
+        return self.config.output_path / "timeseries_features.csv"
 
     def transform(self):
-        df = pd.read_csv(self.config.data_path)
-
-        # Normalize column names
-        df.columns = (
-            df.columns
-            .astype(str)
-            .str.strip()
-            .str.lower()
+        """
+        In-memory by default, returning the features frame. With
+        `num_partitions` set, runs out of core and returns the output path.
+        """
+        if self.config.num_partitions:
+            return self.transform_partitioned()
+
+        # The budget covers the rolling-mean columns added below as well
+        df = read_panel(
+            self.config.data_path,
+            self.config.memory_budget_mb,
+            self.config.budget_action,
+            extra_float_columns=len(MEASURES) * self.config.window_size,
         )
+        df = add_rolling_features(df, self.config.window_size)
 
-        # Required columns check
-        required_cols = {"customer_id", "month", "income", "expense", "balance"}
-        missing = required_cols - set(df.columns)
-        if missing:
-            raise ValueError(f"Missing required columns for time-series FE: {missing}")
+        df.to_csv(self.output_file, index=False)
+        self.n_rows = len(df)
 
-        # Sort by entity and time
-        df = df.sort_values(["customer_id", "month"])
+        return df
 
-        # Rolling feature engineering PER CUSTOMER
-        for window in range(1, self.config.window_size + 1):
-            df[f"income_mean_{window}"] = (
-                df.groupby("customer_id")["income"]
-                  .rolling(window)
-                  .mean()
-                  .reset_index(level=0, drop=True)
-            )
+    def _partition(self, shard_dir: Path):
+        """
+        One streaming pass over the panel, appending each chunk's rows to the
+        shard chosen by a hash of customer_id, so every customer's history
+        lands in a single shard.
+        """
+        n = self.config.num_partitions
+        shard_paths = [shard_dir / f"part-{i:05d}.csv" for i in range(n)]
+        written = [False] * n
 
-            df[f"expense_mean_{window}"] = (
-                df.groupby("customer_id")["expense"]
-                  .rolling(window)
-                  .mean()
-                  .reset_index(level=0, drop=True)
-            )
+        for chunk in iter_panel(self.config.data_path, self.config.chunk_rows):
+            if "customer_id" not in chunk.columns:
+                raise ValueError("Missing required columns for time-series FE: {'customer_id'}")
 
-            df[f"balance_mean_{window}"] = (
-                df.groupby("customer_id")["balance"]
-                  .rolling(window)
-                  .mean()
-                  .reset_index(level=0, drop=True)
-            )
+            shard = pd.util.hash_array(chunk["customer_id"].to_numpy()) % n
+            for i, part in chunk.groupby(shard, sort=False):
+                with open(shard_paths[i], "a", newline="") as f:
+                    part.to_csv(f, index=False, header=not written[i])
+                written[i] = True
 
-        # Drop rows with insufficient history
-        df = df.dropna()
+        return [p for p, w in zip(shard_paths, written) if w]
 
-        output_file = self.config.output_path / "timeseries_features.csv"
-        df.to_csv(output_file, index=False)
+    def _merge(self, feature_paths):
+        """
+        k-way merge of the per-shard outputs on (customer_id, month), giving
+        the same file, row for row, as the in-memory path.
+        """
+        files = [open(p, newline="") for p in feature_paths]
+        try:
+            headers = [f.readline() for f in files]
+            columns = headers[0].rstrip("\r\n").split(",")
+            ci, mi = columns.index("customer_id"), columns.index("month")
 
-        return df
+            def key(line):
+                fields = line.split(",", max(ci, mi) + 1)
+                return int(fields[ci]), int(fields[mi])
+
+            with open(self.output_file, "w", newline="") as out:
+                out.write(headers[0])
+                out.writelines(heapq.merge(*files, key=key))
+        finally:
+            for f in files:
+                f.close()
+
+    def transform_partitioned(self) -> Path:
+        """
+        Out-of-core feature engineering: hash-partition the panel by customer
+        into on-disk shards, featurize shards in parallel worker processes,
+        then merge. Peak memory is bounded by one shard per worker.
+        """
+        work_dir = self.config.output_path / "partitions"
+        shutil.rmtree(work_dir, ignore_errors=True)
+        work_dir.mkdir(parents=True)
+
+        try:
+            shard_paths = self._partition(work_dir)
+            if not shard_paths:
+                raise ValueError(f"No rows in {self.config.data_path}")
+            logging.info(f"Partitioned {self.config.data_path} into {len(shard_paths)} shards")
+
+            jobs = [
+                (
+                    shard,
+                    shard.with_name(shard.stem + "-features.csv"),
+                    self.config.window_size,
+                    self.config.memory_budget_mb,
+                    self.config.budget_action,
+                )
+                for shard in shard_paths
+            ]
+            workers = min(self.config.workers or os.cpu_count(), len(jobs))
+            with Pool(workers) as pool:
+                self.n_rows = sum(pool.imap_unordered(_featurize_partition, jobs))
+
+            self._merge([job[1] for job in jobs])
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        logging.info(f"Wrote {self.n_rows} feature rows to {self.output_file}")
+        return self.output_file
@@ -0,0 +1,152 @@
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from Credit_Risk_Modelling.utils.panel_schema import iter_panel, FEATURE_DTYPE
+
+# Columns that identify a row or are labels, never served as features
+NON_FEATURE_COLS = {"customer_id", "month", "default_flag"}
+
+
+class UnknownCustomer(LookupError):
+    def __init__(self, customer_id: int, feature_set: str):
+        super().__init__(f"No {feature_set} features stored for customer_id {customer_id}")
+        self.customer_id = customer_id
+        self.feature_set = feature_set
+
+
+class OnlineFeatureStore:
+    """
+    Latest feature vector per (customer_id, feature set) in SQLite, for
+    scoring by customer id.
+
+    Rows are keyed by a WITHOUT ROWID primary key, so a lookup is a single
+    B-tree probe. Vectors are raw float32 bytes with the column names kept
+    once per feature set. Writes are upserts that replace a stored row only
+    with a more recent (`as_of`) or changed one, so reloading an output
+    touches just the customers whose features moved, and a refresh can
+    carry only the new rows.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Read connections are per thread and opened on first lookup, so
+        # none is inherited across a fork
+        self._local = threading.local()
+        self._columns = {}
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS features (
+                    customer_id INTEGER NOT NULL,
+                    feature_set TEXT NOT NULL,
+                    as_of INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (customer_id, feature_set)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS feature_sets (name TEXT PRIMARY KEY, columns TEXT NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def columns(self, feature_set: str) -> list[str] | None:
+        if feature_set not in self._columns:
+            row = self._reader().execute(
+                "SELECT columns FROM feature_sets WHERE name = ?", (feature_set,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._columns[feature_set] = json.loads(row[0])
+        return self._columns[feature_set]
+
+    def upsert(self, feature_set: str, df: pd.DataFrame, as_of_col: str = "month") -> int:
+        """
+        Write the latest row per customer in `df`. Columns other than
+        customer_id, month and default_flag are the features; they must
+        match any columns already registered for `feature_set`.
+        """
+        columns = [c for c in df.columns if c not in NON_FEATURE_COLS]
+        latest = df.sort_values(["customer_id", as_of_col]).drop_duplicates("customer_id", keep="last")
+        vectors = latest[columns].to_numpy(dtype=FEATURE_DTYPE)
+        rows = [
+            (int(customer_id), feature_set, int(as_of), vector.tobytes())
+            for customer_id, as_of, vector in zip(latest["customer_id"], latest[as_of_col], vectors)
+        ]
+
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN")
+            registered = conn.execute(
+                "SELECT columns FROM feature_sets WHERE name = ?", (feature_set,)
+            ).fetchone()
+            if registered is None:
+                conn.execute("INSERT INTO feature_sets VALUES (?, ?)", (feature_set, json.dumps(columns)))
+            elif json.loads(registered[0]) != columns:
+                conn.execute("ROLLBACK")
+                raise ValueError(f"Columns for feature set {feature_set!r} changed; rebuild the store")
+            conn.executemany(
+                """
+                INSERT INTO features VALUES (?, ?, ?, ?)
+                ON CONFLICT (customer_id, feature_set) DO UPDATE
+                SET as_of = excluded.as_of, vector = excluded.vector
+                WHERE excluded.as_of > features.as_of
+                   OR (excluded.as_of = features.as_of AND excluded.vector != features.vector)
+                """,
+                rows,
+            )
+            conn.execute("COMMIT")
+        return len(rows)
+
+    def load_csv(self, path: Path, feature_set: str, chunk_rows: int = 1_000_000) -> int:
+        """Bulk-load a feature-engineering output, streamed in chunks."""
+        loaded = sum(self.upsert(feature_set, chunk) for chunk in iter_panel(path, chunk_rows))
+        logging.info(f"Loaded {loaded} {feature_set} rows from {path} into {self.db_path}")
+        return loaded
+
+    def get(self, customer_id: int, feature_set: str) -> dict | None:
+        """{column: value} plus `as_of`, or None for an unknown customer."""
+        row = self._reader().execute(
+            "SELECT as_of, vector FROM features WHERE customer_id = ? AND feature_set = ?",
+            (int(customer_id), feature_set),
+        ).fetchone()
+        if row is None:
+            return None
+
+        as_of, blob = row
+        vector = np.frombuffer(blob, dtype=FEATURE_DTYPE)
+        return {"as_of": as_of, "features": dict(zip(self.columns(feature_set), vector.tolist()))}
+
+    def lookup(self, customer_id: int, feature_set: str) -> dict:
+        """As `get`, but raises UnknownCustomer when nothing is stored."""
+        record = self.get(customer_id, feature_set)
+        if record is None:
+            raise UnknownCustomer(customer_id, feature_set)
+        return record
+
+    def __len__(self):
+        return self._reader().execute("SELECT COUNT(*) FROM features").fetchone()[0]
@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Input size of the document backbone (height, width)
+IMAGE_SIZE = (224, 224)
+INDEX_FILE = "index.json"
+# Bumped whenever decode_resized's output changes, so caches rebuild
+DECODER_VERSION = 2
+
+
+def decode_resized(source, image_size=IMAGE_SIZE) -> np.ndarray:
+    """
+    (height, width, 3) uint8 image from a path or file object: the one
+    decode-and-resize used by training, the tensor cache and serving.
+
+    JPEGs are decoded with `draft`, which downscales in the DCT domain to
+    no less than twice the target size, then every image is resized with
+    bilinear (antialiased) filtering.
+    """
+    with Image.open(source) as image:
+        image.draft("RGB", (image_size[1] * 2, image_size[0] * 2))
+        image = image.convert("RGB").resize(image_size[::-1], Image.BILINEAR)
+        return np.asarray(image, dtype=np.uint8)
+
+
+class ImageTensorCache:
+    """
+    Pre-decoded, pre-resized document images in memory-mapped shard files,
+    so repeated embedding runs and fine-tuning read pixels straight from
+    the page cache instead of decoding every JPEG/PNG again.
+
+    Each shard (`shard-00000.npy`) holds `shard_size` slots of
+    (height, width, 3) uint8. `index.json` maps a manifest path to the
+    content hash it was decoded from and its slot. `sync` re-decodes an
+    image only when its manifest md5 differs from the cached one, and
+    writes it to a slot the saved index does not reference; the index is
+    replaced atomically after the shards are flushed, so an interrupted
+    sync leaves the previous cache intact.
+    """
+
+    def __init__(self, cache_dir: Path, image_size=IMAGE_SIZE, shard_size: int = 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.image_size = tuple(image_size)
+        self.shard_size = shard_size
+        self.entries: dict[str, tuple[str, int]] = {}
+        self.n_slots = 0
+        self._shards = {}
+
+        index_path = self.cache_dir / INDEX_FILE
+        if index_path.exists():
+            index = json.loads(index_path.read_text())
+            if (
+                tuple(index["image_size"]) == self.image_size
+                and index["shard_size"] == shard_size
+                and index.get("decoder") == DECODER_VERSION
+            ):
+                self.entries = {path: tuple(entry) for path, entry in index["entries"].items()}
+                self.n_slots = index["n_slots"]
+            else:
+                logging.info(f"Image cache layout or decoder changed; rebuilding {self.cache_dir}")
+                for shard in self.cache_dir.glob("shard-*.npy"):
+                    shard.unlink()
+
+    def _shard(self, shard_id: int) -> np.ndarray:
+        if shard_id not in self._shards:
+            path = self.cache_dir / f"shard-{shard_id:05d}.npy"
+            if path.exists():
+                self._shards[shard_id] = np.load(path, mmap_mode="r+")
+            else:
+                self._shards[shard_id] = np.lib.format.open_memmap(
+                    path, mode="w+", dtype=np.uint8, shape=(self.shard_size, *self.image_size, 3)
+                )
+        return self._shards[shard_id]
+
+    def _save_index(self):
+        index_path = self.cache_dir / INDEX_FILE
+        tmp_path = index_path.with_name(index_path.name + ".tmp")
+        tmp_path.write_text(json.dumps({
+            "image_size": list(self.image_size),
+            "shard_size": self.shard_size,
+            "decoder": DECODER_VERSION,
+            "n_slots": self.n_slots,
+            "entries": {path: list(entry) for path, entry in self.entries.items()},
+        }))
+        os.replace(tmp_path, index_path)
+
+    def sync(self, manifest, workers: int = 4) -> int:
+        """
+        Bring the cache in line with a DocumentManifest: decode new and
+        changed images, drop removed ones. Returns the number decoded.
+        """
+        current = {path: entry.md5 for path, entry in manifest.entries.items()}
+        stale = sorted(path for path, md5 in current.items() if self.entries.get(path, (None,))[0] != md5)
+
+        # Slots of the saved index stay untouched until the new index is in place
+        reserved = {slot for _, slot in self.entries.values()}
+        free = (slot for slot in range(self.n_slots + len(stale)) if slot not in reserved)
+        slots = [next(free) for _ in stale]
+
+        def decode(path):
+            return decode_resized(manifest.root_dir / path, self.image_size)
+
+        entries = {path: entry for path, entry in self.entries.items() if path in current and path not in stale}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for path, slot, pixels in zip(stale, slots, pool.map(decode, stale)):
+                self._shard(slot // self.shard_size)[slot % self.shard_size] = pixels
+                entries[path] = (current[path], slot)
+
+        for shard in self._shards.values():
+            shard.flush()
+
+        removed = len(set(self.entries) - set(current))
+        self.entries = entries
+        self.n_slots = max([self.n_slots, *(slot + 1 for slot in slots)])
+        self._save_index()
+        logging.info(
+            f"Image tensor cache synced: {len(entries)} images "
+            f"({len(stale)} decoded, {removed} removed) in {self.cache_dir}"
+        )
+        return len(stale)
+
+    def verify(self, manifest, sample: int = 8, seed: int = 0) -> list[str]:
+        """
+        Re-decode a random sample of cached images and return the paths
+        whose cached pixels differ from a fresh decode_resized, e.g. after
+        a Pillow upgrade changed decoding or resizing.
+        """
+        paths = sorted(path for path in self.entries if path in manifest.entries)
+        rng = np.random.default_rng(seed)
+        picked = rng.choice(len(paths), size=min(sample, len(paths)), replace=False)
+        return [
+            paths[i] for i in sorted(picked)
+            if not np.array_equal(
+                self.get([paths[i]])[0], decode_resized(manifest.root_dir / paths[i], self.image_size)
+            )
+        ]
+
+    def clear(self):
+        self.entries = {}
+        self.n_slots = 0
+        self._save_index()
+
+    def __contains__(self, rel_path: str):
+        return rel_path in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, rel_paths: list[str]) -> np.ndarray:
+        """(n, height, width, 3) uint8 batch for manifest paths already synced."""
+        batch = np.empty((len(rel_paths), *self.image_size, 3), dtype=np.uint8)
+        for i, path in enumerate(rel_paths):
+            slot = self.entries[path][1]
+            batch[i] = self._shard(slot // self.shard_size)[slot % self.shard_size]
+        return batch
+
+    def iter_batches(self, rel_paths: list[str], batch_size: int = 64):
+        for start in range(0, len(rel_paths), batch_size):
+            yield self.get(rel_paths[start:start + batch_size])
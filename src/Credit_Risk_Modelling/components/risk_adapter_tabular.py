@@ -1,15 +1,18 @@
 import joblib
 import numpy as np
 from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
+from Credit_Risk_Modelling.components.compiled_tree_predictor import CompiledTreePredictor
 from pathlib import Path
 
 
 class TabularRiskAdapter:
-    def __init__(self, model_path: Path):
+    def __init__(self, model_path: Path, compiled: bool = False):
         self.model = joblib.load(model_path)
+        self.predictor = CompiledTreePredictor.try_from_model(self.model) if compiled else None
 
     def predict(self, X):
-        prob = self.model.predict_proba(X)[:, 1].mean()
+        model = self.predictor or self.model
+        prob = model.predict_proba(X)[:, 1].mean()
 
         return RiskSignal(
             name="tabular",
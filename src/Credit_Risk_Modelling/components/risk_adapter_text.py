@@ -5,13 +5,28 @@ from pathlib import Path
 
 
 class TextRiskAdapter:
-    def __init__(self, topic_path: Path, risk_map_path: Path):
+    """
+    Complaint-topic risk. With a TextEncoder, the applicant's texts are
+    embedded and assigned to the trained topics; without texts, the stored
+    training topics are scored.
+    """
+
+    def __init__(self, topic_path: Path, risk_map_path: Path, encoder=None):
         data = joblib.load(topic_path)
         self.topics = data["topics"]
+        self.topic_model = data["model"]
         self.risk_map = joblib.load(risk_map_path)
+        self.encoder = encoder
+
+    def predict(self, texts: list[str] | None = None):
+        if texts is None:
+            topics = self.topics
+        else:
+            if self.encoder is None:
+                raise ValueError("Scoring texts needs a TextEncoder")
+            topics = self.topic_model.predict(self.encoder.encode(texts))
 
-    def predict(self):
-        scores = [self.risk_map[t] for t in self.topics]
+        scores = [self.risk_map[t] for t in topics]
         score = float(np.mean(scores))
 
         return RiskSignal(
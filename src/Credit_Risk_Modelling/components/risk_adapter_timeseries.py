@@ -1,15 +1,31 @@
 import joblib
 import numpy as np
+import lightgbm as lgb
 from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
+from Credit_Risk_Modelling.components.compiled_tree_predictor import CompiledTreePredictor
 from pathlib import Path
 
 
 class TimeSeriesRiskAdapter:
-    def __init__(self, model_path: Path):
-        self.model = joblib.load(model_path)
+    def __init__(self, model_path: Path, compiled: bool = False):
+        # .txt is the native booster written by TimeSeriesModelTrainer.train_booster
+        if Path(model_path).suffix == ".txt":
+            self.model = lgb.Booster(model_file=str(model_path))
+            compiled = True
+        else:
+            self.model = joblib.load(model_path)
+
+        self.predictor = CompiledTreePredictor.try_from_model(self.model) if compiled else None
 
     def predict(self, X):
-        prob = self.model.predict_proba(X)[:, 1].mean()
+        if self.predictor is not None:
+            prob = self.predictor.predict_proba(X)[:, 1].mean()
+        elif isinstance(self.model, lgb.Booster):
+            # Native booster the compiled predictor cannot handle
+            raw = np.asarray(self.model.predict(X))
+            prob = (raw[:, 1] if raw.ndim == 2 else raw).mean()
+        else:
+            prob = self.model.predict_proba(X)[:, 1].mean()
 
         return RiskSignal(
             name="timeseries",
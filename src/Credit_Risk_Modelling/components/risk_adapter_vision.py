@@ -4,24 +4,33 @@ from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
 from pathlib import Path
 
 
+def score_embeddings(embeddings, model=None):
+    """
+    Per-document risk scores and the confidence to attach to them: the
+    trained classifier when available, else the embedding-norm proxy.
+    """
+    if model is not None:
+        return model.predict_proba(embeddings)[:, 1], 0.7
+
+    # proxy risk: embedding variance
+    scores = np.minimum(np.linalg.norm(embeddings, axis=1) / 50.0, 1.0)
+    return scores, 0.4
+
+
 class VisionRiskAdapter:
     def __init__(self, embedding_path: Path, model_path: Path | None = None):
         self.embeddings = joblib.load(embedding_path)["embeddings"]
         self.model = joblib.load(model_path) if model_path and model_path.exists() else None
 
-    def predict(self):
-        if self.model:
-            probs = self.model.predict_proba(self.embeddings)[:, 1]
-            score = probs.mean()
-            confidence = 0.7
-        else:
-            # proxy risk: embedding variance
-            score = float(np.linalg.norm(self.embeddings, axis=1).mean())
-            score = min(score / 50.0, 1.0)
-            confidence = 0.4
+    def predict(self, embeddings=None):
+        """Scores the given applicant embeddings, or the stored set if omitted."""
+        if embeddings is None:
+            embeddings = self.embeddings
+
+        scores, confidence = score_embeddings(embeddings, self.model)
 
         return RiskSignal(
             name="vision",
-            score=score,
+            score=float(scores.mean()),
             confidence=confidence
         )
@@ -0,0 +1,179 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
+
+
+class ShadowScoreStore:
+    """
+    SQLite log of paired scores: what the live (heuristic) path returned
+    for a modality and what the candidate model adapter scored on the same
+    inputs. Modality "final" pairs the fused risk scores.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS shadow_scores (
+                    request_id TEXT NOT NULL,
+                    modality TEXT NOT NULL,
+                    primary_score REAL,
+                    shadow_score REAL,
+                    shadow_ms REAL,
+                    error TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS shadow_scores_created_at ON shadow_scores (created_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def record(self, rows: list[tuple]):
+        """`rows`: (request_id, modality, primary_score, shadow_score, shadow_ms, error)."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO shadow_scores VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*row, now) for row in rows],
+            )
+            conn.execute("COMMIT")
+
+    def summary(self, since: float = 0.0) -> list[dict]:
+        """Per-modality agreement between live and shadow scores."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT modality,
+                       COUNT(shadow_score),
+                       AVG(shadow_score - primary_score),
+                       AVG(ABS(shadow_score - primary_score)),
+                       AVG(shadow_ms),
+                       SUM(error IS NOT NULL)
+                FROM shadow_scores
+                WHERE created_at >= ?
+                GROUP BY modality
+                """,
+                (since,),
+            ).fetchall()
+
+        return [
+            {
+                "modality": modality,
+                "scored": scored,
+                "mean_difference": mean_diff,
+                "mean_abs_difference": mean_abs_diff,
+                "mean_shadow_ms": mean_ms,
+                "errors": errors,
+            }
+            for modality, scored, mean_diff, mean_abs_diff, mean_ms, errors in rows
+        ]
+
+
+class ShadowScorer:
+    """
+    Re-scores live requests with candidate model adapters off the request
+    path. `submit` never blocks: when `max_queue` requests are already
+    waiting it drops the request and counts it in `dropped`, so a slow
+    model sheds shadow traffic instead of slowing live traffic. Worker
+    threads run at reduced OS priority where the platform allows it.
+
+    `adapters` maps a modality ("tabular", "timeseries") to an object whose
+    `predict(X)` returns a RiskSignal.
+    """
+
+    def __init__(self, store: ShadowScoreStore, adapters: dict, num_workers: int = 1, max_queue: int = 1000):
+        self.store = store
+        self.adapters = adapters
+        self.submitted = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._workers = [
+            threading.Thread(target=self._run, name=f"shadow-worker-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, request_id: str, inputs: dict, result: dict, skip=()) -> bool:
+        """
+        Queue `inputs` ({modality: X}) for shadow scoring against the live
+        `result`. Modalities in `skip` were already model-scored live.
+        """
+        try:
+            self._queue.put_nowait((request_id, inputs, result, set(skip)))
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        self.submitted += 1
+        return True
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        # Linux applies nice values per thread
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+
+        while True:
+            request_id, inputs, result, skip = self._queue.get()
+            try:
+                self.store.record(self._score(request_id, inputs, result, skip))
+            except Exception:
+                logging.exception(f"Shadow scoring of {request_id} failed")
+            finally:
+                self._queue.task_done()
+
+    def _score(self, request_id: str, inputs: dict, result: dict, skip: set) -> list[tuple]:
+        breakdown = result["breakdown"]
+        signals = {
+            name: RiskSignal(name=name, score=entry["score"], confidence=entry["confidence"])
+            for name, entry in breakdown.items()
+        }
+
+        rows = []
+        for name, adapter in self.adapters.items():
+            if name in skip or name not in inputs or name not in breakdown:
+                continue
+
+            start = time.perf_counter()
+            try:
+                signal = adapter.predict(inputs[name])
+            except Exception as e:
+                rows.append((request_id, name, breakdown[name]["score"], None, None, str(e)))
+                continue
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            rows.append((request_id, name, breakdown[name]["score"], signal.score, elapsed_ms, None))
+            signals[name] = signal
+
+        if any(row[3] is not None for row in rows):
+            # The fused score the live path would have returned with the models
+            total_weight = sum(s.confidence for s in signals.values())
+            shadow_final = sum(s.score * s.confidence for s in signals.values()) / total_weight
+            rows.append((request_id, "final", result["final_risk_score"], shadow_final, None, None))
+
+        return rows
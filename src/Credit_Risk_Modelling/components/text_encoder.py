@@ -0,0 +1,139 @@
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import torch
+from transformers import AutoTokenizer, AutoModel
+
+from Credit_Risk_Modelling.components.token_cache import TokenCache, text_hash, tokenizer_fingerprint
+
+TEXT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+QUANTIZATION_MODES = (None, "int8")
+
+
+def mean_pooling(model_output, attention_mask):
+    token_embeddings = model_output.last_hidden_state
+    input_mask_expanded = attention_mask.unsqueeze(-1).expand(token_embeddings.size()).float()
+    return torch.sum(token_embeddings * input_mask_expanded, 1) / torch.clamp(
+        input_mask_expanded.sum(1), min=1e-9
+    )
+
+
+class TextEncoder:
+    """
+    MiniLM sentence encoder shared by text feature engineering and online
+    scoring.
+
+    quantization="int8" applies torch dynamic quantization to the Linear
+    layers (int8 weights, activations quantized on the fly). This needs no
+    calibration data and runs on CPU only.
+
+    Tokenization is a producer stage: batches are tokenized by the fast
+    (Rust, GIL-releasing) tokenizer on `tokenizer_workers` threads up to
+    `prefetch_batches` ahead of the model. With `token_cache_path`, token
+    ids are read from and written to a TokenCache.
+    """
+
+    def __init__(
+        self,
+        quantization: str | None = None,
+        device: torch.device | None = None,
+        max_length: int = 256,
+        batch_size: int = 32,
+        tokenizer_workers: int = 4,
+        prefetch_batches: int = 8,
+        token_cache_path: Path | None = None,
+    ):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization {quantization!r}; expected one of {QUANTIZATION_MODES}")
+
+        if quantization is not None:
+            device = torch.device("cpu")
+        self.device = device or torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.quantization = quantization
+        self.max_length = max_length
+        self.batch_size = batch_size
+
+        self.prefetch_batches = prefetch_batches
+        self._tokenizer_pool = ThreadPoolExecutor(tokenizer_workers, thread_name_prefix="tokenize")
+
+        self.tokenizer = AutoTokenizer.from_pretrained(TEXT_MODEL_NAME, use_fast=True)
+        self.token_cache = (
+            TokenCache(token_cache_path, tokenizer_fingerprint(self.tokenizer, max_length))
+            if token_cache_path else None
+        )
+        model = AutoModel.from_pretrained(TEXT_MODEL_NAME)
+        model.eval()
+
+        if quantization == "int8":
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            logging.info("Loaded int8 dynamically quantized MiniLM")
+
+        for param in model.parameters():
+            param.requires_grad_(False)
+        self.model = model.to(self.device)
+
+    def _token_ids(self, texts: list[str]) -> list:
+        hashes = [text_hash(t) for t in texts] if self.token_cache else []
+        cached = self.token_cache.get_many(hashes) if self.token_cache else {}
+
+        missing = [i for i in range(len(texts)) if not hashes or hashes[i] not in cached]
+        fresh = {}
+        if missing:
+            encoded = self.tokenizer(
+                [texts[i] for i in missing],
+                truncation=True,
+                max_length=self.max_length,
+            )["input_ids"]
+            fresh = dict(zip(missing, encoded))
+            if self.token_cache:
+                self.token_cache.put_many((hashes[i], ids) for i, ids in fresh.items())
+
+        return [fresh[i] if i in fresh else cached[hashes[i]] for i in range(len(texts))]
+
+    def _prepare(self, texts: list[str]) -> dict:
+        """Token ids for a batch, padded to its longest text."""
+        ids = self._token_ids(texts)
+        width = max(len(row) for row in ids)
+
+        input_ids = np.full((len(ids), width), self.tokenizer.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(ids), width), dtype=np.int64)
+        for row, token_ids in enumerate(ids):
+            input_ids[row, :len(token_ids)] = token_ids
+            attention_mask[row, :len(token_ids)] = 1
+
+        return {
+            "input_ids": torch.from_numpy(input_ids),
+            "attention_mask": torch.from_numpy(attention_mask),
+        }
+
+    def _embed(self, inputs: dict) -> np.ndarray:
+        inputs = {name: tensor.to(self.device) for name, tensor in inputs.items()}
+        model_output = self.model(**inputs)
+        return mean_pooling(model_output, inputs["attention_mask"]).cpu().numpy()
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Sentence embeddings (n, 384). The attention mask keeps padding out
+        of the mean pool.
+        """
+        batches = iter([texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)])
+        pending = deque(
+            self._tokenizer_pool.submit(self._prepare, batch)
+            for _, batch in zip(range(self.prefetch_batches), batches)
+        )
+
+        embeddings = []
+        with torch.inference_mode():
+            while pending:
+                inputs = pending.popleft().result()
+                next_batch = next(batches, None)
+                if next_batch is not None:
+                    pending.append(self._tokenizer_pool.submit(self._prepare, next_batch))
+                embeddings.append(self._embed(inputs))
+
+        if not embeddings:
+            return np.empty((0, self.model.config.hidden_size), dtype=np.float32)
+        return np.vstack(embeddings)
@@ -0,0 +1,84 @@
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+# Stay well under SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def tokenizer_fingerprint(tokenizer, max_length: int) -> str:
+    """
+    Identifies everything that decides the token ids: the serialized fast
+    tokenizer (vocab, normalizer, pre-tokenizer, special tokens) and the
+    truncation length.
+    """
+    spec = tokenizer.backend_tokenizer.to_str()
+    return hashlib.sha1(f"{spec}|max_length={max_length}".encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    SQLite store of token ids keyed by (tokenizer fingerprint, text hash),
+    so re-runs and parameter sweeps over the same corpus skip tokenization.
+    Ids are stored as raw int32 bytes.
+    """
+
+    def __init__(self, db_path: Path, fingerprint: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.fingerprint = fingerprint
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tokens (
+                    fingerprint TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    ids BLOB NOT NULL,
+                    PRIMARY KEY (fingerprint, text_hash)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, hashes: list[str]) -> dict:
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(hashes), _LOOKUP_CHUNK):
+                chunk = hashes[i:i + _LOOKUP_CHUNK]
+                rows = conn.execute(
+                    f"SELECT text_hash, ids FROM tokens WHERE fingerprint = ? "
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    (self.fingerprint, *chunk),
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.int32)
+        return found
+
+    def put_many(self, items):
+        """`items`: iterable of (text hash, token ids)."""
+        rows = [
+            (self.fingerprint, key, np.asarray(ids, dtype=np.int32).tobytes())
+            for key, ids in items
+        ]
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN")
+            conn.executemany("INSERT OR REPLACE INTO tokens VALUES (?, ?, ?)", rows)
+            conn.execute("COMMIT")
@@ -9,3 +9,18 @@ class ConfigurationManager:
 
     def get_data_ingestion_config(self):
         return self.config.data_ingestion
+
+    def get_feature_engineering_config(self):
+        return self.config.feature_engineering
+
+    def get_feature_store_config(self):
+        return self.config.feature_store
+
+    def get_training_config(self):
+        return self.config.training
+
+    def get_telemetry_config(self):
+        return self.config.telemetry
+
+    def get_monitoring_config(self):
+        return self.config.monitoring
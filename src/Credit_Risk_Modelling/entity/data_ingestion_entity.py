@@ -6,3 +6,5 @@ class DataIngestionConfig:
     root_dir: Path
     source_url: str
     local_path: Path
+    md5: str | None = None
+    download_connections: int = 1
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class DocumentManifestEntry:
+    path: str           # relative to the image root, posix separators
+    label: str          # top-level directory under the image root
+    size: int
+    mtime_ns: int
+    md5: str
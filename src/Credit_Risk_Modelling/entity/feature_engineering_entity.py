@@ -6,3 +6,9 @@ class TimeSeriesFeatureConfig:
     data_path: Path
     output_path: Path
     window_size: int
+    memory_budget_mb: float | None = None
+    budget_action: str = "warn"
+    # Out-of-core mode: >0 hash-partitions the panel into this many shards
+    num_partitions: int = 0
+    workers: int | None = None
+    chunk_rows: int = 1_000_000
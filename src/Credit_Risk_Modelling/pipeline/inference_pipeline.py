@@ -3,73 +3,174 @@ Mock inference pipeline for production deployment.
 Works without trained models using heuristic-based risk scoring.
 """
 
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
 from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
 
 
-def run_inference(X_tabular, X_timeseries, **adapters):
+# Threads shared by all requests for the model-backed modality branches;
+# by default one per request thread the worker can run
+MODALITY_WORKERS = int(os.getenv("MODALITY_WORKERS", os.getenv("SERVING_THREADPOOL_SIZE", "40")))
+
+
+@lru_cache(maxsize=1)
+def _modality_executor():
+    # Created on first use, so a pre-forking parent never starts these threads
+    return ThreadPoolExecutor(max_workers=MODALITY_WORKERS, thread_name_prefix="modality")
+
+
+def _timed(branch, started=None, name=None):
+    start = time.perf_counter()
+    if started is not None:
+        started[name] = start
+    signal, status = branch()
+    return signal, status, time.perf_counter() - start
+
+
+def run_inference(
+    X_tabular,
+    X_timeseries,
+    explanations=None,
+    vision_signal=None,
+    extra_signals=None,
+    deadline_s=None,
+    X_text=None,
+    **adapters,
+):
     """
     Run multimodal risk inference using heuristic scoring.
     No trained models required - perfect for demo/MVP.
+
+    If an `explanations` dict is passed, the exact heuristic component
+    contributions are computed in the same pass and stored in it.
+    A `vision_signal` scored from the applicant's documents replaces the
+    mock vision score. `extra_signals` (e.g. duplicate_document) are fused
+    alongside the four modalities.
+
+    Branches backed by a trained model adapter (time series, text) run on
+    a shared thread pool while the cheap heuristic branches run inline, so
+    the tabular heuristic always contributes. With `deadline_s`, a pooled
+    branch that has not finished by then is left out (status "timed_out")
+    and fusion is re-weighted over the signals that arrived; its thread is
+    not interrupted, only ignored.
+    `result["modalities"]` records each branch's status, its run time
+    (`elapsed_ms`) and how long it waited for a pool thread (`queue_ms`).
+
+    A `timeseries_adapter` (TimeSeriesRiskAdapter) scores X_timeseries with
+    the trained model; X_timeseries must then hold its feature columns, as
+    assembled from the online feature store. A `text_adapter`
+    (TextRiskAdapter with an encoder) scores the complaint texts in
+    `X_text`.
     """
-    
-    signals = []
-    
+    timeseries_adapter = adapters.get("timeseries_adapter")
+    text_adapter = adapters.get("text_adapter") if X_text else None
+
     # ============================================
     # 1. TABULAR RISK SCORING (Heuristic)
     # ============================================
-    try:
-        tabular_score = score_tabular_heuristic(X_tabular)
-        signals.append(RiskSignal(
-            name="tabular",
-            score=tabular_score,
-            confidence=0.85
-        ))
-    except Exception as e:
-        print(f"Tabular scoring error: {e}")
-        signals.append(RiskSignal(name="tabular", score=0.5, confidence=0.5))
-    
+    def tabular():
+        try:
+            if explanations is None:
+                tabular_score = score_tabular_heuristic(X_tabular)
+            else:
+                scores, contributions = attribute_tabular_heuristic(_first_row(X_tabular, pd.DataFrame([{}])))
+                tabular_score = float(scores[0])
+                explanations["tabular_components"] = _components(contributions.iloc[0])
+            return RiskSignal(name="tabular", score=tabular_score, confidence=0.85), "ok"
+        except Exception as e:
+            print(f"Tabular scoring error: {e}")
+            return RiskSignal(name="tabular", score=0.5, confidence=0.5), "fallback"
+
     # ============================================
     # 2. TIME-SERIES RISK SCORING (Heuristic)
     # ============================================
-    try:
-        timeseries_score = score_timeseries_heuristic(X_timeseries)
-        signals.append(RiskSignal(
-            name="timeseries",
-            score=timeseries_score,
-            confidence=0.80
-        ))
-    except Exception as e:
-        print(f"Time-series scoring error: {e}")
-        signals.append(RiskSignal(name="timeseries", score=0.5, confidence=0.5))
-    
+    def timeseries():
+        try:
+            if timeseries_adapter is not None:
+                return timeseries_adapter.predict(X_timeseries), "ok"
+            if explanations is None:
+                timeseries_score = score_timeseries_heuristic(X_timeseries)
+            else:
+                scores, contributions = attribute_timeseries_heuristic(_first_row(X_timeseries, [[0.5]]))
+                timeseries_score = float(scores[0])
+                explanations["timeseries_components"] = _components(contributions.iloc[0])
+            return RiskSignal(name="timeseries", score=timeseries_score, confidence=0.80), "ok"
+        except Exception as e:
+            print(f"Time-series scoring error: {e}")
+            return RiskSignal(name="timeseries", score=0.5, confidence=0.5), "fallback"
+
     # ============================================
     # 3. VISION RISK SCORING (Mock)
     # ============================================
     # In production, use document embeddings
-    vision_score = 0.3 + np.random.uniform(-0.1, 0.2)
-    signals.append(RiskSignal(
-        name="vision",
-        score=np.clip(vision_score, 0, 1),
-        confidence=0.65
-    ))
-    
+    def vision():
+        if vision_signal is not None:
+            return vision_signal, "ok"
+        vision_score = 0.3 + np.random.uniform(-0.1, 0.2)
+        return RiskSignal(name="vision", score=np.clip(vision_score, 0, 1), confidence=0.65), "ok"
+
     # ============================================
-    # 4. NLP RISK SCORING (Mock)
+    # 4. NLP RISK SCORING (Mock without a text adapter)
     # ============================================
-    # In production, use transformer embeddings + topic modeling
-    text_score = 0.25 + np.random.uniform(-0.05, 0.15)
-    signals.append(RiskSignal(
-        name="text",
-        score=np.clip(text_score, 0, 1),
-        confidence=0.60
-    ))
-    
+    def text():
+        if text_adapter is not None:
+            try:
+                return text_adapter.predict(X_text), "ok"
+            except Exception as e:
+                print(f"Text scoring error: {e}")
+                return RiskSignal(name="text", score=0.5, confidence=0.5), "fallback"
+        text_score = 0.25 + np.random.uniform(-0.05, 0.15)
+        return RiskSignal(name="text", score=np.clip(text_score, 0, 1), confidence=0.60), "ok"
+
+    branches = {"tabular": tabular, "timeseries": timeseries, "vision": vision, "text": text}
+    pooled = {
+        name for name, adapter in (("timeseries", timeseries_adapter), ("text", text_adapter))
+        if adapter is not None
+    }
+
+    start = time.perf_counter()
+    executor = _modality_executor()
+    started = {}
+    futures = {
+        executor.submit(_timed, branches[name], started, name): name
+        for name in branches if name in pooled
+    }
+
+    outcomes = {}
+    for name, branch in branches.items():
+        if name not in pooled:
+            outcomes[name] = (*_timed(branch), 0.0)
+
+    remaining = None if deadline_s is None else max(0.0, deadline_s - (time.perf_counter() - start))
+    done, _ = wait(futures, timeout=remaining)
+    for future, name in futures.items():
+        if future in done:
+            outcomes[name] = (*future.result(), started[name] - start)
+        else:
+            future.cancel()
+            now = time.perf_counter()
+            outcomes[name] = (None, "timed_out", now - started.get(name, now), started.get(name, now) - start)
+
+    signals, modalities = [], {}
+    for name in branches:
+        signal, status, elapsed, queued = outcomes[name]
+        if signal is not None:
+            signals.append(signal)
+        modalities[name] = {"status": status, "elapsed_ms": elapsed * 1000, "queue_ms": queued * 1000}
+
+    signals.extend(extra_signals or [])
+
     # ============================================
     # 5. AGGREGATE SCORES
     # ============================================
     result = aggregate_signals(signals)
+    result["modalities"] = modalities
+    result["included"] = [signal.name for signal in signals]
     return result
 
 
@@ -85,35 +186,55 @@ def score_tabular_heuristic(X_tabular):
     - f4: outstanding_balance (normalized 0-1)
     """
     try:
-        # Extract features
-        features = X_tabular.iloc[0] if len(X_tabular) > 0 else {}
-        
-        income = features.get('f1', 0.5) if hasattr(features, 'get') else 0.5
-        bill = features.get('f2', 0.5) if hasattr(features, 'get') else 0.5
-        balance = features.get('f4', 0.5) if hasattr(features, 'get') else 0.5
-        
-        # Risk scoring logic:
-        # - High bill-to-income ratio = higher risk
-        # - High outstanding balance = higher risk
-        # - Low income = higher risk
-        
-        bill_to_income_ratio = bill / (income + 0.001)  # Avoid division by zero
-        
-        # Calculate risk components
-        income_risk = 0.3 * (1 - income)  # Low income = high risk
-        bill_risk = 0.4 * min(bill_to_income_ratio, 1.0)  # High bill/income = high risk
-        balance_risk = 0.3 * balance  # High balance = higher risk
-        
-        # Combine
-        risk_score = income_risk + bill_risk + balance_risk
-        
-        return float(np.clip(risk_score, 0, 1))
+        scores, _ = attribute_tabular_heuristic(_first_row(X_tabular, pd.DataFrame([{}])))
+        return float(scores[0])
         
     except Exception as e:
         print(f"Tabular scoring error: {e}")
         return 0.5
 
 
+def attribute_tabular_heuristic(X_tabular):
+    """
+    Vectorized tabular heuristic: one score per row plus its exact additive
+    decomposition.
+
+    Risk scoring logic:
+    - High bill-to-income ratio = higher risk
+    - High outstanding balance = higher risk
+    - Low income = higher risk
+
+    Returns (scores, contributions) where contributions has one column per
+    risk component and a `clipping` column holding clip(raw, 0, 1) - raw, so
+    every row of contributions sums exactly to its score.
+    """
+    X = pd.DataFrame(X_tabular)
+    n = len(X)
+
+    def column(name):
+        if name in X.columns:
+            return X[name].to_numpy(dtype=float)
+        return np.full(n, 0.5)
+
+    income = column("f1")
+    bill = column("f2")
+    balance = column("f4")
+
+    bill_to_income_ratio = bill / (income + 0.001)  # Avoid division by zero
+
+    contributions = pd.DataFrame({
+        "income_risk": 0.3 * (1 - income),  # Low income = high risk
+        "bill_risk": 0.4 * np.minimum(bill_to_income_ratio, 1.0),  # High bill/income = high risk
+        "balance_risk": 0.3 * balance,  # High balance = higher risk
+    }, index=X.index)
+
+    raw = contributions.sum(axis=1).to_numpy()
+    scores = np.clip(raw, 0, 1)
+    contributions["clipping"] = scores - raw
+
+    return scores, contributions
+
+
 def score_timeseries_heuristic(X_timeseries):
     """
     Heuristic time-series risk scoring based on transaction patterns.
@@ -126,42 +247,83 @@ def score_timeseries_heuristic(X_timeseries):
     - Increasing trend = higher risk (unsustainable)
     """
     try:
-        # Extract transaction values
-        if isinstance(X_timeseries, pd.DataFrame):
-            values = X_timeseries.iloc[0].values if len(X_timeseries) > 0 else [0.5]
-        elif isinstance(X_timeseries, list):
-            values = X_timeseries[0] if len(X_timeseries) > 0 else [0.5]
-        else:
-            values = [0.5]
-        
-        values = np.array(values, dtype=float)
-        
-        # Calculate volatility (standard deviation)
-        volatility = float(np.std(values)) if len(values) > 1 else 0
-        
-        # Calculate trend (are transactions increasing?)
-        if len(values) > 1:
-            trend = float(np.polyfit(range(len(values)), values, 1)[0])
-        else:
-            trend = 0
-        
-        # Calculate average transaction level
-        avg_level = float(np.mean(values))
-        
-        # Risk scoring
-        volatility_risk = 0.4 * min(volatility * 2, 1.0)  # High volatility = risky
-        trend_risk = 0.3 * max(trend, 0)  # Increasing transactions = risky
-        level_risk = 0.3 * avg_level  # High spending = risky
-        
-        risk_score = volatility_risk + trend_risk + level_risk
-        
-        return float(np.clip(risk_score, 0, 1))
+        scores, _ = attribute_timeseries_heuristic(_first_row(X_timeseries, [[0.5]]))
+        return float(scores[0])
         
     except Exception as e:
         print(f"Time-series scoring error: {e}")
         return 0.5
 
 
+def attribute_timeseries_heuristic(X_timeseries):
+    """
+    Vectorized time-series heuristic: each row is one applicant's sequence of
+    transaction values. Returns (scores, contributions) as in
+    `attribute_tabular_heuristic`, with volatility, trend and level
+    components plus the clipping term.
+
+    Missing (NaN) steps are left out of every component, so the score is
+    computed from the same observed values as its contributions. A row with
+    no observed values raises ValueError.
+    """
+    if isinstance(X_timeseries, pd.DataFrame):
+        values = X_timeseries.to_numpy(dtype=float)
+        index = X_timeseries.index
+    else:
+        values = np.atleast_2d(np.asarray(X_timeseries, dtype=float))
+        index = None
+
+    observed = ~np.isnan(values)
+    n_observed = observed.sum(axis=1)
+    if (n_observed == 0).any():
+        rows = np.flatnonzero(n_observed == 0).tolist()
+        raise ValueError(f"Time-series rows {rows} have no observed values")
+
+    # Calculate average transaction level
+    avg_level = np.nanmean(values, axis=1)
+
+    # Calculate volatility (standard deviation)
+    centered = np.where(observed, values - avg_level[:, None], 0.0)
+    volatility = np.sqrt((centered ** 2).sum(axis=1) / n_observed)
+
+    # Calculate trend: least-squares slope against the time index
+    t = np.broadcast_to(np.arange(values.shape[1], dtype=float), values.shape)
+    t_mean = np.where(observed, t, 0.0).sum(axis=1) / n_observed
+    t_centered = np.where(observed, t - t_mean[:, None], 0.0)
+    t_var = (t_centered ** 2).sum(axis=1)
+    trend = np.divide(
+        (centered * t_centered).sum(axis=1), t_var, out=np.zeros(len(values)), where=t_var > 0
+    )
+
+    contributions = pd.DataFrame({
+        "volatility_risk": 0.4 * np.minimum(volatility * 2, 1.0),  # High volatility = risky
+        "trend_risk": 0.3 * np.maximum(trend, 0),  # Increasing transactions = risky
+        "level_risk": 0.3 * avg_level,  # High spending = risky
+    }, index=index)
+
+    raw = contributions.sum(axis=1).to_numpy()
+    scores = np.clip(raw, 0, 1)
+    contributions["clipping"] = scores - raw
+
+    return scores, contributions
+
+
+def _first_row(X, default):
+    """Single-applicant inputs: the first row, or `default` when there is none."""
+    if isinstance(X, pd.DataFrame):
+        return X.iloc[:1] if X.size > 0 else default
+    if isinstance(X, list):
+        return [X[0]] if len(X) > 0 else default
+    return default
+
+
+def _components(row):
+    return [
+        {"component": name, "contribution": float(value)}
+        for name, value in row.items()
+    ]
+
+
 def aggregate_signals(signals):
     """
     Aggregate multimodal risk signals using confidence-weighted fusion.
@@ -200,19 +362,41 @@ def aggregate_signals(signals):
     }
 
 
-def run_explained_inference(X_tabular, X_timeseries, **adapters):
+def run_explained_inference(X_tabular, X_timeseries, top_k=5, approximate=False, **adapters):
     """
     Run inference with explainability.
+
+    Heuristic component contributions are always exact and computed in the
+    scoring pass. Pass `tabular_explainer` (an ExplanationBatcher) to get
+    per-applicant SHAP attributions for the trained tabular model instead of
+    the heuristic ones in `tabular_top_features`.
     """
-    result = run_inference(X_tabular, X_timeseries, **adapters)
-    
-    # Add top features explanation
+    tabular_explainer = adapters.pop("tabular_explainer", None)
+    explanations = {}
+    result = run_inference(X_tabular, X_timeseries, explanations=explanations, **adapters)
+
+    if tabular_explainer is not None:
+        features = X_tabular.iloc[0].to_dict()
+        top_features = tabular_explainer.explain(features, top_k=top_k, approximate=approximate)
+    else:
+        feature_names = {
+            "income_risk": "income_level",
+            "bill_risk": "bill_to_income_ratio",
+            "balance_risk": "outstanding_balance",
+        }
+        top_features = sorted(
+            (
+                {"feature": feature_names[c["component"]], "importance": c["contribution"]}
+                for c in explanations.get("tabular_components", [])
+                if c["component"] in feature_names
+            ),
+            key=lambda f: abs(f["importance"]),
+            reverse=True,
+        )[:top_k]
+
     result["explanations"] = {
-        "tabular_top_features": [
-            {"feature": "income_level", "importance": 0.35},
-            {"feature": "bill_to_income_ratio", "importance": 0.40},
-            {"feature": "outstanding_balance", "importance": 0.25},
-        ]
+        "tabular_top_features": top_features,
+        **explanations,
     }
-    
-    return result
\ No newline at end of file
+
+    return result
@@ -22,7 +22,10 @@ from Credit_Risk_Modelling.components.feature_engineering_tabular import Tabular
 from Credit_Risk_Modelling.components.feature_engineering_timeseries import TimeSeriesFeatureEngineering
 from Credit_Risk_Modelling.entity.feature_engineering_entity import TimeSeriesFeatureConfig
 from Credit_Risk_Modelling.components.feature_engineering_documents import DocumentFeatureEngineering
+from Credit_Risk_Modelling.components.document_index import DocumentIndex
 from Credit_Risk_Modelling.components.feature_engineering_text import TextFeatureEngineering
+from Credit_Risk_Modelling.components.feature_store import OnlineFeatureStore
+from Credit_Risk_Modelling.components.drift_monitor import reference_samples, build_reference
 
 
 
@@ -32,6 +35,7 @@ from Credit_Risk_Modelling.components.model_trainer_documents import DocumentRis
 from Credit_Risk_Modelling.components.model_trainer_text import TextRiskModelTrainer
 from Credit_Risk_Modelling.components.topic_modeling_text import TextTopicModeler
 from Credit_Risk_Modelling.utils.text_topic_risk_mapping import map_topics_to_risk
+from Credit_Risk_Modelling.utils.telemetry import RunTelemetry
 
 
 
@@ -47,11 +51,27 @@ class TrainingPipeline:
     def __init__(self):
         self.config_manager = ConfigurationManager(Path("config/config.yaml"))
         self.data_ingestion_config = self.config_manager.get_data_ingestion_config()
+        self.feature_engineering_config = self.config_manager.get_feature_engineering_config()
+        self.feature_store_config = self.config_manager.get_feature_store_config()
+        self.training_config = self.config_manager.get_training_config()
+
+        tc = self.config_manager.get_telemetry_config()
+        self.telemetry = RunTelemetry(
+            report_dir=Path(tc.report_dir),
+            trace_allocations=tc.trace_allocations,
+            top_allocators=tc.top_allocators,
+        )
 
     # STAGE 1: DATA INGESTION
     def run_data_ingestion(self):
         logging.info("Starting data ingestion stage")
 
+        with self.telemetry.stage("data_ingestion"):
+            self._ingest()
+
+        logging.info("Data ingestion stage completed")
+
+    def _ingest(self):
         di = self.data_ingestion_config
 
         TabularDataIngestion(
@@ -59,6 +79,8 @@ class TrainingPipeline:
                 root_dir=Path(di.tabular.root_dir),
                 source_url=di.tabular.source_url,
                 local_path=Path(di.tabular.local_file),
+                md5=di.tabular.get("md5"),
+                download_connections=di.tabular.get("download_connections", 1),
             )
         ).ingest()
 
@@ -71,20 +93,26 @@ class TrainingPipeline:
         ).ingest()
 
         DocumentDataIngestion(
-            Path(di.documents.local_dir)
+            Path(di.documents.local_dir),
+            Path(di.documents.manifest_file),
         ).ingest()
 
         TextDataIngestion(
             Path(di.text.local_file)
         ).ingest()
 
-        logging.info("Data ingestion stage completed")
-
     # STAGE 2: DATA VALIDATION
     def run_data_validation(self):
         logging.info("Starting data validation stage")
 
+        with self.telemetry.stage("data_validation"):
+            self._validate()
+
+        logging.info("Data validation stage completed")
+
+    def _validate(self):
         di = self.data_ingestion_config
+        fe = self.feature_engineering_config.timeseries
 
         TabularDataValidation(
             DataValidationConfig(
@@ -94,19 +122,22 @@ class TrainingPipeline:
         ).validate()
 
         TimeSeriesDataValidation(
-            Path(di.timeseries.local_file)
+            Path(di.timeseries.local_file),
+            memory_budget_mb=di.timeseries.get("memory_budget_mb"),
+            budget_action=di.timeseries.get("memory_budget_action", "warn"),
+            # Out-of-core runs stream validation too
+            chunk_rows=fe.chunk_rows if fe.num_partitions else None,
         ).validate()
 
         DocumentDataValidation(
-            Path(di.documents.local_dir)
+            Path(di.documents.local_dir),
+            Path(di.documents.manifest_file),
         ).validate()
 
         TextDataValidation(
             Path(di.text.local_file)
         ).validate()
 
-        logging.info("Data validation stage completed")
-
     # STAGE 3: FEATURE ENGINEERING
     def run_feature_engineering(self):
         logging.info("Starting feature engineering stage")
@@ -117,22 +148,47 @@ class TrainingPipeline:
         tabular_fe_path = Path("artifacts/feature_engineering/tabular")
         tabular_fe_path.mkdir(parents=True, exist_ok=True)
 
-        TabularFeatureEngineering(
-            data_path=Path(di.tabular.local_file),
-            output_path=tabular_fe_path,
-        ).transform()
+        with self.telemetry.stage("tabular_feature_engineering") as stage:
+            X_scaled, _ = TabularFeatureEngineering(
+                data_path=Path(di.tabular.local_file),
+                output_path=tabular_fe_path,
+            ).transform()
+            stage["items"] = len(X_scaled)
 
         # ---- Time-Series ----
         ts_fe_path = Path("artifacts/feature_engineering/timeseries")
         ts_fe_path.mkdir(parents=True, exist_ok=True)
 
-        TimeSeriesFeatureEngineering(
-            TimeSeriesFeatureConfig(
-                data_path=Path(di.timeseries.local_file),
-                output_path=ts_fe_path,
-                window_size=5,
+        fe = self.feature_engineering_config.timeseries
+        with self.telemetry.stage("timeseries_feature_engineering") as stage:
+            ts_fe = TimeSeriesFeatureEngineering(
+                TimeSeriesFeatureConfig(
+                    data_path=Path(di.timeseries.local_file),
+                    output_path=ts_fe_path,
+                    window_size=fe.window_size,
+                    memory_budget_mb=di.timeseries.get("memory_budget_mb"),
+                    budget_action=di.timeseries.get("memory_budget_action", "warn"),
+                    num_partitions=fe.num_partitions,
+                    workers=fe.workers,
+                    chunk_rows=fe.chunk_rows,
+                )
             )
-        ).transform()
+            ts_fe.transform()
+            stage["items"] = ts_fe.n_rows
+
+        with self.telemetry.stage("feature_store_refresh") as stage:
+            store = OnlineFeatureStore(Path(self.feature_store_config.db_path))
+            stage["items"] = store.load_csv(ts_fe.output_file, "timeseries", chunk_rows=fe.chunk_rows)
+
+        with self.telemetry.stage("drift_reference") as stage:
+            monitoring = self.config_manager.get_monitoring_config()
+            samples = reference_samples(
+                Path(di.tabular.local_file),
+                Path(di.timeseries.local_file),
+                max_sample=monitoring.reference_sample,
+            )
+            build_reference(samples, Path(monitoring.drift_reference))
+            stage["items"] = sum(len(values) for values in samples.values())
 
         logging.info("Feature engineering stage completed")
 
@@ -143,11 +199,36 @@ class TrainingPipeline:
         ts_model_path = Path("artifacts/training/timeseries")
         ts_model_path.mkdir(parents=True, exist_ok=True)
 
-        TimeSeriesModelTrainer(
-            data_path=Path("artifacts/feature_engineering/timeseries/timeseries_features.csv"),
-            model_path=Path("artifacts/training/timeseries/lightgbm.pkl"),
-            target_col="default_flag"
-        ).train()
+        ts = self.training_config.timeseries
+        budget = dict(
+            memory_budget_mb=self.data_ingestion_config.timeseries.get("memory_budget_mb"),
+            budget_action=self.data_ingestion_config.timeseries.get("memory_budget_action", "warn"),
+        )
+        features_path = Path("artifacts/feature_engineering/timeseries/timeseries_features.csv")
+
+        with self.telemetry.stage("timeseries_lightgbm_training") as stage:
+            if ts.get("mode", "sklearn") == "booster":
+                trainer = TimeSeriesModelTrainer(
+                    data_path=features_path,
+                    model_path=Path(ts.booster_model_path),
+                    target_col="default_flag",
+                    num_threads=ts.num_threads,
+                    valid_fraction=ts.valid_fraction,
+                    n_estimators=ts.n_estimators,
+                    early_stopping_rounds=ts.early_stopping_rounds,
+                    **budget,
+                )
+                trainer.train_booster()
+                stage["train_rows"] = trainer.n_train_rows
+            else:
+                trainer = TimeSeriesModelTrainer(
+                    data_path=features_path,
+                    model_path=Path("artifacts/training/timeseries/lightgbm.pkl"),
+                    target_col="default_flag",
+                    **budget,
+                )
+                trainer.train()
+            stage["items"] = trainer.n_rows
 
 
         logging.info("Model training stage completed")
@@ -155,30 +236,57 @@ class TrainingPipeline:
     def run_document_pipeline(self):
         logging.info("Starting document vision pipeline")
 
-        image_dir = Path("artifacts/data_ingestion/documents/images")
+        di = self.data_ingestion_config
+        image_dir = Path(di.documents.local_dir)
         fe_output = Path("artifacts/feature_engineering/documents")
 
-        fe = DocumentFeatureEngineering(image_dir, fe_output)
-        fe.extract_embeddings()
-
-        trainer = DocumentRiskModelTrainer(
-            embedding_path=fe_output / "document_embeddings.pkl",
-            model_path=Path("artifacts/training/documents/document_risk_model.pkl")
-        )
-        trainer.train()
+        with self.telemetry.stage("document_resnet_embedding") as stage:
+            cache_dir = di.documents.get("tensor_cache_dir")
+            fe = DocumentFeatureEngineering(
+                image_dir,
+                fe_output,
+                Path(di.documents.manifest_file),
+                tensor_cache_dir=Path(cache_dir) if cache_dir else None,
+            )
+            embeddings, _ = fe.extract_embeddings()
+            stage["items"], stage["unit"] = len(embeddings), "images"
+
+        with self.telemetry.stage("document_index_build") as stage:
+            index_fe = self.feature_engineering_config.documents
+            index = DocumentIndex.train(embeddings, nlist=index_fe.nlist)
+            index.add(embeddings)
+            index.save(Path(index_fe.index_path))
+            stage["items"], stage["unit"] = len(index), "images"
+
+        with self.telemetry.stage("document_model_training") as stage:
+            trainer = DocumentRiskModelTrainer(
+                embedding_path=fe_output / "document_embeddings.pkl",
+                model_path=Path("artifacts/training/documents/document_risk_model.pkl")
+            )
+            trainer.train()
+            stage["items"], stage["unit"] = len(embeddings), "images"
 
         logging.info("Document vision pipeline completed")
 
     def run_text_pipeline(self):
         logging.info("Starting NLP text pipeline")
 
-        fe = TextFeatureEngineering(
-            data_path=Path("artifacts/data_ingestion/text/complaints.csv"),
-            text_column="Consumer complaint narrative",
-            output_dir=Path("artifacts/feature_engineering/text")
-        )
+        text_fe = self.feature_engineering_config.text
+        with self.telemetry.stage("text_minilm_embedding") as stage:
+            fe = TextFeatureEngineering(
+                data_path=Path("artifacts/data_ingestion/text/complaints.csv"),
+                text_column="Consumer complaint narrative",
+                output_dir=Path("artifacts/feature_engineering/text"),
+                quantization=text_fe.quantization,
+                batch_size=text_fe.batch_size,
+                tokenizer_workers=text_fe.tokenizer_workers,
+                token_cache_path=Path(text_fe.token_cache) if text_fe.token_cache else None,
+            )
+
+            embeddings = fe.transform()
+            if embeddings is not None:
+                stage["items"], stage["unit"] = len(embeddings), "texts"
 
-        embeddings = fe.transform()
         if embeddings is None:
             logging.warning("Text pipeline skipped")
             return
@@ -189,7 +297,10 @@ class TrainingPipeline:
             n_topics=10
         )
 
-        topics = topic_modeler.fit()
+        with self.telemetry.stage("text_topic_modeling") as stage:
+            topics = topic_modeler.fit()
+            stage["items"], stage["unit"] = len(embeddings), "texts"
+
         if topics is None:
             return
 
@@ -214,6 +325,7 @@ class TrainingPipeline:
         self.run_model_training()
         self.run_document_pipeline()
         self.run_text_pipeline()
+        logging.info(f"Run telemetry written to {self.telemetry.report_path}")
 
 
 
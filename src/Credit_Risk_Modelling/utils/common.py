@@ -1,13 +1,181 @@
 import os
+import re
+import urllib.error
 import urllib.request
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
 
-def download_file(url: str, dest: Path):
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+PARALLEL_DOWNLOAD_MIN_BYTES = 16 * 1024 * 1024
+
+
+def download_file(
+    url: str,
+    dest: Path,
+    expected_md5: str | None = None,
+    num_connections: int = 1,
+    timeout: float = 60.0,
+):
+    """
+    Download `url` to `dest`, skipping the transfer when the local file already
+    matches the expected checksum.
+
+    The checksum is taken from `expected_md5` or, failing that, from the
+    `<dest>.md5` sidecar written after the last successful download. The
+    sidecar only records what was downloaded last time, so it proves the
+    local copy is intact but not that the remote is unchanged; without an
+    `expected_md5`, the file is also re-fetched when the server's
+    Content-Length no longer matches it. Partial downloads are resumed with
+    HTTP Range requests, large files can be fetched in `num_connections`
+    parallel byte ranges, and the result is verified before being atomically
+    renamed into place.
+    """
+    dest = Path(dest)
     os.makedirs(dest.parent, exist_ok=True)
+    sidecar = dest.with_name(dest.name + ".md5")
+
+    expected = expected_md5
+    if expected is None and sidecar.exists():
+        expected = sidecar.read_text().strip()
+
+    probe = None
+    if dest.exists() and expected and calculate_md5(dest) == expected.lower():
+        if expected_md5 is not None:
+            logging.info(f"{dest} is up to date, skipping download")
+            return dest
+
+        probe = _probe(url, timeout)
+        if probe[0] is None or probe[0] == dest.stat().st_size:
+            logging.info(f"{dest} matches its last download, skipping download")
+            return dest
+        logging.info(f"{url} is now {probe[0]} bytes, not {dest.stat().st_size}; downloading again")
+
     logging.info(f"Downloading data from {url}")
-    urllib.request.urlretrieve(url, dest)
+    part = dest.with_name(dest.name + ".part")
+
+    size, accepts_ranges = probe or _probe(url, timeout)
+    if num_connections > 1 and accepts_ranges and size and size >= PARALLEL_DOWNLOAD_MIN_BYTES:
+        _download_ranges(url, part, size, num_connections, timeout)
+    else:
+        _download_stream(url, part, timeout, size)
+
+    if size is not None and part.stat().st_size != size:
+        received = part.stat().st_size
+        part.unlink()
+        raise IOError(f"Incomplete download of {url}: got {received} of {size} bytes")
+
+    checksum = calculate_md5(part)
+    if expected_md5 and checksum != expected_md5.lower():
+        part.unlink()
+        raise ValueError(
+            f"Checksum mismatch for {url}: expected {expected_md5}, got {checksum}"
+        )
+
+    os.replace(part, dest)
+    sidecar.write_text(checksum)
+    return dest
+
+
+def _probe(url: str, timeout: float):
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            length = response.headers.get("Content-Length")
+            accepts_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            return (int(length) if length else None), accepts_ranges
+    except Exception as e:
+        logging.warning(f"HEAD request failed for {url}: {e}")
+        return None, False
+
+
+def _content_range_total(header: str | None) -> int | None:
+    """Total size from a Content-Range header such as `bytes */1234`."""
+    match = re.search(r"/(\d+)\s*$", header or "")
+    return int(match.group(1)) if match else None
+
+
+def _download_stream(url: str, part: Path, timeout: float, size: int | None = None):
+    offset = part.stat().st_size if part.exists() else 0
+    if offset and size is not None:
+        if offset == size:
+            logging.info(f"{part} is already complete")
+            return
+        if offset > size:
+            # Left over from a larger version of the file
+            part.unlink()
+            offset = 0
+
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code != 416 or not offset:
+            raise
+        # Nothing left to send past `offset`: either the part file is
+        # complete, or it does not belong to the file now being served
+        if _content_range_total(e.headers.get("Content-Range")) == offset:
+            logging.info(f"{part} is already complete")
+            return
+        part.unlink()
+        return _download_stream(url, part, timeout)
+
+    with response:
+        if offset and response.status == 206:
+            logging.info(f"Resuming download at byte {offset}")
+            mode = "ab"
+        else:
+            mode = "wb"
+
+        with open(part, mode) as f:
+            for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b""):
+                f.write(chunk)
+
+
+def _download_range(url: str, part: Path, start: int, end: int, timeout: float):
+    offset = part.stat().st_size if part.exists() else 0
+    if start + offset > end:
+        return
+
+    request = urllib.request.Request(url)
+    request.add_header("Range", f"bytes={start + offset}-{end}")
+
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        if response.status != 206:
+            raise IOError(f"Server ignored range request for {url}")
+
+        with open(part, "ab") as f:
+            for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b""):
+                f.write(chunk)
+
+
+def _download_ranges(url: str, part: Path, size: int, num_connections: int, timeout: float):
+    step = -(-size // num_connections)
+    ranges = [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+    pieces = [part.with_name(f"{part.name}.{i}") for i in range(len(ranges))]
+
+    logging.info(f"Downloading {size} bytes in {len(ranges)} parallel ranges")
+    with ThreadPoolExecutor(max_workers=num_connections) as pool:
+        futures = [
+            pool.submit(_download_range, url, piece, start, end, timeout)
+            for piece, (start, end) in zip(pieces, ranges)
+        ]
+        for future in futures:
+            future.result()
+
+    with open(part, "wb") as out:
+        for piece in pieces:
+            with open(piece, "rb") as f:
+                for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                    out.write(chunk)
+
+    for piece in pieces:
+        piece.unlink()
+
 
 def calculate_md5(file_path: Path) -> str:
     hash_md5 = hashlib.md5()
@@ -0,0 +1,146 @@
+import os
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+
+from Credit_Risk_Modelling.entity.document_manifest_entity import DocumentManifestEntry
+from Credit_Risk_Modelling.utils.common import calculate_md5
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+# Label directories written by utils/generate_documents.py and
+# scripts/generate_synthetic_documents.py
+LABEL_TARGETS = {
+    "low_risk": 0,
+    "high_risk": 1,
+}
+
+
+class DocumentManifest:
+    """
+    Index of document images (path, label, size, mtime, content hash) built in a
+    single os.scandir walk. On refresh, files whose size and mtime are unchanged
+    keep their previous hash, so only new or modified images are re-read.
+    """
+
+    def __init__(self, root_dir: Path, manifest_path: Path | None = None, hash_workers: int = 8):
+        self.root_dir = Path(root_dir)
+        self.manifest_path = (
+            Path(manifest_path) if manifest_path else self.root_dir.parent / "manifest.json"
+        )
+        self.hash_workers = hash_workers
+        self.entries: dict[str, DocumentManifestEntry] = {}
+
+    @classmethod
+    def load_or_refresh(cls, root_dir: Path, manifest_path: Path | None = None):
+        manifest = cls(root_dir, manifest_path)
+        if not manifest.load():
+            manifest.refresh()
+        return manifest
+
+    def load(self) -> bool:
+        if not self.manifest_path.exists():
+            return False
+
+        with open(self.manifest_path) as f:
+            data = json.load(f)
+
+        # Entries are relative paths; from another directory they would pair
+        # this tree's files with another tree's hashes
+        recorded = data.get("root_dir")
+        if recorded is None or Path(recorded).resolve() != self.root_dir.resolve():
+            logging.warning(
+                f"Ignoring manifest {self.manifest_path}: it indexes {recorded}, not {self.root_dir}"
+            )
+            self.entries = {}
+            return False
+
+        self.entries = {
+            e["path"]: DocumentManifestEntry(**e) for e in data["entries"]
+        }
+        return True
+
+    def save(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "root_dir": str(self.root_dir),
+                    "entries": [asdict(e) for e in self.entries.values()],
+                },
+                f,
+            )
+
+        os.replace(tmp_path, self.manifest_path)
+
+    def refresh(self):
+        if not self.root_dir.exists():
+            raise FileNotFoundError(f"Document image directory missing: {self.root_dir}")
+
+        if not self.entries:
+            self.load()
+
+        previous = self.entries
+        current = {}
+        to_hash = []
+
+        for rel_path, label, stat in self._scan():
+            old = previous.get(rel_path)
+            if old and old.size == stat.st_size and old.mtime_ns == stat.st_mtime_ns:
+                current[rel_path] = old
+            else:
+                to_hash.append((rel_path, label, stat))
+
+        with ThreadPoolExecutor(max_workers=self.hash_workers) as pool:
+            hashes = pool.map(
+                lambda item: calculate_md5(self.root_dir / item[0]), to_hash
+            )
+            for (rel_path, label, stat), md5 in zip(to_hash, hashes):
+                current[rel_path] = DocumentManifestEntry(
+                    path=rel_path,
+                    label=label,
+                    size=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns,
+                    md5=md5,
+                )
+
+        removed = len(set(previous) - set(current))
+        logging.info(
+            f"Document manifest refreshed: {len(current)} images "
+            f"({len(to_hash)} hashed, {removed} removed)"
+        )
+
+        self.entries = current
+        self.save()
+        return self
+
+    def _scan(self):
+        stack = [(self.root_dir, "")]
+        while stack:
+            directory, prefix = stack.pop()
+            with os.scandir(directory) as it:
+                for entry in it:
+                    rel_path = f"{prefix}{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, rel_path + "/"))
+                    elif Path(entry.name).suffix.lower() in IMAGE_EXTENSIONS:
+                        label = rel_path.split("/", 1)[0] if "/" in rel_path else ""
+                        yield rel_path, label, entry.stat()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def labelled_images(self):
+        """
+        (absolute path, binary target) for every image under a known label
+        directory, in a stable order.
+        """
+        return [
+            (self.root_dir / e.path, LABEL_TARGETS[e.label])
+            for e in sorted(self.entries.values(), key=lambda e: e.path)
+            if e.label in LABEL_TARGETS
+        ]
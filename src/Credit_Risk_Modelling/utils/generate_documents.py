@@ -1,61 +1,231 @@
+import argparse
+import csv
+import os
+from multiprocessing import Pool
+from pathlib import Path
+
 import cv2
 import numpy as np
-import os
 from PIL import Image, ImageDraw, ImageFont
-import random
 
 OUTPUT_DIR = "artifacts/data_ingestion/documents/images"
-CLEAN_DIR = os.path.join(OUTPUT_DIR, "clean")
-SUSPICIOUS_DIR = os.path.join(OUTPUT_DIR, "suspicious")
 
 NUM_IMAGES = 300
+SEED = 42
+WIDTH, HEIGHT = 800, 1000
 
+LOW_RISK_LABEL = "low_risk"
+HIGH_RISK_LABEL = "high_risk"
 
-def generate_document(text, noisy=False):
-    img = Image.new("RGB", (800, 1000), "white")
-    draw = ImageDraw.Draw(img)
+MANIFEST_FILE = "generation_manifest.csv"
 
-    try:
-        font = ImageFont.truetype("DejaVuSans.ttf", 22)
-    except:
-        font = ImageFont.load_default()
+# With base images: one clean copy and then corrupted copies of each
+VARIANTS_PER_BASE = 4
 
-    y = 50
-    for line in text:
-        draw.text((50, y), line, font=font, fill="black")
-        y += 40
 
-    img_np = np.array(img)
+# =========================
+# IMAGE CORRUPTIONS
+# =========================
+def add_noise(img, rng):
+    noise = rng.normal(0, 25, img.shape)
+    return np.clip(img + noise, 0, 255).astype(np.uint8)
+
+def blur(img, rng):
+    return cv2.GaussianBlur(img, (9, 9), 0)
+
+def random_crop(img, rng):
+    h, w = img.shape[:2]
+    crop_h, crop_w = int(h * 0.8), int(w * 0.8)
+    y = rng.integers(0, h - crop_h + 1)
+    x = rng.integers(0, w - crop_w + 1)
+    return cv2.resize(img[y:y + crop_h, x:x + crop_w], (w, h))
 
-    if noisy:
-        noise = np.random.normal(0, 25, img_np.shape).astype(np.uint8)
-        img_np = cv2.add(img_np, noise)
-        img_np = cv2.GaussianBlur(img_np, (5, 5), 0)
+def adjust_brightness(img, rng):
+    factor = rng.uniform(0.5, 1.5)
+    return np.clip(img * factor, 0, 255).astype(np.uint8)
 
-    return img_np
+def noise_and_blur(img, rng):
+    return cv2.GaussianBlur(add_noise(img, rng), (5, 5), 0)
 
 
-def generate_dataset():
-    os.makedirs(CLEAN_DIR, exist_ok=True)
-    os.makedirs(SUSPICIOUS_DIR, exist_ok=True)
+CORRUPTIONS = {
+    "noise": add_noise,
+    "blur": blur,
+    "crop": random_crop,
+    "brightness": adjust_brightness,
+    "noise_blur": noise_and_blur,
+}
 
-    for i in range(NUM_IMAGES):
-        salary = random.randint(20000, 120000)
-        doc_text = [
-            "Salary Statement",
-            f"Employee ID: {random.randint(10000,99999)}",
-            f"Monthly Salary: ₹{salary}",
-            "Company: XYZ Pvt Ltd",
-            "Authorized Signature"
-        ]
 
-        clean_img = generate_document(doc_text, noisy=False)
-        suspicious_img = generate_document(doc_text, noisy=True)
+# =========================
+# DOCUMENT SOURCES
+# =========================
+_FONT_CACHE = {}
 
-        cv2.imwrite(f"{CLEAN_DIR}/doc_clean_{i}.png", clean_img)
-        cv2.imwrite(f"{SUSPICIOUS_DIR}/doc_susp_{i}.png", suspicious_img)
+def _font(size):
+    if size not in _FONT_CACHE:
+        try:
+            _FONT_CACHE[size] = ImageFont.truetype("DejaVuSans.ttf", size)
+        except OSError:
+            _FONT_CACHE[size] = ImageFont.load_default()
+    return _FONT_CACHE[size]
+
+
+def render_document(rng, width=WIDTH, height=HEIGHT):
+    salary = rng.integers(20000, 120001)
+    text = [
+        "Salary Statement",
+        f"Employee ID: {rng.integers(10000, 100000)}",
+        f"Monthly Salary: ₹{salary}",
+        "Company: XYZ Pvt Ltd",
+        "Authorized Signature"
+    ]
+
+    img = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(img)
+    font = _font(max(10, int(22 * height / HEIGHT)))
+
+    x, y = int(width * 0.0625), int(height * 0.05)
+    for line in text:
+        draw.text((x, y), line, font=font, fill="black")
+        y += int(height * 0.04)
+
+    # PIL renders RGB; cv2 writes BGR
+    return cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
+
+
+def load_base_document(path, width=None, height=None):
+    """
+    Read a base scan, scaled down (never up) to fit within width x height
+    with its aspect ratio kept. Without a size, the scan is used as is.
+    """
+    img = cv2.imread(str(path))
+    if img is None:
+        raise ValueError(f"Could not read base image {path}")
+
+    h, w = img.shape[:2]
+    scale = min((width or w) / w, (height or h) / h, 1.0)
+    if scale < 1.0:
+        img = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+    return img
+
+
+# =========================
+# GENERATION
+# =========================
+def generate_item(index, seed, output_dir, width, height, fmt, high_risk_fraction, base_images,
+                  variants_per_base=VARIANTS_PER_BASE):
+    """
+    Render (or load) one document and optionally corrupt it. All randomness
+    comes from a generator seeded with (seed, index), so an item is identical
+    no matter which worker produces it or in what order.
+
+    With base images, consecutive runs of `variants_per_base` indices share
+    a base: the first is its clean copy, the rest are corrupted copies.
+    Otherwise each rendered document is corrupted with `high_risk_fraction`.
+    """
+    rng = np.random.default_rng([seed, index])
+
+    if base_images:
+        base, variant = divmod(index, variants_per_base)
+        img = load_base_document(base_images[base % len(base_images)], width, height)
+        corrupt = variant > 0
+    else:
+        img = render_document(rng, width, height)
+        corrupt = rng.random() < high_risk_fraction
+
+    if corrupt:
+        label = HIGH_RISK_LABEL
+        corruption = list(CORRUPTIONS)[rng.integers(len(CORRUPTIONS))]
+        img = CORRUPTIONS[corruption](img, rng)
+    else:
+        label = LOW_RISK_LABEL
+        corruption = "none"
+
+    rel_path = f"{label}/doc_{index:07d}.{fmt}"
+    params = [cv2.IMWRITE_JPEG_QUALITY, 90] if fmt == "jpg" else []
+    cv2.imwrite(os.path.join(output_dir, rel_path), img, params)
+
+    return rel_path, label, corruption, index
+
+
+def _generate_item(args):
+    return generate_item(*args)
+
+
+def generate_dataset(
+    output_dir=OUTPUT_DIR,
+    num_images=NUM_IMAGES,
+    seed=SEED,
+    width=WIDTH,
+    height=HEIGHT,
+    fmt="png",
+    high_risk_fraction=0.5,
+    base_dir=None,
+    workers=1,
+    variants_per_base=VARIANTS_PER_BASE,
+):
+    """
+    Generate `num_images` documents under output_dir/{low_risk,high_risk}
+    across a process pool, and write output_dir/generation_manifest.csv with
+    each image's label and corruption type. With `base_dir`, the base scans
+    are corrupted instead of rendering documents, keeping their aspect ratio.
+    """
+    output_dir = Path(output_dir)
+    for label in (LOW_RISK_LABEL, HIGH_RISK_LABEL):
+        (output_dir / label).mkdir(parents=True, exist_ok=True)
+
+    base_images = []
+    if base_dir is not None:
+        base_images = sorted(
+            str(p) for p in Path(base_dir).iterdir()
+            if p.suffix.lower() in {".jpg", ".jpeg", ".png"}
+        )
+        if not base_images:
+            raise FileNotFoundError(f"No base images found in {base_dir}")
+
+    items = (
+        (i, seed, str(output_dir), width, height, fmt, high_risk_fraction, base_images, variants_per_base)
+        for i in range(num_images)
+    )
+
+    with open(output_dir / MANIFEST_FILE, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["path", "label", "corruption", "index"])
+
+        if workers > 1:
+            with Pool(workers) as pool:
+                for row in pool.imap(_generate_item, items, chunksize=64):
+                    writer.writerow(row)
+        else:
+            for row in map(_generate_item, items):
+                writer.writerow(row)
+
+    return output_dir / MANIFEST_FILE
 
 
 if __name__ == "__main__":
-    generate_dataset()
-    print("Synthetic document dataset generated.")
+    parser = argparse.ArgumentParser(description="Generate a synthetic document image corpus")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--num-images", type=int, default=NUM_IMAGES)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--width", type=int, default=WIDTH)
+    parser.add_argument("--height", type=int, default=HEIGHT)
+    parser.add_argument("--format", choices=["png", "jpg"], default="png")
+    parser.add_argument("--high-risk-fraction", type=float, default=0.5)
+    parser.add_argument("--base-dir", default=None, help="Corrupt these images instead of rendering documents")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    manifest = generate_dataset(
+        output_dir=args.output_dir,
+        num_images=args.num_images,
+        seed=args.seed,
+        width=args.width,
+        height=args.height,
+        fmt=args.format,
+        high_risk_fraction=args.high_risk_fraction,
+        base_dir=args.base_dir,
+        workers=args.workers,
+    )
+    print(f"Synthetic document dataset generated. Manifest: {manifest}")
@@ -1,20 +1,39 @@
-import numpy as np
-import pandas as pd
+import argparse
 import os
+from multiprocessing import Pool
 
-np.random.seed(42)
+import numpy as np
+import pandas as pd
 
 OUTPUT_DIR = "artifacts/data_ingestion/timeseries"
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "transactions.csv")
 
 N_CUSTOMERS = 1200
 N_MONTHS = 12
+SEED = 42
 
+# Customers per shard. Each shard draws from its own generator seeded with
+# (seed, shard index), so output does not depend on the number of workers.
+CHUNK_CUSTOMERS = 100_000
 
-def generate_customer_profile():
-    income = np.random.normal(50000, 15000)
-    expense_ratio = np.random.uniform(0.4, 0.9)
-    volatility = np.random.uniform(0.05, 0.35)
+DEFAULT_SHOCK_MONTH = 8
+
+COLUMNS = [
+    "customer_id",
+    "month",
+    "income",
+    "expense",
+    "balance",
+    "transaction_count",
+    "volatility",
+    "default_flag"
+]
+
+
+def generate_customer_profiles(rng, n_customers):
+    income = rng.normal(50000, 15000, n_customers)
+    expense_ratio = rng.uniform(0.4, 0.9, n_customers)
+    volatility = rng.uniform(0.05, 0.35, n_customers)
 
     risk_score = (
         0.5 * (expense_ratio > 0.75) +
@@ -22,53 +41,142 @@ def generate_customer_profile():
         0.2 * (income < 30000)
     )
 
-    default = int(risk_score > 0.6)
+    default = (risk_score > 0.6).astype(np.int8)
     return income, expense_ratio, volatility, default
 
 
-def generate_transactions():
-    rows = []
-
-    for customer_id in range(N_CUSTOMERS):
-        income, expense_ratio, volatility, default = generate_customer_profile()
-        balance = np.random.uniform(10000, 50000)
-
-        for month in range(1, N_MONTHS + 1):
-            monthly_income = max(0, np.random.normal(income, income * volatility))
-            expense = monthly_income * expense_ratio * np.random.uniform(0.9, 1.1)
-            txn_count = int(np.random.normal(30, 10))
-
-            balance += monthly_income - expense
-
-            if default and month > 8:
-                expense *= 1.2
-                balance -= np.random.uniform(5000, 15000)
-
-            rows.append([
-                customer_id,
-                month,
-                round(monthly_income, 2),
-                round(expense, 2),
-                round(balance, 2),
-                txn_count,
-                round(volatility, 2),
-                default
-            ])
-
-    return pd.DataFrame(rows, columns=[
-        "customer_id",
-        "month",
-        "income",
-        "expense",
-        "balance",
-        "transaction_count",
-        "volatility",
-        "default_flag"
-    ])
+def generate_transactions(
+    n_customers: int = N_CUSTOMERS,
+    n_months: int = N_MONTHS,
+    seed: int = SEED,
+    first_customer: int = 0,
+    shard: int = 0,
+):
+    """
+    Customer-month panel for `n_customers` customers, drawn as (customers x
+    months) arrays. Customer ids start at `first_customer`.
+    """
+    rng = np.random.default_rng([seed, shard])
+
+    income, expense_ratio, volatility, default = generate_customer_profiles(rng, n_customers)
+    balance_0 = rng.uniform(10000, 50000, n_customers)
+
+    shape = (n_customers, n_months)
+    monthly_income = np.maximum(
+        0, rng.normal(income[:, None], np.maximum(income, 0)[:, None] * volatility[:, None], shape)
+    )
+    expense = monthly_income * expense_ratio[:, None] * rng.uniform(0.9, 1.1, shape)
+    txn_count = rng.normal(30, 10, shape).astype(np.int64)
+
+    # Balance moves by income - expense each month; defaulters additionally
+    # lose a lump sum after the shock month (after the balance update, so the
+    # inflated expense only shows in the reported column).
+    month = np.arange(1, n_months + 1)
+    shocked = (default[:, None] == 1) & (month[None, :] > DEFAULT_SHOCK_MONTH)
+    shock = np.where(shocked, rng.uniform(5000, 15000, shape), 0.0)
+
+    balance = balance_0[:, None] + np.cumsum(monthly_income - expense - shock, axis=1)
+    expense = np.where(shocked, expense * 1.2, expense)
+
+    customer_id = np.arange(first_customer, first_customer + n_customers)
+
+    return pd.DataFrame({
+        "customer_id": np.repeat(customer_id, n_months),
+        "month": np.tile(month, n_customers),
+        "income": monthly_income.ravel().round(2),
+        "expense": expense.ravel().round(2),
+        "balance": balance.ravel().round(2),
+        "transaction_count": txn_count.ravel(),
+        "volatility": np.repeat(volatility.round(2), n_months),
+        "default_flag": np.repeat(default, n_months),
+    }, columns=COLUMNS)
+
+
+def _generate_shard(args):
+    shard, first_customer, n_customers, n_months, seed, output_dir, fmt = args
+    df = generate_transactions(n_customers, n_months, seed, first_customer, shard)
+
+    if fmt == "parquet":
+        df.to_parquet(os.path.join(output_dir, f"part-{shard:05d}.parquet"), index=False)
+        return len(df)
+
+    # Formatting CSV is the slow part, so it happens in the worker
+    return df.to_csv(index=False, header=(shard == 0))
+
+
+def write_transactions(
+    output: str,
+    n_customers: int = N_CUSTOMERS,
+    n_months: int = N_MONTHS,
+    seed: int = SEED,
+    chunk_customers: int = CHUNK_CUSTOMERS,
+    workers: int = 1,
+    fmt: str = "csv",
+):
+    """
+    Stream the panel to disk one customer shard at a time, optionally
+    generating shards in parallel processes.
+
+    csv: a single file, shards appended in customer order.
+    parquet: `output` is a directory of part-NNNNN.parquet files, one per shard.
+    """
+    shards = [
+        (shard, start, min(chunk_customers, n_customers - start), n_months, seed, output, fmt)
+        for shard, start in enumerate(range(0, n_customers, chunk_customers))
+    ]
+
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "Parquet output needs pyarrow. "
+                "Install it via `pip install pyarrow` or use --format csv."
+            ) from e
+        os.makedirs(output, exist_ok=True)
+    else:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+
+    with Pool(workers) if workers > 1 else _Serial() as pool:
+        if fmt == "parquet":
+            for _ in pool.imap(_generate_shard, shards):
+                pass
+            return
+
+        with open(output, "w", newline="") as f:
+            for chunk in pool.imap(_generate_shard, shards):
+                f.write(chunk)
+
+
+class _Serial:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def imap(self, fn, items):
+        return map(fn, items)
 
 
 if __name__ == "__main__":
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    df = generate_transactions()
-    df.to_csv(OUTPUT_FILE, index=False)
-    print(f"Saved synthetic transactions to {OUTPUT_FILE}")
+    parser = argparse.ArgumentParser(description="Generate a synthetic customer-month transaction panel")
+    parser.add_argument("--customers", type=int, default=N_CUSTOMERS)
+    parser.add_argument("--months", type=int, default=N_MONTHS)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--chunk-customers", type=int, default=CHUNK_CUSTOMERS)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    write_transactions(
+        args.output,
+        n_customers=args.customers,
+        n_months=args.months,
+        seed=args.seed,
+        chunk_customers=args.chunk_customers,
+        workers=args.workers,
+        fmt=args.format,
+    )
+    print(f"Saved synthetic transactions to {args.output}")
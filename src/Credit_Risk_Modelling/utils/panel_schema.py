@@ -0,0 +1,126 @@
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MB = 1024 * 1024
+
+# Compact dtypes for the customer-month panel. Measures are float32 (seven
+# significant digits is ample for currency amounts of this size), ids and
+# counters use the narrowest integer type that holds them.
+PANEL_DTYPES = {
+    "customer_id": "int32",
+    "month": "int16",
+    "income": "float32",
+    "expense": "float32",
+    "balance": "float32",
+    "transaction_count": "int32",
+    "volatility": "float32",
+    "default_flag": "int8",
+}
+
+# Derived features (rolling means etc.) default to float32
+FEATURE_DTYPE = "float32"
+
+SAMPLE_ROWS = 10_000
+
+
+class MemoryBudgetExceeded(MemoryError):
+    pass
+
+
+def _normalize(column) -> str:
+    return str(column).strip().lower()
+
+
+def panel_dtypes(columns) -> dict:
+    """
+    dtype mapping for the raw column names of a panel or features file. Known
+    panel columns get their schema type and other numeric-looking columns
+    are read as float32; anything else is left to pandas.
+    """
+    dtypes = {}
+    for column in columns:
+        name = _normalize(column)
+        if name in PANEL_DTYPES:
+            dtypes[column] = PANEL_DTYPES[name]
+        elif "_mean_" in name or "_std_" in name:
+            dtypes[column] = FEATURE_DTYPE
+    return dtypes
+
+
+def estimate_panel_memory(path: Path, extra_float_columns: int = 0) -> float:
+    """
+    Estimated in-memory size (MB) of a CSV panel read with the compact schema,
+    from the bytes-per-row of a leading sample scaled by the file size.
+    `extra_float_columns` accounts for float32 columns derived after loading.
+    """
+    path = Path(path)
+    columns = pd.read_csv(path, nrows=0).columns
+    sample = pd.read_csv(path, nrows=SAMPLE_ROWS, dtype=panel_dtypes(columns))
+    if sample.empty:
+        return 0.0
+
+    with open(path, "rb") as f:
+        sample_text = sum(len(f.readline()) for _ in range(len(sample) + 1))
+    total_rows = len(sample) * os.path.getsize(path) / sample_text
+
+    bytes_per_row = sample.memory_usage(index=True, deep=True).sum() / len(sample)
+    bytes_per_row += extra_float_columns * np.dtype(FEATURE_DTYPE).itemsize
+    return total_rows * bytes_per_row / MB
+
+
+def check_memory_budget(
+    path: Path,
+    memory_budget_mb: float | None,
+    action: str = "warn",
+    extra_float_columns: int = 0,
+):
+    if not memory_budget_mb:
+        return None
+
+    estimate = estimate_panel_memory(path, extra_float_columns)
+    if estimate <= memory_budget_mb:
+        logging.info(f"Estimated {estimate:.0f} MB for {path} (budget {memory_budget_mb:.0f} MB)")
+        return estimate
+
+    message = (
+        f"Loading {path} needs an estimated {estimate:.0f} MB, "
+        f"over the {memory_budget_mb:.0f} MB budget"
+    )
+    if action == "raise":
+        raise MemoryBudgetExceeded(message)
+    logging.warning(message)
+    return estimate
+
+
+def read_panel(
+    path: Path,
+    memory_budget_mb: float | None = None,
+    budget_action: str = "warn",
+    extra_float_columns: int = 0,
+) -> pd.DataFrame:
+    """
+    Read a panel or features CSV with the compact dtype schema and
+    normalized (stripped, lower-case) column names.
+    """
+    check_memory_budget(path, memory_budget_mb, budget_action, extra_float_columns)
+
+    columns = pd.read_csv(path, nrows=0).columns
+    try:
+        df = pd.read_csv(path, dtype=panel_dtypes(columns))
+    except ValueError as e:
+        raise ValueError(f"{path} does not fit the panel schema: {e}") from e
+
+    df.columns = [_normalize(c) for c in df.columns]
+    return df
+
+
+def iter_panel(path: Path, chunk_rows: int):
+    """Stream a panel CSV as compact, column-normalized chunks of `chunk_rows` rows."""
+    columns = pd.read_csv(path, nrows=0).columns
+    for chunk in pd.read_csv(path, dtype=panel_dtypes(columns), chunksize=chunk_rows):
+        chunk.columns = [_normalize(c) for c in chunk.columns]
+        yield chunk
@@ -0,0 +1,197 @@
+import argparse
+import json
+import logging
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+MB = 1024 * 1024
+
+
+def current_rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class _RssSampler:
+    """Background thread tracking the peak RSS seen while a stage runs."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.peak = current_rss_bytes() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            rss = current_rss_bytes()
+            if rss is not None:
+                self.peak = max(self.peak, rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        rss = current_rss_bytes()
+        if rss is not None:
+            self.peak = max(self.peak, rss)
+        return False
+
+
+class RunTelemetry:
+    """
+    Per-stage resource report for a training run: wall and CPU time, peak RSS
+    and items processed per second. With `trace_allocations`, also the
+    tracemalloc peak and top allocation sites; tracing every allocation
+    slows allocation-heavy stages severalfold, so it is off unless asked
+    for. The JSON report is rewritten when each stage starts and ends, so a
+    run that is OOM-killed still shows which stage was running.
+    """
+
+    def __init__(
+        self,
+        report_dir: Path,
+        trace_allocations: bool = False,
+        top_allocators: int = 10,
+        sample_interval: float = 0.05,
+    ):
+        self.report_dir = Path(report_dir)
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.trace_allocations = trace_allocations
+        self.top_allocators = top_allocators
+        self.sample_interval = sample_interval
+
+        started = datetime.now(timezone.utc)
+        self.run_id = started.strftime("%Y%m%dT%H%M%SZ")
+        self.report_path = self.report_dir / f"run_{self.run_id}.json"
+        self.report = {
+            "run_id": self.run_id,
+            "started_at": started.isoformat(),
+            "pid": os.getpid(),
+            "stages": [],
+        }
+
+    def save(self):
+        tmp_path = self.report_path.with_name(self.report_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.report, f, indent=2)
+        os.replace(tmp_path, self.report_path)
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Instrument a block. The yielded dict can be given `items` (and
+        optionally `unit`) to report throughput.
+        """
+        record = {"name": name, "status": "running", "items": None, "unit": "rows"}
+        self.report["stages"].append(record)
+        self.save()
+
+        tracing = self.trace_allocations and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        rss_start = current_rss_bytes()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        try:
+            with _RssSampler(self.sample_interval) as sampler:
+                yield record
+            record["status"] = "completed"
+        except BaseException as e:
+            record["status"] = "failed"
+            record["error"] = repr(e)
+            raise
+        finally:
+            wall = time.perf_counter() - wall_start
+            record["wall_s"] = wall
+            record["cpu_s"] = time.process_time() - cpu_start
+            record["peak_rss_mb"] = sampler.peak / MB if sampler.peak else None
+            record["rss_delta_mb"] = (
+                (current_rss_bytes() - rss_start) / MB if rss_start is not None else None
+            )
+            # Lifetime peak, for platforms without /proc
+            record["max_rss_lifetime_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                record["tracemalloc_peak_mb"] = peak / MB
+                record["top_allocators"] = [
+                    {
+                        "location": str(stat.traceback),
+                        "size_mb": stat.size / MB,
+                        "count": stat.count,
+                    }
+                    for stat in snapshot.statistics("lineno")[: self.top_allocators]
+                ]
+
+            if record["items"]:
+                record["items_per_s"] = record["items"] / wall if wall > 0 else None
+
+            self.save()
+            logging.info(
+                f"Stage {name} {record['status']} in {wall:.2f}s "
+                f"(cpu {record['cpu_s']:.2f}s, peak rss {record['peak_rss_mb'] or 0:.0f} MB)"
+            )
+
+
+def diff_reports(path_a: Path, path_b: Path):
+    """Stage-by-stage comparison of two run reports, matched by stage name."""
+    with open(path_a) as f:
+        a = {s["name"]: s for s in json.load(f)["stages"]}
+    with open(path_b) as f:
+        b = {s["name"]: s for s in json.load(f)["stages"]}
+
+    metrics = ["wall_s", "cpu_s", "peak_rss_mb", "tracemalloc_peak_mb", "items_per_s"]
+    rows = []
+    for name in list(a) + [n for n in b if n not in a]:
+        row = {"stage": name}
+        for metric in metrics:
+            va = a.get(name, {}).get(metric)
+            vb = b.get(name, {}).get(metric)
+            row[metric] = (va, vb)
+        rows.append(row)
+    return rows
+
+
+def _format(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training run telemetry reports")
+    sub = parser.add_subparsers(dest="command", required=True)
+    diff = sub.add_parser("diff", help="Compare two run reports stage by stage")
+    diff.add_argument("report_a")
+    diff.add_argument("report_b")
+    args = parser.parse_args()
+
+    rows = diff_reports(Path(args.report_a), Path(args.report_b))
+    metrics = ["wall_s", "cpu_s", "peak_rss_mb", "tracemalloc_peak_mb", "items_per_s"]
+
+    print(f"{'stage':<28}" + "".join(f"{m:>34}" for m in metrics))
+    for row in rows:
+        cells = []
+        for metric in metrics:
+            va, vb = row[metric]
+            change = f" ({(vb / va - 1):+.0%})" if va and vb is not None else ""
+            cells.append(f"{_format(va)} -> {_format(vb)}{change}".rjust(34))
+        print(f"{row['stage']:<28}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
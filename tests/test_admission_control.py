@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from Credit_Risk_Modelling.api import main
+from Credit_Risk_Modelling.components.admission_control import AdmissionController, AdmissionRejected
+
+PAYLOAD = {
+    "tabular": {"features": {"f0": 0.5, "f1": 0.8, "f2": 0.4, "f3": 0.6, "f4": 0.3}},
+    "timeseries": {"values": [[0.4, 0.5, 0.3]]},
+}
+
+
+def test_full_queue_is_rejected_with_429():
+    async def scenario():
+        controller = AdmissionController(limit=1, max_queue=1, queue_timeout_s=5)
+        await controller.acquire()
+        waiting = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+
+        controller.release(0.01)
+        await waiting
+        return controller, rejected.value
+
+    controller, rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert rejected.retry_after >= 1
+    assert controller.rejected == {"queue_full": 1, "queue_timeout": 0}
+    assert controller.admitted == 2
+    assert controller.in_flight == 1
+
+
+def test_queue_timeout_is_rejected_with_503():
+    async def scenario():
+        controller = AdmissionController(limit=1, max_queue=4, queue_timeout_s=0.05)
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+        return controller, rejected.value
+
+    controller, rejected = asyncio.run(scenario())
+    assert rejected.status_code == 503
+    assert controller.rejected == {"queue_full": 0, "queue_timeout": 1}
+    assert controller.metrics()["queue_depth"] == 0
+
+
+def test_rejection_reaches_the_client_with_retry_after(monkeypatch):
+    monkeypatch.setattr(main, "get_admission_controller", lambda: AdmissionController(limit=0, max_queue=0))
+
+    response = TestClient(main.app).post("/predict", json=PAYLOAD)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_inference_failure_is_a_500_not_a_fallback_score(monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("fusion weights are corrupt")
+
+    monkeypatch.setattr(main, "get_admission_controller", lambda: None)
+    monkeypatch.setattr(main, "run_inference", broken)
+
+    response = TestClient(main.app).post("/predict", json=PAYLOAD)
+
+    assert response.status_code == 500
+    assert "fusion weights are corrupt" in response.json()["detail"]
+    assert "final_risk_score" not in response.json()
@@ -0,0 +1,56 @@
+import joblib
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from lightgbm import LGBMClassifier
+
+from Credit_Risk_Modelling.components.compiled_tree_predictor import CompiledTreePredictor
+from Credit_Risk_Modelling.components.explainability_tabular import TabularExplainer
+from Credit_Risk_Modelling.components.risk_adapter_timeseries import TimeSeriesRiskAdapter
+
+FEATURES = ["f0", "f1", "f2", "f3", "f4"]
+
+
+def make_data(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, len(FEATURES))), columns=FEATURES)
+    y = (X["f0"] + 0.5 * X["f1"] * X["f2"] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    # Missing and exact-zero values exercise the default-direction routing
+    X.iloc[::7, 1] = np.nan
+    X.iloc[::11, 3] = 0.0
+    return X, y
+
+
+def test_compiled_matches_predict_proba():
+    X, y = make_data()
+    model = LGBMClassifier(n_estimators=60, num_leaves=15, verbose=-1).fit(X, y)
+    predictor = CompiledTreePredictor.from_model(model)
+
+    np.testing.assert_allclose(predictor.predict_proba(X), model.predict_proba(X), atol=1e-6)
+
+    contributions, bias = predictor.path_contributions(X)
+    np.testing.assert_allclose(contributions.sum(axis=1) + bias, predictor.predict_raw(X), atol=1e-6)
+
+
+def test_unsupported_models_fall_back_to_lightgbm(tmp_path):
+    X, y = make_data()
+    X["segment"] = pd.Categorical(np.arange(len(X)) % 4)
+    y = y | (X["segment"] == 2).astype(int)
+    model = LGBMClassifier(n_estimators=20, num_leaves=7, min_child_samples=5, verbose=-1).fit(X, y)
+    assert CompiledTreePredictor.try_from_model(model) is None
+
+    joblib.dump(model, tmp_path / "categorical.pkl")
+    explainer = TabularExplainer(tmp_path / "categorical.pkl")
+    approximate = explainer.attributions(X.head(3), approximate=True)
+    np.testing.assert_allclose(approximate, explainer.attributions(X.head(3)))
+
+    multiclass = lgb.train(
+        {"objective": "multiclass", "num_class": 3, "verbose": -1},
+        lgb.Dataset(X[FEATURES], label=np.arange(len(X)) % 3),
+        num_boost_round=5,
+    )
+    multiclass.save_model(str(tmp_path / "multiclass.txt"))
+    adapter = TimeSeriesRiskAdapter(tmp_path / "multiclass.txt")
+    assert adapter.predictor is None
+    expected = multiclass.predict(X[FEATURES].head(3))[:, 1].mean()
+    assert adapter.predict(X[FEATURES].head(3)).score == float(expected)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("torchvision")
+
+from Credit_Risk_Modelling.components import feature_engineering_documents
+from Credit_Risk_Modelling.components.feature_engineering_documents import DocumentFeatureEngineering
+from Credit_Risk_Modelling.utils.generate_documents import generate_dataset
+
+
+@pytest.fixture
+def small_backbone(monkeypatch):
+    """A seeded conv net in place of ResNet-18, so no weights are downloaded."""
+    def load(device):
+        torch.manual_seed(0)
+        model = torch.nn.Sequential(
+            torch.nn.Conv2d(3, 16, kernel_size=7, stride=4),
+            torch.nn.ReLU(),
+            torch.nn.AdaptiveAvgPool2d(1),
+        )
+        return model.to(device).eval()
+
+    monkeypatch.setattr(feature_engineering_documents, "load_document_backbone", load)
+
+
+def test_cached_embeddings_match_uncached(tmp_path, small_backbone):
+    image_dir = tmp_path / "images"
+    generate_dataset(image_dir, num_images=8, width=620, height=877, fmt="jpg")
+
+    uncached, uncached_labels = DocumentFeatureEngineering(
+        image_dir, tmp_path / "uncached", tmp_path / "manifest.json"
+    ).extract_embeddings()
+    cached_fe = DocumentFeatureEngineering(
+        image_dir, tmp_path / "cached", tmp_path / "manifest.json",
+        tensor_cache_dir=tmp_path / "cache", batch_size=3,
+    )
+    cold, cold_labels = cached_fe.extract_embeddings()
+    warm, _ = cached_fe.extract_embeddings()
+
+    assert uncached.shape == (8, 16)
+    np.testing.assert_array_equal(cold_labels, uncached_labels)
+    np.testing.assert_allclose(cold, uncached, rtol=1e-5, atol=1e-6)
+    np.testing.assert_array_equal(warm, cold)
@@ -0,0 +1,63 @@
+import numpy as np
+
+from Credit_Risk_Modelling.components.document_index import (
+    ONLINE_ID_BASE,
+    DocumentIndex,
+    DuplicateDetector,
+    SeenDocumentLog,
+)
+
+
+def build_index(tmp_path, rng):
+    training = rng.normal(size=(500, 32)).astype(np.float32)
+    index = DocumentIndex.train(training, nlist=8)
+    index.add(training)
+    index.save(tmp_path / "index")
+    return training
+
+
+def test_resubmitted_scan_is_caught_by_another_worker(tmp_path):
+    rng = np.random.default_rng(0)
+    training = build_index(tmp_path, rng)
+    log = SeenDocumentLog(tmp_path / "seen.db")
+    # Two workers, each with its own memory-mapped copy of the index
+    first = DuplicateDetector(DocumentIndex.load(tmp_path / "index"), log)
+    second = DuplicateDetector(DocumentIndex.load(tmp_path / "index"), log)
+
+    scan = rng.normal(size=(1, 32)).astype(np.float32)
+    signal, matches = first(scan)
+    assert signal is None
+    assert matches[0]["nearest_id"] < len(training)
+
+    # Lightly altered resubmission, scored by the other worker
+    signal, matches = second(scan + rng.normal(0, 0.01, scan.shape).astype(np.float32))
+    assert signal is not None and signal.name == "duplicate_document"
+    assert matches[0]["nearest_id"] == ONLINE_ID_BASE + 1
+
+    # A worker started later loads every scan logged so far
+    late = DuplicateDetector(DocumentIndex.load(tmp_path / "index"), log)
+    assert len(late.index) == len(training) + 2
+
+
+def test_training_duplicates_are_found_and_index_file_is_untouched(tmp_path):
+    rng = np.random.default_rng(1)
+    training = build_index(tmp_path, rng)
+    detector = DuplicateDetector(DocumentIndex.load(tmp_path / "index"), SeenDocumentLog(tmp_path / "seen.db"))
+
+    signal, matches = detector(training[[42]])
+
+    assert signal is not None
+    assert matches[0] == {"nearest_id": 42, "similarity": signal.score}
+    assert len(DocumentIndex.load(tmp_path / "index")) == len(training)
+
+
+def test_without_a_log_the_index_is_read_only(tmp_path):
+    rng = np.random.default_rng(2)
+    training = build_index(tmp_path, rng)
+    detector = DuplicateDetector(DocumentIndex.load(tmp_path / "index"))
+
+    scan = rng.normal(size=(1, 32)).astype(np.float32)
+    detector(scan)
+
+    assert detector(scan)[0] is None
+    assert len(detector.index) == len(training)
@@ -0,0 +1,43 @@
+import os
+from pathlib import Path
+
+from Credit_Risk_Modelling.utils.common import calculate_md5
+from Credit_Risk_Modelling.utils.document_manifest import DocumentManifest
+
+
+def write_images(root: Path, files: dict[str, bytes]):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+
+def test_labels_follow_generator_directories(tmp_path):
+    root = tmp_path / "images"
+    write_images(root, {
+        "low_risk/a.png": b"a",
+        "high_risk/b.png": b"b",
+        "base/c.png": b"c",
+    })
+
+    manifest = DocumentManifest.load_or_refresh(root, tmp_path / "manifest.json")
+
+    assert len(manifest) == 3
+    assert manifest.labelled_images() == [(root / "high_risk/b.png", 1), (root / "low_risk/a.png", 0)]
+
+
+def test_manifest_for_another_root_is_rebuilt(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    first, second = tmp_path / "first", tmp_path / "second"
+    write_images(first, {"low_risk/a.png": b"first"})
+    write_images(second, {"low_risk/a.png": b"other"})
+    # Same relative path, size and mtime: only the content differs
+    stat = (first / "low_risk/a.png").stat()
+    os.utime(second / "low_risk/a.png", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    DocumentManifest.load_or_refresh(first, manifest_path)
+
+    assert not DocumentManifest(second, manifest_path).load()
+
+    manifest = DocumentManifest.load_or_refresh(second, manifest_path)
+    assert manifest.entries["low_risk/a.png"].md5 == calculate_md5(second / "low_risk/a.png")
+    assert DocumentManifest(second, manifest_path).load()
@@ -0,0 +1,153 @@
+import hashlib
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from Credit_Risk_Modelling.utils import common
+from Credit_Risk_Modelling.utils.common import download_file
+
+PAYLOAD = bytes(range(256)) * 1200  # 300 KiB
+
+
+class RangeServer(ThreadingHTTPServer):
+    """Serves `payload` at any path, with Range support like a static file host."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RangeHandler)
+        self.payload = PAYLOAD
+        self.allow_head = True
+        self.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/data.bin"
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        if not self.server.allow_head:
+            self.send_error(405)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.server.payload)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self):
+        payload = self.server.payload
+        header = self.headers.get("Range")
+        self.server.requests.append(header)
+        if header is None:
+            self.send_response(200)
+            body = payload
+        else:
+            start, end = re.fullmatch(r"bytes=(\d+)-(\d*)", header).groups()
+            start, end = int(start), int(end) if end else len(payload) - 1
+            if start >= len(payload):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(payload)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            end = min(end, len(payload) - 1)
+            body = payload[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = RangeServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_resumes_partial_download(server, tmp_path):
+    dest = tmp_path / "data.bin"
+    (tmp_path / "data.bin.part").write_bytes(PAYLOAD[:100_000])
+
+    download_file(server.url, dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert server.requests == ["bytes=100000-"]
+
+
+def test_complete_part_file_is_not_refetched(server, tmp_path):
+    dest = tmp_path / "data.bin"
+    (tmp_path / "data.bin.part").write_bytes(PAYLOAD)
+
+    download_file(server.url, dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert server.requests == []
+
+
+def test_416_on_complete_part_file_counts_as_done(server, tmp_path):
+    # Without a HEAD response the size is unknown, so the resume is attempted
+    server.allow_head = False
+    dest = tmp_path / "data.bin"
+    (tmp_path / "data.bin.part").write_bytes(PAYLOAD)
+
+    download_file(server.url, dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert server.requests == [f"bytes={len(PAYLOAD)}-"]
+
+
+def test_416_on_stale_part_file_restarts(server, tmp_path):
+    server.allow_head = False
+    dest = tmp_path / "data.bin"
+    (tmp_path / "data.bin.part").write_bytes(b"x" * (len(PAYLOAD) + 10))
+
+    download_file(server.url, dest)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert server.requests == [f"bytes={len(PAYLOAD) + 10}-", None]
+
+
+def test_parallel_ranges(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(common, "PARALLEL_DOWNLOAD_MIN_BYTES", 1)
+    dest = tmp_path / "data.bin"
+    md5 = hashlib.md5(PAYLOAD).hexdigest()
+
+    download_file(server.url, dest, expected_md5=md5, num_connections=4)
+
+    assert dest.read_bytes() == PAYLOAD
+    assert len(server.requests) == 4
+    assert all(header.startswith("bytes=") for header in server.requests)
+    assert not list(tmp_path.glob("*.part*"))
+
+
+def test_checksum_mismatch_keeps_destination_untouched(server, tmp_path):
+    dest = tmp_path / "data.bin"
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        download_file(server.url, dest, expected_md5="0" * 32)
+
+    assert not dest.exists()
+    assert not (tmp_path / "data.bin.part").exists()
+
+
+def test_sidecar_skip_and_remote_size_change(server, tmp_path):
+    dest = tmp_path / "data.bin"
+    download_file(server.url, dest)
+    assert (tmp_path / "data.bin.md5").read_text() == hashlib.md5(PAYLOAD).hexdigest()
+
+    download_file(server.url, dest)
+    assert server.requests == [None]
+
+    server.payload = PAYLOAD + b"new rows"
+    download_file(server.url, dest)
+    assert dest.read_bytes() == server.payload
+    assert server.requests == [None, None]
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from Credit_Risk_Modelling.components import drift_monitor
+from Credit_Risk_Modelling.components.drift_monitor import DriftMonitor, build_reference, TIMESERIES_FEATURE
+
+
+def make_reference(tmp_path):
+    rng = np.random.default_rng(0)
+    samples = {"f1": rng.uniform(0, 1, 50_000), TIMESERIES_FEATURE: rng.normal(0.5, 0.1, 50_000)}
+    return build_reference(samples, tmp_path / "reference.json")
+
+
+def test_workers_sketches_are_merged(tmp_path, monkeypatch):
+    reference = make_reference(tmp_path)
+    sketch_dir = tmp_path / "sketches"
+    # Two workers: each writes only the sketch file named after its pid
+    monkeypatch.setattr(drift_monitor.os, "getpid", lambda: 101)
+    first = DriftMonitor(reference, sketch_dir)
+    monkeypatch.setattr(drift_monitor.os, "getpid", lambda: 102)
+    second = DriftMonitor(reference, sketch_dir)
+
+    first.observe({"f1": 0.2, "unmonitored": 5.0}, [[0.4, 0.6]])
+    second.observe({"f1": 0.7, "f2": "not a number"}, [[float("nan")]])
+    second.observe({"f1": 1.5})
+
+    report = first.report()["features"]
+    assert report["f1"]["count"] == 3
+    assert report["f1"]["mean"] == pytest.approx(0.8)
+    assert report["f1"]["out_of_range"] == 1 / 3
+    assert report[TIMESERIES_FEATURE]["count"] == 2
+    assert second.report() == first.report()
+
+    second.reset()
+    assert first.report()["features"]["f1"] == {"count": 0, "reference_count": 50_000}
+
+
+def test_psi_separates_stable_from_shifted_inputs(tmp_path):
+    reference = make_reference(tmp_path)
+    rng = np.random.default_rng(1)
+    stable, shifted = DriftMonitor(reference), DriftMonitor(reference)
+
+    for value in rng.uniform(0, 1, 5000):
+        stable.observe({"f1": value})
+    for value in rng.uniform(0, 1, 5000) ** 3:
+        shifted.observe({"f1": value})
+
+    stable_f1 = stable.report()["features"]["f1"]
+    shifted_f1 = shifted.report()["features"]["f1"]
+    assert stable_f1["psi"] < 0.01 and stable_f1["status"] == "ok"
+    assert shifted_f1["psi"] > 0.25 and shifted_f1["status"] == "alert"
+    assert shifted_f1["quantiles"]["p50"] < 0.2
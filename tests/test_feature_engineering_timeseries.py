@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from Credit_Risk_Modelling.components.feature_engineering_timeseries import TimeSeriesFeatureEngineering
+from Credit_Risk_Modelling.entity.feature_engineering_entity import TimeSeriesFeatureConfig
+
+
+def write_panel(path, n_customers=40, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = [
+        (customer, month, *rng.normal(1000, 200, size=3).round(2))
+        for customer in range(1, n_customers + 1)
+        # Some customers have less history than the window
+        for month in range(1, int(rng.integers(1, 13)) + 1)
+    ]
+    panel = pd.DataFrame(rows, columns=["customer_id", "month", "income", "expense", "balance"])
+    panel.sample(frac=1, random_state=seed).to_csv(path, index=False)
+
+
+def test_partitioned_output_matches_in_memory(tmp_path):
+    write_panel(tmp_path / "panel.csv")
+    outputs = {}
+    for mode, num_partitions in [("memory", 0), ("partitioned", 4)]:
+        output_path = tmp_path / mode
+        output_path.mkdir()
+        fe = TimeSeriesFeatureEngineering(TimeSeriesFeatureConfig(
+            data_path=tmp_path / "panel.csv",
+            output_path=output_path,
+            window_size=3,
+            num_partitions=num_partitions,
+            workers=2,
+            chunk_rows=50,
+        ))
+        fe.transform()
+        outputs[mode] = (fe.output_file.read_bytes(), fe.n_rows)
+
+    assert outputs["memory"][1] > 0
+    assert outputs["partitioned"] == outputs["memory"]
+    assert not (tmp_path / "partitioned" / "partitions").exists()
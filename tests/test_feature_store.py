@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from Credit_Risk_Modelling.api import dependencies, main
+from Credit_Risk_Modelling.components.feature_store import OnlineFeatureStore, UnknownCustomer
+
+
+def panel(rows):
+    return pd.DataFrame(rows, columns=["customer_id", "month", "f1", "f2", "default_flag"])
+
+
+def test_upsert_keeps_the_latest_row_per_customer(tmp_path):
+    store = OnlineFeatureStore(tmp_path / "store.db")
+    store.upsert("tabular", panel([(1, 1, 0.1, 0.2, 0), (1, 3, 0.5, 0.6, 0), (2, 2, 0.9, 0.8, 1)]))
+
+    # An older row never replaces a newer one; a corrected row for the same month does
+    store.upsert("tabular", panel([(1, 2, 0.0, 0.0, 0), (2, 2, 0.25, 0.8, 1)]))
+
+    assert len(store) == 2
+    assert store.get(1, "tabular") == {"as_of": 3, "features": {"f1": 0.5, "f2": pytest.approx(0.6)}}
+    assert store.get(2, "tabular")["features"]["f1"] == 0.25
+
+    with pytest.raises(ValueError, match="changed"):
+        store.upsert("tabular", panel([(3, 1, 0.1, 0.2, 0)]).rename(columns={"f2": "f3"}))
+
+
+def test_unknown_customer(tmp_path):
+    store = OnlineFeatureStore(tmp_path / "store.db")
+    store.upsert("tabular", panel([(1, 1, 0.1, 0.2, 0)]))
+
+    assert store.get(7, "tabular") is None
+    with pytest.raises(UnknownCustomer) as e:
+        store.lookup(1, "timeseries")
+    assert (e.value.customer_id, e.value.feature_set) == (1, "timeseries")
+
+
+def test_predict_for_unknown_customer_is_a_404(tmp_path, monkeypatch):
+    store = OnlineFeatureStore(tmp_path / "store.db")
+    store.upsert("tabular", panel([(1, 1, 0.1, 0.2, 0)]))
+    monkeypatch.setattr(dependencies, "get_feature_store", lambda: store)
+    monkeypatch.setattr(main, "get_admission_controller", lambda: None)
+    client = TestClient(main.app)
+    timeseries = {"values": [[0.4, 0.5, 0.3]]}
+
+    known = client.post("/predict", json={"customer_id": 1, "timeseries": timeseries})
+    unknown = client.post("/predict", json={"customer_id": 2, "timeseries": timeseries})
+
+    assert known.status_code == 200
+    assert unknown.status_code == 404
+    assert "customer_id 2" in unknown.json()["detail"]
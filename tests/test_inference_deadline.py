@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from Credit_Risk_Modelling.api import main
+from Credit_Risk_Modelling.api.dependencies import get_document_scorer
+from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
+from Credit_Risk_Modelling.pipeline.inference_pipeline import run_inference
+
+X_TABULAR = pd.DataFrame([{"f1": 0.5, "f2": 0.5, "f4": 0.5}])
+X_TIMESERIES = pd.DataFrame([[0.4, 0.5, 0.3]])
+
+
+class SlowAdapter:
+    def __init__(self, name, seconds):
+        self.name, self.seconds = name, seconds
+
+    def predict(self, X):
+        time.sleep(self.seconds)
+        return RiskSignal(name=self.name, score=0.9, confidence=0.8)
+
+
+def test_slow_adapter_is_left_out_at_the_deadline():
+    start = time.perf_counter()
+    result = run_inference(
+        X_TABULAR,
+        X_TIMESERIES,
+        deadline_s=0.05,
+        timeseries_adapter=SlowAdapter("timeseries", 1.0),
+        text_adapter=SlowAdapter("text", 1.0),
+        X_text=["late payment"],
+    )
+
+    assert time.perf_counter() - start < 0.5
+    assert result["modalities"]["timeseries"]["status"] == "timed_out"
+    assert result["modalities"]["text"]["status"] == "timed_out"
+    assert result["included"] == ["tabular", "vision"]
+    assert set(result["breakdown"]) == {"tabular", "vision"}
+
+
+def test_fast_adapter_makes_the_deadline():
+    result = run_inference(
+        X_TABULAR, X_TIMESERIES, deadline_s=1.0, timeseries_adapter=SlowAdapter("timeseries", 0.0)
+    )
+
+    assert result["modalities"]["timeseries"]["status"] == "ok"
+    assert result["breakdown"]["timeseries"]["score"] == 0.9
+
+
+class SlowDocumentScorer:
+    async def score(self, images):
+        await asyncio.sleep(1.0)
+
+
+def test_document_scoring_past_the_deadline_is_a_504(monkeypatch):
+    monkeypatch.setattr(main, "get_admission_controller", lambda: None)
+    main.app.dependency_overrides[get_document_scorer] = SlowDocumentScorer
+    payload = '{"tabular": {"features": {"f1": 0.5}}, "timeseries": {"values": [[0.4]]}, "deadline_ms": 50}'
+    try:
+        response = TestClient(main.app).post(
+            "/predict/documents", files={"files": ("scan.jpg", b"jpeg")}, data={"payload": payload}
+        )
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert response.status_code == 504
+    assert "50 ms" in response.json()["detail"]
@@ -0,0 +1,39 @@
+import asyncio
+import importlib.util
+import itertools
+import json
+from pathlib import Path
+
+import httpx
+
+from Credit_Risk_Modelling.api import main
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "load_test.py"
+spec = importlib.util.spec_from_file_location("load_test", SCRIPT)
+load_test = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(load_test)
+
+
+def test_replayed_errors_are_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "get_admission_controller", lambda: None)
+    good = next(load_test.synthetic_payloads(1))[1]
+    replay = tmp_path / "payloads.jsonl"
+    replay.write_text("\n".join([
+        json.dumps(good),
+        "",
+        json.dumps({"path": "/predict", "body": {"tabular": {"features": {}}}}),
+    ]))
+    payloads = list(load_test.replay_payloads(replay))
+    assert [path for path, _ in payloads] == ["/predict", "/predict"]
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://asgi") as client:
+            return await load_test.run_closed_loop(client, itertools.islice(itertools.cycle(payloads), 10), 4)
+
+    summary = load_test.summarize("asgi", *asyncio.run(run()))
+
+    assert summary["requests"] == 10
+    # Every second payload lacks timeseries and gets a 422
+    assert summary["error_rate"] == 0.5
+    assert 0 < summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
@@ -0,0 +1,58 @@
+import threading
+
+from Credit_Risk_Modelling.components.shadow_scoring import ShadowScorer, ShadowScoreStore
+from Credit_Risk_Modelling.entity.risk_signal_entity import RiskSignal
+
+RESULT = {
+    "final_risk_score": 0.4,
+    "breakdown": {
+        "tabular": {"score": 0.3, "confidence": 0.9},
+        "timeseries": {"score": 0.5, "confidence": 0.7},
+    },
+}
+
+
+class BlockingAdapter:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def predict(self, X):
+        self.started.set()
+        self.release.wait(5)
+        return RiskSignal(name="tabular", score=0.6, confidence=0.9)
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    store = ShadowScoreStore(tmp_path / "shadow.db")
+    adapter = BlockingAdapter()
+    scorer = ShadowScorer(store, {"tabular": adapter}, num_workers=1, max_queue=1)
+    inputs = {"tabular": [[0.1]]}
+
+    assert scorer.submit("a", inputs, RESULT)
+    assert adapter.started.wait(5)
+    # The worker is busy with "a": "b" fills the queue and "c" is shed
+    assert scorer.submit("b", inputs, RESULT)
+    assert not scorer.submit("c", inputs, RESULT)
+    assert (scorer.submitted, scorer.dropped) == (2, 1)
+
+    adapter.release.set()
+    scorer._queue.join()
+
+    summary = {row["modality"]: row for row in store.summary()}
+    assert summary["tabular"]["scored"] == 2
+    assert abs(summary["tabular"]["mean_difference"] - 0.3) < 1e-9
+    assert summary["final"]["scored"] == 2
+
+
+def test_live_model_scored_modalities_are_skipped(tmp_path):
+    store = ShadowScoreStore(tmp_path / "shadow.db")
+    adapter = BlockingAdapter()
+    adapter.release.set()
+    scorer = ShadowScorer(store, {"tabular": adapter})
+
+    scorer.submit("a", {"tabular": [[0.1]]}, RESULT, skip={"tabular"})
+    scorer._queue.join()
+
+    assert not adapter.started.is_set()
+    assert store.summary() == []
@@ -0,0 +1,73 @@
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from sklearn.cluster import KMeans
+
+from Credit_Risk_Modelling.api import main
+from Credit_Risk_Modelling.components.risk_adapter_text import TextRiskAdapter
+from Credit_Risk_Modelling.pipeline.inference_pipeline import run_inference
+from Credit_Risk_Modelling.utils.text_topic_risk_mapping import map_topics_to_risk
+
+CENTRES = np.eye(3, 8, dtype=np.float32) * 10
+
+
+class KeywordEncoder:
+    """Stands in for MiniLM: texts mentioning a topic word land near its centre."""
+
+    words = ["fee", "fraud", "delay"]
+
+    def encode(self, texts):
+        return np.stack([
+            CENTRES[next(i for i, w in enumerate(self.words) if w in text)] for text in texts
+        ])
+
+
+def make_adapter(tmp_path):
+    rng = np.random.default_rng(0)
+    embeddings = np.concatenate([
+        centre + rng.normal(0, 0.1, (n, 8)).astype(np.float32)
+        for centre, n in zip(CENTRES, [30, 20, 10])
+    ])
+    model = KMeans(n_clusters=3, random_state=42, n_init=10)
+    topics = model.fit_predict(embeddings)
+    joblib.dump({"model": model, "topics": topics}, tmp_path / "text_topics.pkl")
+    joblib.dump(map_topics_to_risk(topics), tmp_path / "risk_map.pkl")
+    return TextRiskAdapter(tmp_path / "text_topics.pkl", tmp_path / "risk_map.pkl", encoder=KeywordEncoder())
+
+
+def test_texts_are_scored_by_their_topics(tmp_path):
+    adapter = make_adapter(tmp_path)
+
+    # The most frequent topic maps to 0 and the rarest to 1
+    assert adapter.predict(["hidden fee again"]).score == 0.0
+    assert adapter.predict(["payment delay"]).score == 1.0
+    assert adapter.predict(["fee", "fraud"]).score == 0.25
+
+
+def test_run_inference_uses_the_text_adapter(tmp_path):
+    adapter = make_adapter(tmp_path)
+
+    result = run_inference(
+        pd.DataFrame([{"f1": 0.5, "f2": 0.5, "f4": 0.5}]),
+        pd.DataFrame([[0.4, 0.5, 0.3]]),
+        X_text=["payment delay"],
+        text_adapter=adapter,
+    )
+
+    assert result["breakdown"]["text"]["score"] == 1.0
+    assert result["modalities"]["text"]["status"] == "ok"
+
+
+def test_text_without_online_scoring_is_a_503(monkeypatch):
+    monkeypatch.setattr(main, "get_admission_controller", lambda: None)
+    payload = {
+        "tabular": {"features": {"f1": 0.5}},
+        "timeseries": {"values": [[0.4, 0.5]]},
+        "text": {"texts": ["hidden fee"]},
+    }
+
+    response = TestClient(main.app).post("/predict", json=payload)
+
+    assert response.status_code == 503
+    assert "text scoring" in response.json()["detail"]
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from Credit_Risk_Modelling.api import main
+from Credit_Risk_Modelling.pipeline.inference_pipeline import (
+    attribute_timeseries_heuristic,
+    score_timeseries_heuristic,
+)
+
+
+def test_missing_steps_are_skipped():
+    scores, contributions = attribute_timeseries_heuristic(pd.DataFrame([[0.2, np.nan, 0.4]]))
+    row = contributions.iloc[0]
+
+    assert np.isfinite(contributions.to_numpy()).all()
+    # Observed steps 0 and 2: level 0.3, std 0.1, slope 0.1 per step
+    assert row["level_risk"] == pytest.approx(0.3 * 0.3)
+    assert row["volatility_risk"] == pytest.approx(0.4 * 0.2)
+    assert row["trend_risk"] == pytest.approx(0.3 * 0.1)
+    assert row.sum() == pytest.approx(scores[0])
+    assert score_timeseries_heuristic([[0.2, None, 0.4]]) == pytest.approx(scores[0])
+
+
+def test_fully_observed_rows_score_as_before():
+    values = np.array([[0.1, 0.5, 0.3, 0.9], [0.4, 0.4, 0.4, 0.4]])
+    _, contributions = attribute_timeseries_heuristic(values)
+
+    slope = np.polyfit(np.arange(4), values[0], 1)[0]
+    assert contributions["volatility_risk"].tolist() == pytest.approx(0.4 * np.minimum(values.std(axis=1) * 2, 1))
+    assert contributions["trend_risk"].tolist() == pytest.approx([0.3 * slope, 0.0])
+    assert contributions["level_risk"].tolist() == pytest.approx(0.3 * values.mean(axis=1))
+
+
+def test_rows_without_observed_values_are_rejected(monkeypatch):
+    with pytest.raises(ValueError, match=r"rows \[1\]"):
+        attribute_timeseries_heuristic([[0.5], [np.nan]])
+
+    monkeypatch.setattr(main, "get_admission_controller", lambda: None)
+    response = TestClient(main.app).post("/explain", json={
+        "tabular": {"features": {"f1": 0.5}},
+        "timeseries": {"values": [[None, None]]},
+    })
+    assert response.status_code == 422
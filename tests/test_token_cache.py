@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from Credit_Risk_Modelling.components.token_cache import TokenCache, text_hash, tokenizer_fingerprint
+
+
+def fake_tokenizer(spec: str):
+    return SimpleNamespace(backend_tokenizer=SimpleNamespace(to_str=lambda: spec))
+
+
+def test_hits_and_misses(tmp_path):
+    cache = TokenCache(tmp_path / "tokens.db", "fp")
+    texts = [f"complaint {i}" for i in range(1200)]
+    cache.put_many((text_hash(t), [101, i, 102]) for i, t in enumerate(texts[:600]))
+
+    # More hashes than one lookup chunk, half of them never stored
+    found = cache.get_many([text_hash(t) for t in texts])
+
+    assert len(found) == 600
+    assert text_hash(texts[900]) not in found
+    np.testing.assert_array_equal(found[text_hash(texts[5])], [101, 5, 102])
+    assert found[text_hash(texts[5])].dtype == np.int32
+
+    # Entries survive reopening and a rewrite replaces them
+    reopened = TokenCache(tmp_path / "tokens.db", "fp")
+    reopened.put_many([(text_hash(texts[5]), [7])])
+    np.testing.assert_array_equal(reopened.get_many([text_hash(texts[5])])[text_hash(texts[5])], [7])
+
+
+def test_other_tokenizer_settings_miss(tmp_path):
+    fingerprint = tokenizer_fingerprint(fake_tokenizer("vocab-a"), max_length=256)
+    assert fingerprint == tokenizer_fingerprint(fake_tokenizer("vocab-a"), max_length=256)
+    assert fingerprint != tokenizer_fingerprint(fake_tokenizer("vocab-a"), max_length=128)
+    assert fingerprint != tokenizer_fingerprint(fake_tokenizer("vocab-b"), max_length=256)
+
+    TokenCache(tmp_path / "tokens.db", fingerprint).put_many([(text_hash("late fee"), [1, 2])])
+    other = TokenCache(tmp_path / "tokens.db", tokenizer_fingerprint(fake_tokenizer("vocab-a"), 128))
+
+    assert other.get_many([text_hash("late fee")]) == {}